@@ -1 +1 @@
-from .dependencies import get_db
\ No newline at end of file
+from .dependencies import get_db, get_read_db, get_async_db, get_async_read_db
\ No newline at end of file
@@ -1,12 +1,60 @@
-from app.db.database import SessionLocal
+from fastapi import Request
+from app.db.database import ReadSessionLocal, SessionLocal
+from app.db.async_database import AsyncReadSessionLocal, AsyncSessionLocal
 from app.db.test_database import TestSessionLocal
+from app import config
+from app.db.group_commit import group_writer
+from app.db.unit_of_work import async_unit_of_work, unit_of_work
 
 def get_db():
-    db = SessionLocal()
-    try:
+    """
+    Request-scoped unit of work: the session is committed once after the route returns, or
+    rolled back if it raised, and then closed. The connection is checked out on first use.
+    """
+    with SessionLocal() as db, unit_of_work(db):
         yield db
-    finally:
-        db.close()
+
+# Header com que o cliente pede para ler do primário e ver as próprias escritas
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
+
+def reads_from_primary(request: Request) -> bool:
+    """True when the request opted in to read-your-writes with `X-Read-Your-Writes: true`."""
+    return request.headers.get(READ_YOUR_WRITES_HEADER, "").lower() in ("1", "true", "yes")
+
+def get_read_db(request: Request):
+    """
+    Session for GET handlers on the read-only engine (`DATABASE_READ_URL`, or the SQLite file
+    opened with `mode=ro`), with its own pool, so long listings do not hold the connections
+    and locks of writers. The session only reads and is closed after the request.
+
+    A request sent with `X-Read-Your-Writes: true` reads from the primary instead, for a
+    client that must see a write it just made while the replica is still catching up.
+    """
+    session_factory = SessionLocal if reads_from_primary(request) else ReadSessionLocal
+    with session_factory() as db:
+        yield db
+
+async def get_async_db():
+    """asyncio counterpart of `get_db`: one unit of work per request on the asyncio engine."""
+    async with AsyncSessionLocal() as db, async_unit_of_work(db):
+        yield db
+
+async def get_async_read_db(request: Request):
+    """asyncio counterpart of `get_read_db`, for the `async def` GET handlers."""
+    session_factory = AsyncSessionLocal if reads_from_primary(request) else AsyncReadSessionLocal
+    async with session_factory() as db:
+        yield db
+
+def get_session_factory(request: Request):
+    """
+    Read session factory for work that outlives the request scope, such as streamed responses,
+    routed like `get_read_db`.
+    """
+    return SessionLocal if reads_from_primary(request) else ReadSessionLocal
+
+def get_group_writer():
+    """The shared group-commit writer when `GROUP_COMMIT_ENABLED`, else None (each request commits alone)."""
+    return group_writer if config.GROUP_COMMIT_ENABLED else None
 
 def get_db_test():
     db = TestSessionLocal()
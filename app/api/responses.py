@@ -0,0 +1,83 @@
+from functools import lru_cache
+from typing import Iterable, List, Mapping, Optional
+import orjson
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from app.cache import CachedEntity
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Check an `If-None-Match` header against an ETag using the weak comparison of RFC 9110.
+
+    Args:
+        if_none_match (str): The raw header value, possibly a list or "*".
+        etag (str): The current ETag of the resource.
+
+    Returns:
+        bool: True if the client copy is still current.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+def entity_response(request: Request, entry: CachedEntity) -> Response:
+    """
+    Build the response for a cached entity, answering 304 when the client copy is current.
+
+    The cached JSON body is sent as is, without validating or serializing the entity again.
+
+    Args:
+        request (Request): The incoming request, read for `If-None-Match`.
+        entry (CachedEntity): The cached entity.
+
+    Returns:
+        Response: A 304 Not Modified or a 200 response with the JSON body, both with `ETag`.
+    """
+    headers = {"ETag": entry.etag}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+@lru_cache(maxsize=None)
+def list_adapter(schema: type) -> TypeAdapter:
+    """The `TypeAdapter` for `List[schema]`, built once per schema."""
+    return TypeAdapter(List[schema])
+
+def model_list_response(schema: type, objects: Iterable, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """
+    Serialize ORM objects as a JSON list of `schema`, validating each object once.
+
+    Returning the `Response` skips the route's `response_model`, which would validate and
+    encode the list a second time; the adapter validates from attributes and dumps straight
+    to JSON bytes.
+
+    Args:
+        schema (type): The pydantic model of each item.
+        objects (Iterable): ORM objects with the attributes of `schema`.
+        headers (Optional[Mapping[str, str]]): Extra response headers.
+
+    Returns:
+        Response: The JSON response.
+    """
+    adapter = list_adapter(schema)
+    body = adapter.dump_json(adapter.validate_python(objects, from_attributes=True))
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def rows_response(rows: Iterable, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """
+    Serialize result rows as a JSON list of objects with orjson, without going through pydantic.
+
+    The rows must already have the columns and JSON-compatible types of the response schema.
+
+    Args:
+        rows (Iterable): SQLAlchemy `Row` objects.
+        headers (Optional[Mapping[str, str]]): Extra response headers.
+
+    Returns:
+        Response: The JSON response.
+    """
+    body = orjson.dumps([row._asdict() for row in rows])
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,12 +1,17 @@
 from fastapi import APIRouter, Depends
-from . import category, supplier, product, auth
+from app import config
+from . import category, supplier, product, auth, report, diagnostics
 from app.api.routes.validated_token import token_required
 
-# dependencies=[Depends(token_required)]
+# Com AUTH_REQUIRED=true as rotas de CRUD exigem "Authorization: Bearer <token>"
+protected = [Depends(token_required)] if config.AUTH_REQUIRED else []
 
 router = APIRouter()
 
 router.include_router(auth.router, prefix="/auth", tags=["auth"])
-router.include_router(category.router, prefix="/categories", tags=["categories"])
-router.include_router(supplier.router, prefix="/suppliers", tags=["suppliers"])
-router.include_router(product.router, prefix="/products", tags=["products"])
+router.include_router(category.router, prefix="/categories", tags=["categories"], dependencies=protected)
+router.include_router(supplier.router, prefix="/suppliers", tags=["suppliers"], dependencies=protected)
+router.include_router(product.router, prefix="/products", tags=["products"], dependencies=protected)
+router.include_router(report.router, prefix="/reports", tags=["reports"], dependencies=protected)
+# Download dos perfis capturados, protegido pelo próprio PROFILE_TOKEN
+router.include_router(diagnostics.router, prefix="/diagnostics", tags=["diagnostics"], include_in_schema=False)
@@ -4,6 +4,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from app.schemas.user_schema import LoginData, UserCreate
 from app.services.auth_service import AuthService
 from app.api.dependencies import get_db
+from app.exceptions import PoolSaturatedError, PoolTimeoutError
 
 router = APIRouter()
 
@@ -21,6 +22,7 @@ def login(login_data: LoginData, db: Session = Depends(get_db)) -> dict:
 
     Raises:
         HTTPException: 401 error if authentication fails.
+        HTTPException: 503 error if the password hashing pool is saturated or does not answer in time.
         HTTPException: 500 error if there is a problem in the authentication process.
     """
     auth_service = AuthService(db)
@@ -29,6 +31,10 @@ def login(login_data: LoginData, db: Session = Depends(get_db)) -> dict:
         if not token:
             raise HTTPException(status_code=401, detail="Incorrect email or password")
         return {"access_token": token, "token_type": "bearer"}
+    except ValueError:
+        raise HTTPException(status_code=401, detail="Incorrect email or password")
+    except (PoolSaturatedError, PoolTimeoutError) as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail=f"Authentication process failed: {e}")
     
@@ -44,10 +50,16 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)) -> dict:
     
     Returns:
         dict: A dictionary representing the created user.
+
+    Raises:
+        HTTPException: 503 error if the password hashing pool is saturated or does not answer in time.
+        HTTPException: 400 error if the user could not be created.
     """
     user_service = AuthService(db)
     try:
         new_user = user_service.create_user(user_data)
         return {"id": new_user.id, "email": new_user.email}
+    except (PoolSaturatedError, PoolTimeoutError) as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
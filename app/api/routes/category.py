@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
-from typing import List, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from app.schemas.category_schema import Category, CategoryCreate
+from app.schemas.category_schema import Category, CategoryCreate, CategoryWithProducts
+from app.schemas.sync_schema import SyncResult
 from app.services.category_service import CategoryService
-from app.api.dependencies import get_db
+from app.repositories.async_category_repository import AsyncCategoryRepository
+from app.api.dependencies import get_async_read_db, get_db, get_read_db
+from app.api.responses import entity_response, model_list_response
 
 router = APIRouter()
 
+INCLUDE_QUERY = Query(None, pattern="^products$", description='Use "products" to embed the products of each category.')
+
 @router.post("/cadastrar", response_model=Category, status_code=201)
 def create_category(category_data: CategoryCreate, db: Session = Depends(get_db)) -> Category:
     """
@@ -29,44 +35,100 @@ def create_category(category_data: CategoryCreate, db: Session = Depends(get_db)
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail=f"Failed to create category: {e}")
 
-@router.get("/{category_id}", response_model=Category)
-def read_category(category_id: int, db: Session = Depends(get_db)) -> Category:
+@router.put("/sync", response_model=SyncResult)
+def sync_categories(categories: List[CategoryCreate], db: Session = Depends(get_db)) -> SyncResult:
+    """
+    Make sure every category of the list exists, creating the missing ones by name with
+    `INSERT … ON CONFLICT (name) DO NOTHING` in batches.
+
+    Args:
+        categories (List[CategoryCreate]): The categories to create if missing.
+        db (Session): Dependency injection of the database session.
+
+    Returns:
+        SyncResult: Created and unchanged counts.
+
+    Raises:
+        HTTPException: 500 error if there is a database problem.
+        HTTPException: 501 error if the database has no `INSERT … ON CONFLICT`.
+    """
+    try:
+        return CategoryService(db).sync_categories(categories)
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to sync categories: {e}")
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+@router.get(
+    "/{category_id}",
+    response_model=CategoryWithProducts,
+    response_model_exclude_unset=True,
+)
+async def read_category(
+    category_id: int,
+    request: Request,
+    include: Optional[str] = INCLUDE_QUERY,
+    db: AsyncSession = Depends(get_async_read_db),
+):
     """
     Retrieve a specific category by its ID.
+
+    Without `include` the category is served from the entity cache with an `ETag`; a matching
+    `If-None-Match` header gets a 304 Not Modified. With `include=products` the products are
+    loaded with one extra `selectinload` query. The database is awaited on the asyncio engine.
     
     Args:
         category_id (int): The unique identifier for the category.
-        db (Session): Dependency injection of the database session.
+        request (Request): The incoming request, read for `If-None-Match`.
+        include (Optional[str]): "products" to embed the products of the category.
+        db (AsyncSession): Dependency injection of the asyncio database session.
     
     Returns:
-        Category: The retrieved category object or None if not found.
+        CategoryWithProducts: The category, with its products when requested, or a 304 response.
     
     Raises:
         HTTPException: 404 error if no category is found.
     """
-    category_service = CategoryService(db)
-    category = category_service.get_category(category_id)
-    if category is None:
+    category_repository = AsyncCategoryRepository(db)
+    if include == "products":
+        category = await category_repository.get_with_products(category_id)
+        if category is None:
+            raise HTTPException(status_code=404, detail="Categoria não encontrada")
+        return CategoryWithProducts.model_validate(category)
+
+    entry = await category_repository.get_entry(category_id)
+    if entry is None:
         raise HTTPException(status_code=404, detail="Categoria não encontrada")
-    return category
+    return entity_response(request, entry)
 
-@router.get("/categorias/listagem", response_model=List[Category])
-def read_categories(db: Session = Depends(get_db)) -> List[Category]:
+@router.get(
+    "/categorias/listagem",
+    response_model=None,
+    responses={200: {"model": List[CategoryWithProducts]}},
+)
+def read_categories(include: Optional[str] = INCLUDE_QUERY, db: Session = Depends(get_read_db)) -> Response:
     """
     Retrieve a list of categories.
+
+    By default the products relationship is not serialized, so the listing is a single query.
+    With `include=products` the products of every category are loaded with one `selectinload`.
+    Each category is validated once and dumped straight to JSON (see `model_list_response`).
     
     Args:
+        include (Optional[str]): "products" to embed the products of each category.
         db (Session): Dependency injection of the database session.
     
     Returns:
-        List[Category]: A list of categories.
+        Response: The JSON list of categories, with their products when requested.
     
     Raises:
         HTTPException: 500 error if there is a problem retrieving the categories.
     """
     category_service = CategoryService(db)
     try:
-        return category_service.get_categories()
+        if include == "products":
+            return model_list_response(CategoryWithProducts, category_service.get_categories(include_products=True))
+        return model_list_response(Category, category_service.get_categories())
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve categories: {e}")
 
@@ -114,7 +176,7 @@ def delete_category(category_id: int, db: Session = Depends(get_db)) -> Response
     return Response(status_code=204)
 
 @router.get("/categorias/nomes", response_model=List[Tuple[int, str]])
-def get_category_id_and_names(db: Session = Depends(get_db)) -> List:
+def get_category_id_and_names(db: Session = Depends(get_read_db)) -> List:
     """
     Retrieve a list of category IDs and names.
 
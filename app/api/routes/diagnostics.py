@@ -0,0 +1,32 @@
+import os
+from fastapi import APIRouter, Header, HTTPException, Path
+from fastapi.responses import FileResponse
+from app.diagnostics import PROFILE_ID_PATTERN, is_profile_authorized, profile_path
+
+router = APIRouter()
+
+@router.get("/profiles/{profile_id}", response_class=FileResponse)
+def download_profile(
+    profile_id: str = Path(..., pattern=PROFILE_ID_PATTERN),
+    x_profile: str = Header(...),
+) -> FileResponse:
+    """
+    Download the profile captured for a request sent with the `X-Profile` header, in the
+    collapsed-stack format (open it in speedscope or flamegraph.pl).
+
+    Args:
+        profile_id (str): The ID returned in the `X-Profile-Id` header of the profiled request.
+        x_profile (str): The profiling token (`PROFILE_TOKEN`).
+
+    Returns:
+        FileResponse: The profile artifact.
+
+    Raises:
+        HTTPException: 403 error if the token is not valid, 404 error if the profile does not exist.
+    """
+    if not is_profile_authorized(x_profile):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+    path = profile_path(profile_id)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=f"profile-{profile_id}.txt")
@@ -1,12 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import Iterator, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.exc import SQLAlchemyError  # Para capturar erros específicos de SQLAlchemy
-from fastapi.responses import JSONResponse
-from app.schemas.product_schema import Product, ProductCreate
+from fastapi.responses import JSONResponse, StreamingResponse
+from app import config
+from app.schemas.product_schema import (
+    Product, ProductBulkUpdate, ProductBulkUpdateResult, ProductCreate, ProductImportResult, ProductListFilters,
+)
 from app.services.product_service import ProductService
-from app.api.dependencies import get_db
+from app.repositories.async_product_repository import AsyncProductRepository
+from app.db.group_commit import GroupCommitWriter
+from app.services.product_import_service import ProductImportService, UnsupportedImportFormat
+from app.services.product_update_expression import InvalidUpdateExpression
+from app.services.product_export_service import EXPORT_MEDIA_TYPES, iter_csv, iter_ndjson
+from app.api.dependencies import get_async_read_db, get_db, get_read_db, get_group_writer, get_session_factory
+from app.api.responses import entity_response, rows_response
+from app.exceptions import NotFoundError
 import logging
+import orjson
 
 router = APIRouter()
 
@@ -15,13 +27,18 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 @router.post("/cadastrar", response_model=Product)
-def create_product(product: ProductCreate, db: Session = Depends(get_db)) -> Product:
+def create_product(
+    product: ProductCreate,
+    db: Session = Depends(get_db),
+    writer: Optional[GroupCommitWriter] = Depends(get_group_writer),
+) -> Product:
     """
     Create a new product with the given product data.
 
     Args:
         product (ProductCreate): The product data used for creating a new product.
         db (Session): Dependency injection of the database session.
+        writer (Optional[GroupCommitWriter]): The group-commit writer, when enabled.
 
     Returns:
         Product: The created product object.
@@ -30,7 +47,7 @@ def create_product(product: ProductCreate, db: Session = Depends(get_db)) -> Pro
         HTTPException: 500 error if there is a problem creating the product.
     """
     try:
-        product_service = ProductService(db)
+        product_service = ProductService(db, writer)
         created_product = product_service.create_product(product)
         return created_product
     except SQLAlchemyError as e:
@@ -40,24 +57,143 @@ def create_product(product: ProductCreate, db: Session = Depends(get_db)) -> Pro
         logger.error(f"Error creating product: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/produtos/listagem", response_model=List[Product])
-def read_products(db: Session = Depends(get_db)) -> List[Product]:
+@router.post("/bulk", response_model=ProductImportResult)
+async def bulk_import_products(
+    request: Request,
+    batch_size: int = Query(config.BULK_IMPORT_BATCH_SIZE, ge=1, le=100000, description="Rows inserted per transaction."),
+    db: Session = Depends(get_db),
+) -> ProductImportResult:
+    """
+    Import many products from a JSON array, NDJSON or CSV body.
+
+    Rows are validated while the body is read and inserted in batches of `batch_size`, each
+    batch in a single executemany statement and transaction. Invalid rows do not abort the
+    import; they are listed in the returned error report.
+
+    Args:
+        request (Request): The incoming request; its `Content-Type` selects the parser.
+        batch_size (int): Rows inserted per transaction.
+        db (Session): Dependency injection of the database session.
+
+    Returns:
+        ProductImportResult: Inserted and failed counts with a per-row error report.
+
+    Raises:
+        HTTPException: 415 error if the content type is not supported.
+        HTTPException: 400 error if the body is malformed.
+        HTTPException: 500 error if there is a database problem.
+    """
+    import_service = ProductImportService(db, batch_size)
+    try:
+        return await import_service.import_stream(request.headers.get("content-type", ""), request.stream())
+    except UnsupportedImportFormat as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"{e} (after {import_service.inserted} rows were imported)")
+    except SQLAlchemyError as e:
+        logger.error(f"Database error while importing products: {e}")
+        raise HTTPException(status_code=500, detail="Failed to import products due to a database error.")
+
+@router.patch("/bulk", response_model=ProductBulkUpdateResult)
+def bulk_update_products(selection: ProductBulkUpdate, db: Session = Depends(get_db)) -> ProductBulkUpdateResult:
     """
-    Retrieve a list of products.
+    Update every product of a category, supplier and/or ID list with a single `UPDATE`, e.g.
+    `{"category_id": 3, "expression": "+5%"}` or
+    `{"ids": [1, 2], "expression": "sale_price = purchase_price * 1.35"}`.
 
     Args:
+        selection (ProductBulkUpdate): The filters (combined with AND) and the update expression.
         db (Session): Dependency injection of the database session.
 
     Returns:
-        List[Product]: A list of products.
+        ProductBulkUpdateResult: The number of products updated.
 
     Raises:
+        HTTPException: 400 error if the expression is not supported.
+        HTTPException: 500 error if there is a database problem.
+    """
+    try:
+        updated = ProductService(db).bulk_update_products(selection)
+    except InvalidUpdateExpression as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except SQLAlchemyError as e:
+        logger.error(f"Database error while updating products: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update products due to a database error.")
+    return ProductBulkUpdateResult(updated=updated)
+
+def listing_filters(
+    category_id: Optional[int] = Query(None, description="Only products of this category."),
+    supplier_id: Optional[int] = Query(None, description="Only products of this supplier."),
+    min_price: Optional[float] = Query(None, ge=0, description="Minimum sale price."),
+    max_price: Optional[float] = Query(None, ge=0, description="Maximum sale price."),
+    min_quantity: Optional[int] = Query(None, description="Minimum quantity in stock."),
+    max_quantity: Optional[int] = Query(None, description="Maximum quantity in stock."),
+    sort: str = Query(
+        "id",
+        pattern="^-?(id|name|sale_price|quantity)$",
+        description='Sort column, "-" prefix for descending; ties are broken by ID.',
+    ),
+) -> ProductListFilters:
+    """Collect the listing filters from the query string."""
+    return ProductListFilters(
+        category_id=category_id,
+        supplier_id=supplier_id,
+        min_price=min_price,
+        max_price=max_price,
+        min_quantity=min_quantity,
+        max_quantity=max_quantity,
+        sort=sort,
+    )
+
+@router.get(
+    "/produtos/listagem",
+    response_model=None,
+    responses={200: {"model": List[Product], "content": {"application/x-ndjson": {}}}},
+)
+def read_products(
+    limit: int = Query(100, ge=1, le=10000, description="Maximum number of products per page."),
+    after: Optional[int] = Query(None, description="ID of the last product of the previous page."),
+    output_format: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
+    filters: ProductListFilters = Depends(listing_filters),
+    db: Session = Depends(get_read_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+) -> Response:
+    """
+    Retrieve a filtered, sorted list of products using keyset pagination.
+
+    Products can be filtered by category, supplier, sale price range and quantity thresholds,
+    and sorted by ID, name, sale price or quantity; every combination is served by an index.
+    With `format=json` a single page is returned and the cursor for the next page (the ID of
+    the last product) is sent in the `X-Next-Cursor` header. With `format=ndjson` every
+    matching product after the cursor is streamed, one JSON object per line, ignoring `limit`.
+    Both encode the selected columns with orjson, without building ORM objects or validating
+    them through `response_model`.
+
+    Args:
+        limit (int): Maximum number of products per page.
+        after (Optional[int]): ID of the last product of the previous page.
+        output_format (str): Either "json" or "ndjson".
+        filters (ProductListFilters): Filters and sort order from the query string.
+        db (Session): Dependency injection of the database session.
+        session_factory (sessionmaker): Factory for the session owned by the streamed response.
+
+    Returns:
+        Response: A JSON page of products, or a streamed NDJSON response.
+
+    Raises:
+        HTTPException: 400 error if the cursor product no longer exists.
         HTTPException: 500 error if there is a problem retrieving the products.
     """
     try:
+        if output_format == "ndjson":
+            stream = _start_stream(_stream_products(session_factory, after, filters))
+            return StreamingResponse(stream, media_type="application/x-ndjson")
         product_service = ProductService(db)
-        products = product_service.get_products()
-        return products
+        products = product_service.get_products_page(limit, after, filters)
+        headers = {"X-Next-Cursor": str(products[-1].id)} if len(products) == limit else None
+        return rows_response(products, headers)
+    except NotFoundError:
+        raise HTTPException(status_code=400, detail="Cursor inválido: o produto informado em 'after' não existe mais")
     except SQLAlchemyError as e:
         logger.error(f"Database error while retrieving products: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve products due to a database error.")
@@ -65,43 +201,169 @@ def read_products(db: Session = Depends(get_db)) -> List[Product]:
         logger.error(f"Error retrieving products: {e}")
         raise HTTPException(status_code=500, detail="An unexpected error occurred.")
 
+def _start_stream(stream: Iterator) -> Iterator:
+    """
+    Run a stream generator up to its first `yield`, where its query has been started.
+
+    An invalid cursor or a failing query is raised here, while the route can still answer
+    with an error status. The generator owns its session, so if the response is dropped
+    before it is sent, closing the generator closes the session.
+    """
+    next(stream)
+    return stream
+
+def _stream_products(session_factory: sessionmaker, after: Optional[int], filters: ProductListFilters) -> Iterator[bytes]:
+    """
+    Yield products as NDJSON lines from a session owned by the generator.
+
+    The request-scoped session is closed before the body is sent, so the stream opens its
+    own. The first `yield` only marks the query as started (see `_start_stream`). An error
+    after that is logged and re-raised, so the connection is closed without the end of the
+    chunked body and the client sees an incomplete response instead of a short one.
+    """
+    with session_factory() as db:
+        products = ProductService(db).iter_products(after, filters)
+        yield b""
+        try:
+            for product in products:
+                yield orjson.dumps(product._asdict()) + b"\n"
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while streaming products: {e}")
+            raise
+
+@router.get("/search", response_model=List[Product])
+def search_products(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Words of the product name; each one matches as a prefix."),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of products per page."),
+    offset: int = Query(0, ge=0, le=10000, description="Number of matches to skip."),
+    category_id: Optional[int] = Query(None, description="Only products of this category."),
+    supplier_id: Optional[int] = Query(None, description="Only products of this supplier."),
+    db: Session = Depends(get_read_db),
+) -> List[Product]:
+    """
+    Search products by the words of their name using the FTS5 index, ranked by bm25.
+
+    When the page is full the offset of the next page is sent in the `X-Next-Offset` header.
+
+    Args:
+        response (Response): The outgoing response, used to set the pagination header.
+        q (str): The search text, e.g. "cad azu" finds "Cadeira Azul".
+        limit (int): Maximum number of products per page.
+        offset (int): Number of matches to skip.
+        category_id (Optional[int]): Only products of this category.
+        supplier_id (Optional[int]): Only products of this supplier.
+        db (Session): Dependency injection of the database session.
+
+    Returns:
+        List[Product]: The matching products, best matches first.
+
+    Raises:
+        HTTPException: 500 error if there is a problem searching the products.
+    """
+    try:
+        products = ProductService(db).search_products(q, limit, offset, category_id, supplier_id)
+    except SQLAlchemyError as e:
+        logger.error(f"Database error while searching products: {e}")
+        raise HTTPException(status_code=500, detail="Failed to search products due to a database error.")
+    if len(products) == limit:
+        response.headers["X-Next-Offset"] = str(offset + limit)
+    return products
+
+@router.get("/export")
+def export_products(
+    output_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    session_factory: sessionmaker = Depends(get_session_factory),
+) -> StreamingResponse:
+    """
+    Export every product with its category name and supplier name and email.
+
+    The rows come from a single joined query over a server-side cursor and are streamed as
+    they are read, so the export uses constant memory whatever the number of products.
+
+    Args:
+        output_format (str): Either "csv" or "ndjson".
+        session_factory (sessionmaker): Factory for the session owned by the streamed response.
+
+    Returns:
+        StreamingResponse: The streamed CSV or NDJSON export.
+
+    Raises:
+        HTTPException: 500 error if the export query cannot be started.
+    """
+    encoder = iter_csv if output_format == "csv" else iter_ndjson
+    try:
+        stream = _start_stream(_stream_export(session_factory, encoder))
+    except SQLAlchemyError as e:
+        logger.error(f"Database error while exporting products: {e}")
+        raise HTTPException(status_code=500, detail="Failed to export products due to a database error.")
+    return StreamingResponse(
+        stream,
+        media_type=EXPORT_MEDIA_TYPES[output_format],
+        headers={"Content-Disposition": f'attachment; filename="products.{output_format}"'},
+    )
+
+def _stream_export(session_factory: sessionmaker, encoder) -> Iterator:
+    """Yield the encoded export from a session owned by the generator, like `_stream_products`."""
+    with session_factory() as db:
+        rows = ProductService(db).iter_export_rows()
+        yield b""
+        try:
+            yield from encoder(rows)
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while exporting products: {e}")
+            raise
+
 @router.get("/{product_id}", response_model=Product)
-def read_product(product_id: int, db: Session = Depends(get_db)) -> Product:
+async def read_product(product_id: int, request: Request, db: AsyncSession = Depends(get_async_read_db)) -> Response:
     """
     Retrieve a specific product by its ID.
 
+    The product is served from the entity cache with an `ETag`; a matching `If-None-Match`
+    header gets a 304 Not Modified. The handler runs on the event loop and awaits the
+    database on the asyncio engine, so a cache hit does not take a threadpool slot.
+
     Args:
         product_id (int): The unique identifier for the product.
-        db (Session): Dependency injection of the database session.
+        request (Request): The incoming request, read for `If-None-Match`.
+        db (AsyncSession): Dependency injection of the asyncio database session.
 
     Returns:
-        Product: The retrieved product object.
+        Response: The product JSON, or a 304 response.
 
     Raises:
         HTTPException: 404 error if no product is found.
     """
     try:
-        product_service = ProductService(db)
-        product = product_service.get_product(product_id)
-        if product is None:
-            raise HTTPException(status_code=404, detail="Product not found")
-        return product
+        entry = await AsyncProductRepository(db).get_entry(product_id)
     except SQLAlchemyError as e:
         logger.error(f"Database error while retrieving product: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve product due to a database error.")
     except Exception as e:
         logger.error(f"Error retrieving product: {e}")
         raise HTTPException(status_code=500, detail="An unexpected error occurred.")
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return entity_response(request, entry)
 
 @router.put("/editar/{product_id}", response_model=Product)
-def update_product(product_id: int, product_data: ProductCreate, db: Session = Depends(get_db)) -> Product:
+def update_product(
+    product_id: int,
+    product_data: ProductCreate,
+    db: Session = Depends(get_db),
+    writer: Optional[GroupCommitWriter] = Depends(get_group_writer),
+) -> Product:
     """
     Update an existing product with new data.
 
+    With `GROUP_COMMIT_ENABLED` the update is committed in one transaction with those of
+    concurrent requests, and the response is sent once that transaction is committed.
+
     Args:
         product_id (int): The unique identifier for the product.
         product_data (ProductCreate): New data for updating the product.
         db (Session): Dependency injection of the database session.
+        writer (Optional[GroupCommitWriter]): The group-commit writer, when enabled.
 
     Returns:
         Product: The updated product object.
@@ -111,7 +373,7 @@ def update_product(product_id: int, product_data: ProductCreate, db: Session = D
         HTTPException: 500 error if there is a problem updating the product.
     """
     try:
-        product_service = ProductService(db)
+        product_service = ProductService(db, writer)
         updated_product = product_service.update_product(product_id, product_data)
         if updated_product is None:
             raise HTTPException(status_code=404, detail="Product not found")
@@ -124,13 +386,18 @@ def update_product(product_id: int, product_data: ProductCreate, db: Session = D
         raise HTTPException(status_code=500, detail="An unexpected error occurred.")
 
 @router.delete("/delete/{product_id}", status_code=204)
-def delete_product(product_id: int, db: Session = Depends(get_db)) -> None:
+def delete_product(
+    product_id: int,
+    db: Session = Depends(get_db),
+    writer: Optional[GroupCommitWriter] = Depends(get_group_writer),
+) -> None:
     """
     Delete a product by its ID.
 
     Args:
         product_id (int): The unique identifier for the product.
         db (Session): Dependency injection of the database session.
+        writer (Optional[GroupCommitWriter]): The group-commit writer, when enabled.
 
     Returns:
         dict: A confirmation message of deletion.
@@ -140,7 +407,7 @@ def delete_product(product_id: int, db: Session = Depends(get_db)) -> None:
         HTTPException: 500 error if there is a problem deleting the product.
     """
     try:
-        product_service = ProductService(db)
+        product_service = ProductService(db, writer)
         if not product_service.delete_product(product_id):
             raise HTTPException(status_code=404, detail="Product not found")
         return {"detail": "Product successfully deleted"}
@@ -0,0 +1,69 @@
+from fastapi import APIRouter, Depends, HTTPException
+from typing import List
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from app.schemas.report_schema import InventoryGroup, InventoryValuation
+from app.services.inventory_report_service import InventoryReportService
+from app.api.dependencies import get_read_db
+
+router = APIRouter()
+
+@router.get("/inventory", response_model=InventoryValuation)
+def read_inventory_totals(db: Session = Depends(get_read_db)) -> InventoryValuation:
+    """
+    Retrieve the stock value (`quantity * purchase_price`), potential revenue
+    (`quantity * sale_price`) and margin of the whole inventory.
+
+    Args:
+        db (Session): Dependency injection of the database session.
+
+    Returns:
+        InventoryValuation: The inventory totals.
+
+    Raises:
+        HTTPException: 500 error if there is a problem computing the report.
+    """
+    try:
+        return InventoryReportService(db).get_totals()
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve inventory report: {e}")
+
+@router.get("/inventory/categorias", response_model=List[InventoryGroup])
+def read_inventory_by_category(db: Session = Depends(get_read_db)) -> List[InventoryGroup]:
+    """
+    Retrieve the stock value, potential revenue and margin per category. Answered from the
+    inventory summary table, so the cost grows with the number of categories, not products.
+
+    Args:
+        db (Session): Dependency injection of the database session.
+
+    Returns:
+        List[InventoryGroup]: One entry per category; id 0 groups products without category.
+
+    Raises:
+        HTTPException: 500 error if there is a problem computing the report.
+    """
+    try:
+        return InventoryReportService(db).get_by("category")
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve inventory report: {e}")
+
+@router.get("/inventory/fornecedores", response_model=List[InventoryGroup])
+def read_inventory_by_supplier(db: Session = Depends(get_read_db)) -> List[InventoryGroup]:
+    """
+    Retrieve the stock value, potential revenue and margin per supplier. Answered from the
+    inventory summary table, so the cost grows with the number of suppliers, not products.
+
+    Args:
+        db (Session): Dependency injection of the database session.
+
+    Returns:
+        List[InventoryGroup]: One entry per supplier; id 0 groups products without supplier.
+
+    Raises:
+        HTTPException: 500 error if there is a problem computing the report.
+    """
+    try:
+        return InventoryReportService(db).get_by("supplier")
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve inventory report: {e}")
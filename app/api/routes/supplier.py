@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from typing import List
 from app.schemas.supplier_schema import Supplier, SupplierCreate
+from app.schemas.sync_schema import SyncResult
 from app.services.supplier_service import SupplierService
-from app.api.dependencies import get_db
+from app.repositories.async_supplier_repository import AsyncSupplierRepository
+from app.api.dependencies import get_async_read_db, get_db, get_read_db
+from app.api.responses import entity_response, model_list_response
+from app.exceptions import DatabaseOperationError
 
 router = APIRouter()
 
@@ -29,50 +34,82 @@ def create_supplier(supplier_data: SupplierCreate, db: Session = Depends(get_db)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.put("/sync", response_model=SyncResult)
+def sync_suppliers(suppliers: List[SupplierCreate], db: Session = Depends(get_db)) -> SyncResult:
+    """
+    Create or update many suppliers by name, e.g. the nightly export of the ERP.
+
+    Suppliers are written with `INSERT … ON CONFLICT (name) DO UPDATE` in batches; rows whose
+    email and phone did not change are not rewritten. A row that collides with the email or
+    phone of another supplier is reported in `errors` without stopping the sync.
+
+    Args:
+        suppliers (List[SupplierCreate]): The suppliers to create or update.
+        db (Session, optional): Dependency injection of the database session.
+
+    Returns:
+        SyncResult: Created, updated, unchanged and failed counts with the errors.
+
+    Raises:
+        HTTPException: 500 error if there is a database related error.
+        HTTPException: 501 error if the database has no `INSERT … ON CONFLICT`.
+    """
+    try:
+        return SupplierService(db).sync_suppliers(suppliers)
+    except DatabaseOperationError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
 @router.get("/{supplier_id}", response_model=Supplier)
-def read_supplier(supplier_id: int, db: Session = Depends(get_db)):
+async def read_supplier(supplier_id: int, request: Request, db: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve a supplier by their ID. Returns the supplier details if found.
+
+    The supplier is served from the entity cache with an `ETag`; a matching `If-None-Match`
+    header gets a 304 Not Modified. The database is awaited on the asyncio engine.
     
     Args:
         supplier_id (int): The unique identifier for the supplier.
-        db (Session, optional): Dependency injection of the database session.
+        request (Request): The incoming request, read for `If-None-Match`.
+        db (AsyncSession, optional): Dependency injection of the asyncio database session.
     
     Returns:
-        Supplier: The retrieved supplier object.
+        Response: The supplier JSON, or a 304 response.
     
     Raises:
         HTTPException: 404 error if no supplier is found with the provided ID.
         HTTPException: 500 error if there is a database related error.
     """
     try:
-        supplier_service = SupplierService(db)
-        supplier = supplier_service.get_supplier(supplier_id)
-        if supplier is None:
-            raise HTTPException(status_code=404, detail="Supplier not found")
-        return supplier
+        entry = await AsyncSupplierRepository(db).get_entry(supplier_id)
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail="An unexpected error occurred")
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Supplier not found")
+    return entity_response(request, entry)
 
-@router.get("/fornecedores/listagem", response_model=List[Supplier])
-def read_suppliers(db: Session = Depends(get_db)):
+@router.get("/fornecedores/listagem", response_model=None, responses={200: {"model": List[Supplier]}})
+def read_suppliers(db: Session = Depends(get_read_db)) -> Response:
     """
     Retrieve a list of suppliers. 
+
+    Each supplier is validated once and dumped straight to JSON (see `model_list_response`).
     
     Args:
         db (Session, optional): Dependency injection of the database session.
     
     Returns:
-        List[Supplier]: A list of suppliers.
+        Response: The JSON list of suppliers.
     
     Raises:
         HTTPException: 500 error if there is a database related error or any other unexpected error.
     """
     try:
         supplier_service = SupplierService(db)
-        return supplier_service.get_suppliers()
+        return model_list_response(Supplier, supplier_service.get_suppliers())
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
@@ -1,30 +1,72 @@
-from fastapi import HTTPException, Header, Depends, Security
-from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+import hashlib
+import time
+from typing import Optional
 
-from app.models.models import User
-from app.repositories.user_repository import UserRepository
-from app.api.dependencies import get_db
+import jwt
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-# Configurando o esquema OAuth2 com Password e Bearer (token)
-# oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+from app import config
+from app.cache import LRUCache
 
-SECRET_KEY = "9ba263503b01ce2ef81f6641f504b45333aa0662183d0184db79d9e92ccef620"
-ALGORITHM = "HS256"
+# Esquema Bearer: aparece no botão "Authorize" do /docs
+bearer_scheme = HTTPBearer(auto_error=False)
 
-async def token_required(Authorization: str = Header(None)):
-    if Authorization:
-        token = Authorization.split(' ')[1]
-    else:
-        raise HTTPException(status_code=401, detail="Token is missing")
+# Claims já verificados, indexados pelo digest do token e válidos até o "exp"
+token_cache = LRUCache(config.TOKEN_CACHE_MAXSIZE, config.JWT_EXPIRATION_SECONDS)
+
+def verify_token(token: str) -> dict:
+    """
+    Verify a JWT issued by `AuthService.create_token` and return its claims.
+
+    The signature is checked once per token; the decoded claims are then kept in a bounded
+    cache keyed by the SHA-256 digest of the token until the token expires.
+
+    Args:
+        token (str): The encoded JWT.
+
+    Returns:
+        dict: The token claims (`sub`, `email`, `iat`, `exp`).
+
+    Raises:
+        jwt.ExpiredSignatureError: If the token has expired.
+        jwt.InvalidTokenError: If the token is malformed or its signature is invalid.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    claims = token_cache.get(key)
+    if claims is not None:
+        return claims
+
+    claims = jwt.decode(
+        token,
+        config.JWT_SECRET_KEY,
+        algorithms=[config.JWT_ALGORITHM],
+        options={"require": ["exp", "sub"]},
+    )
+    ttl = claims["exp"] - time.time()
+    if ttl > 0:
+        token_cache.set(key, claims, ttl)
+    return claims
+
+async def token_required(credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)) -> dict:
+    """
+    Dependency that requires a valid bearer token and returns its claims.
+
+    Args:
+        credentials (Optional[HTTPAuthorizationCredentials]): The parsed `Authorization` header.
+
+    Returns:
+        dict: The verified token claims.
+
+    Raises:
+        HTTPException: 401 error if the token is missing, expired or invalid.
+    """
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Token is missing", headers={"WWW-Authenticate": "Bearer"})
 
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
-        current_user = payload['email']  
+        return verify_token(credentials.credentials)
     except jwt.ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token has expired")
-    except jwt.JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    return current_user
\ No newline at end of file
+        raise HTTPException(status_code=401, detail="Token has expired", headers={"WWW-Authenticate": "Bearer"})
+    except jwt.InvalidTokenError:
+        raise HTTPException(status_code=401, detail="Invalid token", headers={"WWW-Authenticate": "Bearer"})
@@ -0,0 +1,109 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional
+
+from pydantic import BaseModel
+
+from app import config
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU cache whose entries also expire after a TTL.
+
+    Keys are usually `(namespace, id)` tuples so a whole namespace can be dropped at once.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Args:
+            maxsize (int): Maximum number of entries; the least recently used entry is evicted first.
+            ttl (float): Default time to live of an entry, in seconds.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for `key`, or None if it is missing or expired."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store `value` under `key`, expiring after `ttl` seconds (the cache default if None)."""
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove `key` from the cache if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_namespace(self, namespace: str) -> None:
+        """Remove every entry whose key is a tuple starting with `namespace`."""
+        with self._lock:
+            for key in [k for k in self._entries if isinstance(k, tuple) and k[0] == namespace]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+@dataclass(frozen=True)
+class CachedEntity:
+    """A response schema together with its serialized JSON body and ETag."""
+
+    value: BaseModel
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_model(cls, value: BaseModel) -> "CachedEntity":
+        """Serialize `value` once and derive a strong ETag from the bytes."""
+        body = value.model_dump_json().encode()
+        return cls(value=value, body=body, etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+
+entity_cache = LRUCache(config.ENTITY_CACHE_MAXSIZE, config.ENTITY_CACHE_TTL_SECONDS)
+
+def configure_entity_cache(workers: int, detects_external_writes: bool = False) -> None:
+    """
+    Turn the entity cache off when several workers serve the app and a worker cannot tell
+    that another one wrote, unless `ENTITY_CACHE_MAXSIZE` is set explicitly.
+
+    The cache lives in each process and a write only invalidates it in the worker that made
+    the write. On SQLite the repositories compare `PRAGMA data_version` before serving an
+    entry and drop the cache after a commit from another process; on other databases the
+    other workers would keep serving the old body, and answering 304 to its ETag, until the
+    TTL expires. With `DATABASE_READ_URL` the cache is off by default for a similar reason: a
+    lagging replica could put an old row back right after the write.
+
+    Args:
+        workers (int): Number of server processes.
+        detects_external_writes (bool): The database tells when another process committed
+            (SQLite's `data_version`).
+    """
+    if workers > 1 and not detects_external_writes and not os.environ.get("ENTITY_CACHE_MAXSIZE"):
+        entity_cache.maxsize = 0
+        entity_cache.clear()
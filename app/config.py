@@ -0,0 +1,93 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _int_env(name: str, default: int) -> int:
+    """Read an integer setting from the environment, falling back to `default`."""
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+# Servidor de produção (gunicorn.conf.py): workers uvicorn com o app pré-carregado
+SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+SERVER_PORT = _int_env("PORT", 8000)
+WEB_CONCURRENCY = _int_env("WEB_CONCURRENCY", os.cpu_count() or 1)
+SERVER_TIMEOUT = _int_env("SERVER_TIMEOUT", 60)
+SERVER_GRACEFUL_TIMEOUT = _int_env("SERVER_GRACEFUL_TIMEOUT", 30)
+SERVER_KEEPALIVE = _int_env("SERVER_KEEPALIVE", 5)
+SERVER_MAX_REQUESTS = _int_env("SERVER_MAX_REQUESTS", 0)
+
+# Banco de dados: qualquer URL do SQLAlchemy (sqlite:///..., postgresql://...)
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(BASE_DIR, 'db', 'prod.db')}")
+# Leituras (GET) em um engine só de leitura: réplica, ou vazio para o próprio arquivo SQLite
+# aberto com mode=ro (ou um segundo pool no banco servidor)
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL", "")
+
+# Perfil SQLite, aplicado em cada conexão aberta
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = _int_env("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)
+SQLITE_CACHE_SIZE = _int_env("SQLITE_CACHE_SIZE", -64000)  # negativo = KiB, ou seja ~64 MB
+SQLITE_BUSY_TIMEOUT_MS = _int_env("SQLITE_BUSY_TIMEOUT_MS", 5000)
+SQLITE_TEMP_STORE = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+
+# Perfil com pool, usado para bancos servidor
+DB_POOL_SIZE = _int_env("DB_POOL_SIZE", 10)
+DB_MAX_OVERFLOW = _int_env("DB_MAX_OVERFLOW", 20)
+DB_POOL_RECYCLE = _int_env("DB_POOL_RECYCLE", 1800)
+DB_POOL_TIMEOUT = _int_env("DB_POOL_TIMEOUT", 30)
+
+# Group commit: escritas de produtos concorrentes gravadas em uma única transação por uma thread
+GROUP_COMMIT_ENABLED = os.getenv("GROUP_COMMIT_ENABLED", "false").lower() in ("1", "true", "yes")
+GROUP_COMMIT_WINDOW_MS = float(os.getenv("GROUP_COMMIT_WINDOW_MS", "2"))
+GROUP_COMMIT_MAX_BATCH = _int_env("GROUP_COMMIT_MAX_BATCH", 256)
+
+# Importação em massa de produtos
+BULK_IMPORT_BATCH_SIZE = _int_env("BULK_IMPORT_BATCH_SIZE", 5000)
+
+# Sincronização (upsert) de categorias e fornecedores: linhas por INSERT ... ON CONFLICT
+SYNC_BATCH_SIZE = _int_env("SYNC_BATCH_SIZE", 1000)
+
+# Cache em memória de entidades lidas por ID, por processo (ver app/cache.py): sem valor
+# explícito fica desligado com réplica de leitura e, pelo gunicorn.conf.py, com vários workers
+# fora do SQLite (no SQLite o PRAGMA data_version revela as escritas dos outros workers)
+ENTITY_CACHE_MAXSIZE = _int_env("ENTITY_CACHE_MAXSIZE", 0 if DATABASE_READ_URL else 10000)
+ENTITY_CACHE_TTL_SECONDS = _int_env("ENTITY_CACHE_TTL_SECONDS", 60)
+
+# Hash de senhas em um pool de processos dedicado (0 workers = executa na própria thread)
+PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+PASSWORD_HASH_SALT_LENGTH = _int_env("PASSWORD_HASH_SALT_LENGTH", 16)
+PASSWORD_HASH_WORKERS = _int_env("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1))
+PASSWORD_HASH_QUEUE_DEPTH = _int_env("PASSWORD_HASH_QUEUE_DEPTH", 64)
+PASSWORD_HASH_TIMEOUT_SECONDS = _int_env("PASSWORD_HASH_TIMEOUT_SECONDS", 10)
+
+# Questão 1 em lote: grupos de ~VOWEL_BATCH_GROUP_CHARS caracteres analisados em paralelo
+VOWEL_BATCH_WORKERS = _int_env("VOWEL_BATCH_WORKERS", os.cpu_count() or 1)
+VOWEL_BATCH_QUEUE_DEPTH = _int_env("VOWEL_BATCH_QUEUE_DEPTH", 256)
+VOWEL_BATCH_GROUP_CHARS = _int_env("VOWEL_BATCH_GROUP_CHARS", 1_000_000)
+# Lotes com até esse total de caracteres são analisados em uma thread, sem ir ao pool
+VOWEL_BATCH_INLINE_CHARS = _int_env("VOWEL_BATCH_INLINE_CHARS", 64 * 1024)
+
+# Métricas Prometheus em /metrics (latência por rota e SQL por requisição)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Diagnóstico: log de queries lentas, detector de N+1 e profiling sob demanda
+DIAGNOSTICS_ENABLED = os.getenv("DIAGNOSTICS_ENABLED", "false").lower() in ("1", "true", "yes")
+SLOW_QUERY_MS = _int_env("SLOW_QUERY_MS", 200)
+N_PLUS_ONE_THRESHOLD = _int_env("N_PLUS_ONE_THRESHOLD", 10)
+# Requisições com "X-Profile: <PROFILE_TOKEN>" são amostradas (vazio = profiling desligado)
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_SAMPLE_INTERVAL_MS = _int_env("PROFILE_SAMPLE_INTERVAL_MS", 1)
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(BASE_DIR, "db", "profiles"))
+PROFILE_MAX_ARTIFACTS = _int_env("PROFILE_MAX_ARTIFACTS", 50)
+
+# JWT
+JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "9ba263503b01ce2ef81f6641f504b45333aa0662183d0184db79d9e92ccef620")
+JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+JWT_EXPIRATION_SECONDS = _int_env("JWT_EXPIRATION_SECONDS", 24 * 60 * 60)
+TOKEN_CACHE_MAXSIZE = _int_env("TOKEN_CACHE_MAXSIZE", 10000)
+# Exige token nas rotas de categorias, fornecedores, produtos e relatórios; desligado só para o
+# desenvolvimento local: o dockerfile e o render.yaml definem AUTH_REQUIRED=true
+AUTH_REQUIRED = os.getenv("AUTH_REQUIRED", "false").lower() in ("1", "true", "yes")
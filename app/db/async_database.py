@@ -0,0 +1,62 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from app import config
+from app.db.database import (
+    SQLALCHEMY_DATABASE_URL, apply_sqlite_pragmas, apply_sqlite_transactions, attach_sql_accounting, engine_options,
+    is_sqlite, read_only_url,
+)
+
+# Driver assíncrono usado para cada backend quando a URL não define um
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+}
+
+def to_async_url(database_url: str) -> str:
+    """
+    Convert a synchronous SQLAlchemy URL into its asyncio equivalent.
+
+    `sqlite:///prod.db` becomes `sqlite+aiosqlite:///prod.db`, `postgresql://...` becomes
+    `postgresql+asyncpg://...`. URLs that already name a driver are returned unchanged.
+
+    Args:
+        database_url (str): The synchronous database URL.
+
+    Returns:
+        str: The URL using an asyncio driver.
+    """
+    url = make_url(database_url)
+    if "+" in url.drivername:
+        return url.render_as_string(hide_password=False)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No asyncio driver known for database backend '{url.get_backend_name()}'")
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+def create_async_db_engine(database_url: str = SQLALCHEMY_DATABASE_URL, read_only: bool = False) -> AsyncEngine:
+    """
+    Create an asyncio engine with the same SQLite or pooled profile as `create_db_engine`.
+
+    Args:
+        database_url (str): The synchronous database URL.
+        read_only (bool): The engine is the read-only one (see `read_only_url`).
+
+    Returns:
+        AsyncEngine: The configured asyncio engine.
+    """
+    engine = create_async_engine(to_async_url(database_url), **engine_options(database_url))
+    if is_sqlite(database_url):
+        apply_sqlite_pragmas(engine.sync_engine, read_only)
+        apply_sqlite_transactions(engine.sync_engine)
+    if config.METRICS_ENABLED or config.DIAGNOSTICS_ENABLED:
+        attach_sql_accounting(engine.sync_engine)
+    return engine
+
+async_engine = create_async_db_engine()
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# Engine assíncrono só de leitura, como `read_engine` (ver `get_async_read_db`)
+_read_url = read_only_url(SQLALCHEMY_DATABASE_URL, config.DATABASE_READ_URL)
+async_read_engine = create_async_db_engine(_read_url, read_only=True) if _read_url else async_engine
+AsyncReadSessionLocal = async_sessionmaker(bind=async_read_engine, autoflush=False, expire_on_commit=False)
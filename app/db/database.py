@@ -1,14 +1,199 @@
-from sqlalchemy import create_engine
+import os
+import time
+from typing import Optional
+from urllib.parse import quote
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-import os
+from app import config
+from app import diagnostics, metrics
+
+SQLALCHEMY_DATABASE_URL = config.DATABASE_URL
+
+def is_sqlite(database_url: str) -> bool:
+    """Return True when the URL points to a SQLite database."""
+    return make_url(database_url).get_backend_name() == "sqlite"
+
+def engine_options(database_url: str) -> dict:
+    """
+    Build the `create_engine` keyword arguments for the profile matching the URL.
+
+    SQLite connections are shared across the threadpool and wait up to the busy timeout
+    for the write lock. Server databases get a sized connection pool that recycles and
+    pre-pings connections.
+
+    Args:
+        database_url (str): The SQLAlchemy database URL.
+
+    Returns:
+        dict: Keyword arguments for `create_engine` / `create_async_engine`.
+    """
+    if is_sqlite(database_url):
+        return {
+            "connect_args": {
+                "check_same_thread": False,
+                "timeout": config.SQLITE_BUSY_TIMEOUT_MS / 1000,
+            }
+        }
+    return {
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_pre_ping": True,
+    }
+
+def apply_sqlite_pragmas(engine: Engine, read_only: bool = False) -> None:
+    """
+    Apply the tuned SQLite pragmas to every connection the engine opens.
+
+    Args:
+        engine (Engine): A synchronous engine (use `AsyncEngine.sync_engine` for async engines).
+        read_only (bool): The engine only reads: the journal mode, which a read-only connection
+            cannot change, is left to the primary and `query_only` is turned on.
+    """
+    pragmas = (
+        f"PRAGMA synchronous={config.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA mmap_size={config.SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size={config.SQLITE_CACHE_SIZE}",
+        f"PRAGMA busy_timeout={config.SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA temp_store={config.SQLITE_TEMP_STORE}",
+    )
+    if read_only:
+        pragmas += ("PRAGMA query_only=ON",)
+    else:
+        pragmas = (f"PRAGMA journal_mode={config.SQLITE_JOURNAL_MODE}",) + pragmas
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+def apply_sqlite_transactions(engine: Engine) -> None:
+    """
+    Let SQLAlchemy, not pysqlite, open the SQLite transactions.
+
+    pysqlite only emits BEGIN before INSERT/UPDATE/DELETE. A SAVEPOINT that comes first then
+    starts the transaction itself, and its RELEASE commits it, so `begin_nested()` would
+    commit part of a unit of work. With the driver's own transaction handling off
+    (`isolation_level=None`), every SQLAlchemy transaction starts with an explicit BEGIN and
+    savepoints nest inside it.
+
+    Args:
+        engine (Engine): A synchronous SQLite engine.
+    """
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATABASE_URL = os.path.join(BASE_DIR, 'prod.db')
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
 
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{DATABASE_URL}"
+def attach_sql_accounting(engine: Engine) -> None:
+    """
+    Time every statement the engine executes and hand it to the metrics of the current request
+    and, in diagnostics mode, to the slow-query log and the N+1 check.
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+    Args:
+        engine (Engine): A synchronous engine (use `AsyncEngine.sync_engine` for async engines).
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info["sql_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record_statement(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("sql_started", None)
+        if started is None:
+            return
+        duration = time.perf_counter() - started
+        if config.METRICS_ENABLED:
+            metrics.record_statement(duration)
+        if config.DIAGNOSTICS_ENABLED:
+            diagnostics.record_statement(statement, duration)
+
+def check_multiprocess_support(engine: Engine, workers: int) -> None:
+    """
+    Refuse to serve a SQLite database from several processes unless it is in WAL mode.
+
+    Without WAL every write locks readers of all the other workers out of the file, and an
+    in-memory database would be a different database in each worker.
+
+    Args:
+        engine (Engine): The engine the workers will use.
+        workers (int): Number of server processes.
+
+    Raises:
+        RuntimeError: If `workers > 1` and the SQLite journal mode is not WAL.
+    """
+    if workers <= 1 or engine.dialect.name != "sqlite":
+        return
+    with engine.connect() as connection:
+        journal_mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+    if str(journal_mode).lower() != "wal":
+        raise RuntimeError(
+            f"Refusing to run {workers} workers on SQLite in journal_mode={journal_mode}: "
+            "set SQLITE_JOURNAL_MODE=WAL (with a file database) or WEB_CONCURRENCY=1"
+        )
+
+def read_only_url(database_url: str, read_url: str = "") -> Optional[str]:
+    """
+    Resolve the URL of the read-only engine.
+
+    `read_url` (a replica) wins when set. A SQLite file is reopened as a `mode=ro` URI, and a
+    server database without a replica gets a second pool on the same URL.
+
+    Args:
+        database_url (str): The URL of the primary database.
+        read_url (str): The replica URL, `DATABASE_READ_URL`, if any.
+
+    Returns:
+        Optional[str]: The read-only URL, or None for an in-memory SQLite database, which a
+        second engine would not see, so reads stay on the primary.
+    """
+    if read_url:
+        return read_url
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return database_url
+    if url.database in (None, "", ":memory:") or url.query.get("mode") == "memory":
+        return None
+    if url.query.get("uri"):
+        return url.update_query_dict({"mode": "ro"}).render_as_string(hide_password=False)
+    path = os.path.abspath(url.database).replace(os.sep, "/")
+    return f"{url.drivername}:///file:{quote(path, safe='/:')}?mode=ro&uri=true"
+
+def create_db_engine(database_url: str = SQLALCHEMY_DATABASE_URL, read_only: bool = False) -> Engine:
+    """
+    Create an engine configured with the SQLite or pooled server profile.
+
+    Args:
+        database_url (str): The SQLAlchemy database URL. Defaults to `DATABASE_URL`.
+        read_only (bool): The engine is the read-only one (see `read_only_url`).
+
+    Returns:
+        Engine: The configured engine.
+    """
+    engine = create_engine(database_url, **engine_options(database_url))
+    if is_sqlite(database_url):
+        apply_sqlite_pragmas(engine, read_only)
+        apply_sqlite_transactions(engine)
+    if config.METRICS_ENABLED or config.DIAGNOSTICS_ENABLED:
+        attach_sql_accounting(engine)
+    return engine
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine só de leitura, com pool próprio, para os GET (ver `get_read_db`)
+_read_url = read_only_url(SQLALCHEMY_DATABASE_URL, config.DATABASE_READ_URL)
+read_engine = create_db_engine(_read_url, read_only=True) if _read_url else engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
 Base = declarative_base()
@@ -0,0 +1,143 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import config
+from app.db.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+Job = Callable[[Session], T]
+
+class GroupCommitWriter:
+    """
+    A background thread that runs the writes of concurrent requests in one transaction
+    (group commit).
+
+    After the first queued job the writer waits up to `window_ms` for more, up to `max_batch`
+    jobs, runs them in one transaction and commits once. If a job raises, the batch is rolled
+    back and rerun with each job in its own savepoint, so only the failing job gets an error.
+    A job's future is resolved only after the commit, so a request never answers before its
+    write is as durable as a commit of its own would have made it. Savepoints stay inside the
+    batch's transaction (on SQLite see `apply_sqlite_transactions`), so nothing of a batch is
+    stored before its commit: if the commit fails, no job was saved and every job gets the
+    error. Jobs may run twice and must only write through `db`.
+
+    The thread is started on the first job, so it does not cross a gunicorn fork.
+    """
+
+    def __init__(self, session_factory: sessionmaker, window_ms: float, max_batch: int):
+        """
+        Args:
+            session_factory (sessionmaker): Factory for the writer's session, one per batch.
+            window_ms (float): How long to wait for more jobs after the first one, in milliseconds.
+            max_batch (int): Maximum number of jobs per transaction.
+        """
+        self.session_factory = session_factory
+        self.window = window_ms / 1000
+        self.max_batch = max(max_batch, 1)
+        self._queue: "queue.Queue[Optional[Tuple[Job, Future]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, job: Job) -> Future:
+        """
+        Queue `job(db)` for the next batch.
+
+        Args:
+            job (Callable[[Session], T]): The write; it must not commit and must return data
+                that stays valid after the session is closed, e.g. a Pydantic schema.
+
+        Returns:
+            Future: Resolved with the job's result, or its error, after the batch commits.
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="group-commit-writer", daemon=True)
+                self._thread.start()
+            self._queue.put((job, future))
+        return future
+
+    def run(self, job: Job) -> T:
+        """
+        Queue `job(db)` and wait until its batch is committed.
+
+        Returns:
+            T: The return value of `job`.
+
+        Raises:
+            Exception: The error raised by `job`, or by the commit of its batch.
+        """
+        return self.submit(job).result()
+
+    def shutdown(self) -> None:
+        """Commit the jobs already queued and stop the writer thread, if it was started."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._queue.put(None)
+        if thread is not None:
+            thread.join()
+
+    def _loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.window
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._run_batch(batch)
+            if stop:
+                return
+
+    def _run_batch(self, batch: List[Tuple[Job, Future]]) -> None:
+        jobs = [(job, future) for job, future in batch if future.set_running_or_notify_cancel()]
+        with self.session_factory() as db:
+            try:
+                # Caminho comum: nenhum job falha e o lote não paga um SAVEPOINT por job
+                outcomes = [(future, job(db), None) for job, future in jobs]
+                db.commit()
+            except Exception:
+                db.rollback()
+                outcomes = self._run_isolated(db, jobs)
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def _run_isolated(self, db: Session, jobs: List[Tuple[Job, Future]]) -> list:
+        """Rerun a failed batch with each job in a savepoint, so only the failing jobs get an error."""
+        outcomes = []
+        for job, future in jobs:
+            try:
+                with db.begin_nested():
+                    outcomes.append((future, job(db), None))
+            except Exception as e:
+                outcomes.append((future, None, e))
+        try:
+            db.commit()
+        except Exception as e:
+            logger.error(f"Group commit of {len(jobs)} writes failed: {e}")
+            db.rollback()
+            outcomes = [(future, None, error or e) for future, _, error in outcomes]
+        return outcomes
+
+group_writer = GroupCommitWriter(SessionLocal, config.GROUP_COMMIT_WINDOW_MS, config.GROUP_COMMIT_MAX_BATCH)
@@ -0,0 +1,129 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from app.db.database import Base, is_sqlite
+
+# Contribuição de uma linha de `products` (NEW ou OLD) para o resumo de estoque
+_GROUP_KEY = "COALESCE({row}.category_id, 0), COALESCE({row}.supplier_id, 0)"
+_COST_CENTS = "CAST(ROUND(COALESCE({row}.quantity, 0) * COALESCE({row}.purchase_price, 0) * 100) AS INTEGER)"
+_REVENUE_CENTS = "CAST(ROUND(COALESCE({row}.quantity, 0) * COALESCE({row}.sale_price, 0) * 100) AS INTEGER)"
+
+def _apply_row(row: str, sign: str) -> str:
+    """Statements adding (`sign="+"`) or removing (`sign="-"`) one product row from the summary."""
+    key = _GROUP_KEY.format(row=row)
+    where = f"category_id = COALESCE({row}.category_id, 0) AND supplier_id = COALESCE({row}.supplier_id, 0)"
+    statements = [
+        f"INSERT OR IGNORE INTO inventory_summary (category_id, supplier_id) VALUES ({key});",
+        f"""UPDATE inventory_summary SET
+            product_count = product_count {sign} 1,
+            total_quantity = total_quantity {sign} COALESCE({row}.quantity, 0),
+            stock_cost_cents = stock_cost_cents {sign} {_COST_CENTS.format(row=row)},
+            stock_revenue_cents = stock_revenue_cents {sign} {_REVENUE_CENTS.format(row=row)}
+        WHERE {where};""",
+    ]
+    if sign == "-":
+        statements.append(f"DELETE FROM inventory_summary WHERE {where} AND product_count = 0;")
+    return "\n".join(statements)
+
+INVENTORY_SUMMARY_TRIGGERS = {
+    "inventory_summary_after_insert": f"""
+        CREATE TRIGGER inventory_summary_after_insert AFTER INSERT ON products BEGIN
+            {_apply_row("NEW", "+")}
+        END""",
+    "inventory_summary_after_delete": f"""
+        CREATE TRIGGER inventory_summary_after_delete AFTER DELETE ON products BEGIN
+            {_apply_row("OLD", "-")}
+        END""",
+    "inventory_summary_after_update": f"""
+        CREATE TRIGGER inventory_summary_after_update
+        AFTER UPDATE OF quantity, purchase_price, sale_price, category_id, supplier_id ON products BEGIN
+            {_apply_row("OLD", "-")}
+            {_apply_row("NEW", "+")}
+        END""",
+}
+
+# Agregação completa sobre `products`, usada para (re)construir o resumo
+INVENTORY_GROUP_BY = f"""
+    SELECT COALESCE(category_id, 0) AS category_id,
+           COALESCE(supplier_id, 0) AS supplier_id,
+           COUNT(*) AS product_count,
+           COALESCE(SUM(quantity), 0) AS total_quantity,
+           COALESCE(SUM({_COST_CENTS.format(row="products")}), 0) AS stock_cost_cents,
+           COALESCE(SUM({_REVENUE_CENTS.format(row="products")}), 0) AS stock_revenue_cents
+    FROM products
+    GROUP BY COALESCE(category_id, 0), COALESCE(supplier_id, 0)
+"""
+
+def rebuild_inventory_summary(connection) -> None:
+    """Recompute `inventory_summary` from scratch with a GROUP BY over `products`."""
+    connection.execute(text("DELETE FROM inventory_summary"))
+    connection.execute(text(
+        "INSERT INTO inventory_summary "
+        "(category_id, supplier_id, product_count, total_quantity, stock_cost_cents, stock_revenue_cents) "
+        + INVENTORY_GROUP_BY
+    ))
+
+# Busca textual: índice FTS5 "external content" sobre products.name (o texto não é duplicado)
+PRODUCT_SEARCH_OBJECTS = {
+    "products_fts": """
+        CREATE VIRTUAL TABLE products_fts USING fts5(
+            name, content='products', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )""",
+    "products_fts_after_insert": """
+        CREATE TRIGGER products_fts_after_insert AFTER INSERT ON products BEGIN
+            INSERT INTO products_fts (rowid, name) VALUES (NEW.id, NEW.name);
+        END""",
+    "products_fts_after_delete": """
+        CREATE TRIGGER products_fts_after_delete AFTER DELETE ON products BEGIN
+            INSERT INTO products_fts (products_fts, rowid, name) VALUES ('delete', OLD.id, OLD.name);
+        END""",
+    "products_fts_after_update": """
+        CREATE TRIGGER products_fts_after_update AFTER UPDATE OF name ON products BEGIN
+            INSERT INTO products_fts (products_fts, rowid, name) VALUES ('delete', OLD.id, OLD.name);
+            INSERT INTO products_fts (rowid, name) VALUES (NEW.id, NEW.name);
+        END""",
+}
+
+def rebuild_product_search(connection) -> None:
+    """Re-index every product name in `products_fts`."""
+    connection.execute(text("INSERT INTO products_fts (products_fts) VALUES ('rebuild')"))
+
+def _install(connection, existing: set, objects: dict, backfill) -> None:
+    """Create the objects missing from `existing` and, if any was created, run `backfill`."""
+    missing = [name for name in objects if name not in existing]
+    for name in missing:
+        connection.execute(text(objects[name]))
+    if missing:
+        backfill(connection)
+
+def create_missing_indexes(connection) -> None:
+    """
+    Create the indexes declared in the models that an existing table does not have yet.
+
+    `create_all` skips tables that already exist, so indexes added to a model later would
+    otherwise only exist in new databases.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+def apply_migrations(engine: Engine) -> None:
+    """
+    Create the database objects that `create_all` leaves out. Safe to run repeatedly.
+
+    Indexes declared in the models are created on tables that predate them. On SQLite this
+    also installs the triggers that keep `inventory_summary` in sync with
+    `products` and the FTS5 index used by the product search. Whatever is installed for the
+    first time is backfilled, in the same transaction, from the products that already exist.
+
+    Args:
+        engine (Engine): An engine whose tables were already created with `create_all`.
+    """
+    with engine.begin() as connection:
+        create_missing_indexes(connection)
+    if not is_sqlite(str(engine.url)):
+        return
+    with engine.begin() as connection:
+        existing = set(connection.execute(text("SELECT name FROM sqlite_master")).scalars())
+        _install(connection, existing, INVENTORY_SUMMARY_TRIGGERS, rebuild_inventory_summary)
+        _install(connection, existing, PRODUCT_SEARCH_OBJECTS, rebuild_product_search)
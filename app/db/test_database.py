@@ -1,6 +1,11 @@
-from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.db import database
+from app.db.database import create_db_engine
+from app.db.async_database import create_async_db_engine
+from app.db.migrations import apply_migrations
+from app.db.unit_of_work import unit_of_work
 import os
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -8,10 +13,27 @@ DATABASE_URL = os.path.join(BASE_DIR, 'test.db')
 
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{DATABASE_URL}"
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
 TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_db_engine(SQLALCHEMY_DATABASE_URL)
+TestAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def create_test_database():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    # Mesmo esquema da aplicação, com os índices e triggers que faltarem em um test.db antigo
+    database.Base.metadata.create_all(bind=engine)
+    apply_migrations(engine)
+
+def session_dependency(db):
+    """Override for `get_db` that runs each request in a unit of work over the test's own session."""
+    def dependency():
+        with unit_of_work(db):
+            yield db
+    return dependency
+
+async def async_session_dependency():
+    """Override for `get_async_read_db` on the test database."""
+    async with TestAsyncSessionLocal() as db:
+        yield db
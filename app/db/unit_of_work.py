@@ -0,0 +1,76 @@
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+# Chave em Session.info com as funções a executar quando a transação terminar
+_CALLBACKS_KEY = "on_transaction_end"
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    """
+    Commit everything written through `db` once, when the block ends, or roll it back if the
+    block raised.
+
+    Repositories only flush their statements, so a service may call several of them and the
+    whole request is one transaction (one fsync on SQLite). The session checks out a
+    connection on its first statement, so a block that never queries costs no connection and
+    its commit is a no-op.
+
+    Args:
+        db (Session): The session shared by the repositories of the request.
+
+    Yields:
+        Session: The same session.
+    """
+    try:
+        yield db
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+
+@asynccontextmanager
+async def async_unit_of_work(db: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    asyncio counterpart of `unit_of_work`: commit `db` once when the block ends, or roll it
+    back if the block raised.
+
+    Args:
+        db (AsyncSession): The session shared by the async repositories of the request.
+
+    Yields:
+        AsyncSession: The same session.
+    """
+    try:
+        yield db
+        await db.commit()
+    except BaseException:
+        await db.rollback()
+        raise
+
+def on_transaction_end(db: Session, callback: Callable[[], None]) -> None:
+    """
+    Run `callback` when the current transaction of `db` is committed or rolled back, or now if
+    there is no transaction.
+
+    Used to drop cache entries only once other requests can see the new rows: an entry cached
+    by another request between the write and the commit would otherwise stay stale.
+
+    Args:
+        db (Session): The session whose transaction is watched.
+        callback (Callable[[], None]): Function called with no arguments.
+    """
+    if not db.in_transaction():
+        callback()
+        return
+    db.info.setdefault(_CALLBACKS_KEY, []).append(callback)
+
+@event.listens_for(Session, "after_transaction_end")
+def _run_transaction_end_callbacks(session: Session, transaction: SessionTransaction) -> None:
+    # Savepoints (begin_nested) não encerram a transação da requisição
+    if transaction.parent is None:
+        for callback in session.info.pop(_CALLBACKS_KEY, ()):
+            callback()
@@ -0,0 +1,165 @@
+import hmac
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+from app import config
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILE_ID_PATTERN = r"^[0-9a-f]{32}$"
+
+# Frames em que uma thread está apenas esperando (worker ocioso, loop no select): não entram no perfil
+_IDLE_MODULES = ("threading.py", "queue.py", "selectors.py")
+
+def route_of(scope: dict) -> str:
+    """Return the path template of the route matched for the scope, or the raw path before routing."""
+    route = scope.get("route")
+    return getattr(route, "path", scope.get("path", "?"))
+
+class RequestQueryLog:
+    """Parameterized statements executed by the request being served, with their counts."""
+    __slots__ = ("scope", "counts")
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.counts = Counter()
+
+current_query_log: ContextVar[Optional[RequestQueryLog]] = ContextVar("current_query_log", default=None)
+
+def record_statement(statement: str, duration: float) -> None:
+    """
+    Log the statement when slower than `SLOW_QUERY_MS` and count it for the N+1 check of the request.
+
+    Args:
+        statement (str): The SQL sent to the driver, with bound parameters as placeholders.
+        duration (float): Execution time in seconds.
+    """
+    query_log = current_query_log.get()
+    if duration * 1000 >= config.SLOW_QUERY_MS:
+        route = route_of(query_log.scope) if query_log is not None else "<no request>"
+        logger.warning("Slow query (%.1f ms) on %s: %s", duration * 1000, route, statement)
+    if query_log is not None:
+        query_log.counts[statement] += 1
+
+def report_repeated_statements(query_log: RequestQueryLog) -> None:
+    """Warn about statements the request ran more than `N_PLUS_ONE_THRESHOLD` times (N+1 pattern)."""
+    for statement, count in query_log.counts.items():
+        if count > config.N_PLUS_ONE_THRESHOLD:
+            logger.warning(
+                "Possible N+1 on %s %s: statement executed %d times: %s",
+                query_log.scope["method"], route_of(query_log.scope), count, statement,
+            )
+
+class SamplingProfiler:
+    """
+    Sample the Python stacks of every thread while one request is served.
+
+    A sampler is used instead of cProfile because cProfile only instruments the thread that
+    enables it, while synchronous routes and dependencies run in the threadpool. Idle threads
+    are skipped; busy ones (including concurrent requests on the same worker) are all recorded.
+    The result is in the collapsed-stack format read by speedscope and flamegraph.pl.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or frame.f_code.co_filename.endswith(_IDLE_MODULES):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        """Return the samples as `frame;frame;frame count` lines."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+def profile_path(profile_id: str) -> str:
+    """Return the file holding the profile artifact with the given ID."""
+    return os.path.join(config.PROFILE_DIR, f"{profile_id}.txt")
+
+def save_profile(profile_id: str, profiler: SamplingProfiler) -> None:
+    """Write the artifact and drop the oldest ones beyond `PROFILE_MAX_ARTIFACTS`."""
+    os.makedirs(config.PROFILE_DIR, exist_ok=True)
+    with open(profile_path(profile_id), "w", encoding="utf-8") as artifact:
+        artifact.write(profiler.collapsed())
+    artifacts = sorted(
+        (entry for entry in os.scandir(config.PROFILE_DIR) if entry.name.endswith(".txt")),
+        key=lambda entry: entry.stat().st_mtime,
+    )
+    for entry in artifacts[:-config.PROFILE_MAX_ARTIFACTS]:
+        os.remove(entry.path)
+
+def is_profile_authorized(token: str) -> bool:
+    """Return True when profiling is configured and the token matches `PROFILE_TOKEN`."""
+    return bool(config.PROFILE_TOKEN) and hmac.compare_digest(token, config.PROFILE_TOKEN)
+
+class DiagnosticsMiddleware:
+    """
+    ASGI middleware collecting the statements of each request for the slow-query log and the
+    N+1 check, and profiling the requests that carry an authorized `X-Profile` header.
+
+    The profile ID is returned in `X-Profile-Id`; the artifact is downloaded from
+    `GET /diagnostics/profiles/{profile_id}` once the response has been sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        query_log = RequestQueryLog(scope)
+        token = current_query_log.set(query_log)
+        profiler = None
+        profile_id = None
+        profile_token = dict(scope["headers"]).get(PROFILE_HEADER.lower().encode())
+        if profile_token is not None and is_profile_authorized(profile_token.decode("latin-1")):
+            profile_id = uuid.uuid4().hex
+            profiler = SamplingProfiler(config.PROFILE_SAMPLE_INTERVAL_MS / 1000)
+
+        async def send_wrapper(message):
+            if profile_id is not None and message["type"] == "http.response.start":
+                header = (PROFILE_ID_HEADER.lower().encode(), profile_id.encode())
+                message = {**message, "headers": [*message.get("headers", []), header]}
+            await send(message)
+
+        if profiler is not None:
+            profiler.start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_log.reset(token)
+            if profiler is not None:
+                profiler.stop()
+                save_profile(profile_id, profiler)
+                logger.info("Profiled %s %s in %.1f ms: %s", scope["method"], route_of(scope),
+                            (time.perf_counter() - start) * 1000, profile_id)
+            report_repeated_statements(query_log)
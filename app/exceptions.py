@@ -14,3 +14,16 @@ class NotFoundError(ApplicationError):
         super().__init__(f"{entity_name} with ID {entity_id} not found")
         self.entity_name = entity_name
         self.entity_id = entity_id
+
+class PoolSaturatedError(ApplicationError):
+    """Exception raised when a bounded worker pool has no free slot for a new task."""
+    def __init__(self, pool_name):
+        super().__init__(f"The {pool_name} pool is saturated, try again later")
+        self.pool_name = pool_name
+
+class PoolTimeoutError(ApplicationError):
+    """Exception raised when a task of a bounded worker pool does not finish in time."""
+    def __init__(self, pool_name, timeout):
+        super().__init__(f"The {pool_name} pool did not answer within {timeout}s, try again later")
+        self.pool_name = pool_name
+        self.timeout = timeout
@@ -1,11 +1,30 @@
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+from typing import List
+from fastapi import FastAPI, HTTPException, Request, Response
+from app import config
 from app.api.routes import router as api_router
-from app.db.database import Base, engine
+from app.db.group_commit import group_writer
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from app.services.questao_one import encontrar_vogal_especial
+from app.services.questao_one import encontrar_vogal_especial, encontrar_vogal_especial_stream
+from app.services.questao_one_batch import encontrar_vogais_especiais, vowel_pool
+from app.services.password_hasher import hash_pool
+from app.exceptions import PoolSaturatedError
+from app.metrics import MetricsMiddleware, render_metrics
+from app.diagnostics import DiagnosticsMiddleware
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # As migrations rodam uma vez fora dos workers: no master do gunicorn (gunicorn.conf.py),
+    # no `python server.py --reload` ou com `python migration.py`
+    yield
+    group_writer.shutdown()
+    hash_pool.shutdown()
+    vowel_pool.shutdown()
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -15,16 +34,56 @@ app.add_middleware(
     allow_headers=["*"],  
 )
 
+if config.DIAGNOSTICS_ENABLED:
+    app.add_middleware(DiagnosticsMiddleware)
+
+if config.METRICS_ENABLED:
+    # Adicionado por último para ficar mais externo e medir também o CORS
+    app.add_middleware(MetricsMiddleware)
+
 app.include_router(api_router)
 
 @app.get("/")
 def read_root():
     return {"message": "Hello World"}
 
+@app.get("/metrics", include_in_schema=False)
+def read_metrics():
+    """Expõe as métricas no formato texto do Prometheus."""
+    if not config.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 ### Endpoint para resolução da questão 1
 class InputString(BaseModel):
     input_string: str
 
+class InputBatch(BaseModel):
+    strings: List[str]
+
 @app.post("/teste/")
 def read_vowel(input_string: str):
-    return encontrar_vogal_especial(input_string)
\ No newline at end of file
+    return encontrar_vogal_especial(input_string)
+
+@app.post("/teste/stream")
+async def read_vowel_stream(request: Request):
+    """
+    Encontra a vogal especial de um texto enviado no corpo da requisição (UTF-8, pode ser
+    chunked), sem montar a string inteira em memória nem passá-la como query string.
+    """
+    return await encontrar_vogal_especial_stream(request.stream())
+
+@app.post("/teste/batch")
+async def read_vowel_batch(batch: InputBatch):
+    """
+    Encontra a vogal especial de cada string do lote, na mesma ordem. Lotes grandes são
+    divididos entre os processos do pool.
+    """
+    inicio = time.perf_counter_ns()
+    try:
+        vogais = await encontrar_vogais_especiais(batch.strings)
+    except PoolSaturatedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    tempo_total = (time.perf_counter_ns() - inicio) / 1_000_000
+    return {"vogais": vogais, "tempoTotal": f"{tempo_total:.3f}ms"}
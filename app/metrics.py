@@ -0,0 +1,117 @@
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess
+
+# Com vários workers (gunicorn), cada processo grava suas métricas neste diretório
+MULTIPROCESS_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route and status code.", ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route, including the streamed body.", ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served.", ["method"], multiprocess_mode="livesum"
+)
+DB_STATEMENTS = Counter("db_statements_total", "SQL statements executed.")
+DB_STATEMENT_LATENCY = Histogram(
+    "db_statement_duration_seconds", "Latency of each SQL statement.",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1),
+)
+DB_STATEMENTS_PER_REQUEST = Histogram(
+    "db_statements_per_request", "SQL statements executed while serving one request.", ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 500),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds", "Time spent in SQL statements while serving one request.", ["route"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+
+# Rótulo das requisições que não casaram com nenhuma rota, para não criar uma série por URL
+UNMATCHED_ROUTE = "<unmatched>"
+
+class RequestSqlStats:
+    """SQL statements and time accumulated by the request being served."""
+    __slots__ = ("statements", "duration")
+
+    def __init__(self):
+        self.statements = 0
+        self.duration = 0.0
+
+# Visível nas threads do threadpool: o Starlette copia o contexto ao rodar rotas síncronas
+current_sql_stats: ContextVar[Optional[RequestSqlStats]] = ContextVar("current_sql_stats", default=None)
+
+def record_statement(duration: float) -> None:
+    """Account one SQL statement, globally and in the stats of the current request."""
+    DB_STATEMENTS.inc()
+    DB_STATEMENT_LATENCY.observe(duration)
+    stats = current_sql_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.duration += duration
+
+def render_metrics() -> tuple:
+    """
+    Render every metric in the Prometheus text format.
+
+    In multi-process mode the files written by all the workers are aggregated.
+
+    Returns:
+        tuple: The body and its content type.
+    """
+    registry = REGISTRY
+    if os.environ.get(MULTIPROCESS_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, status code, in-flight count and SQL usage per route.
+
+    The route label is the path template (`/products/{product_id}`), read from the scope after
+    routing, so the number of series stays bounded. Written as plain ASGI rather than
+    `BaseHTTPMiddleware` to keep the per-request overhead to a few microseconds and to measure
+    streamed bodies until their last chunk.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        stats = RequestSqlStats()
+        token = current_sql_stats.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = HTTP_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_flight.dec()
+            current_sql_stats.reset(token)
+            route = scope.get("route")
+            route = getattr(route, "path", UNMATCHED_ROUTE)
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+            HTTP_LATENCY.labels(method, route).observe(elapsed)
+            DB_STATEMENTS_PER_REQUEST.labels(route).observe(stats.statements)
+            DB_TIME_PER_REQUEST.labels(route).observe(stats.duration)
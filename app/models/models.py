@@ -1,7 +1,6 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DECIMAL
+from sqlalchemy import Column, Integer, String, ForeignKey, DECIMAL, Index, text
 from sqlalchemy.orm import relationship
 from app.db.database import Base
-from werkzeug.security import check_password_hash
 
 
 class User(Base):
@@ -15,8 +14,10 @@ class User(Base):
         return f"<User(id={self.id}, email={self.email})>"
     
     def check_password(self, password: str) -> bool:
-        """Verify the provided password against the stored hash."""
-        return check_password_hash(self.password, password)
+        """Verify the provided password against the stored hash, in the password hashing pool."""
+        # Import local: app.services importa os repositórios, que importam este módulo
+        from app.services.password_hasher import verify_password
+        return verify_password(self.password, password)
     
 class Category(Base):
     __tablename__ = "categories"
@@ -47,4 +48,33 @@ class Product(Base):
 
     category = relationship("Category", back_populates="products")
     supplier = relationship("Supplier", back_populates="products")
-    
\ No newline at end of file
+
+    # Filtros e ordenações da listagem (ver ProductRepository.get_page): cada ordenação,
+    # sozinha e depois de cada filtro de igualdade
+    __table_args__ = (
+        Index("ix_products_sale_price", "sale_price"),
+        Index("ix_products_quantity", "quantity"),
+        Index("ix_products_category_id", "category_id"),
+        Index("ix_products_category_id_name", "category_id", "name"),
+        Index("ix_products_category_id_sale_price", "category_id", "sale_price"),
+        Index("ix_products_category_id_quantity", "category_id", "quantity"),
+        Index("ix_products_supplier_id", "supplier_id"),
+        Index("ix_products_supplier_id_name", "supplier_id", "name"),
+        Index("ix_products_supplier_id_sale_price", "supplier_id", "sale_price"),
+        Index("ix_products_supplier_id_quantity", "supplier_id", "quantity"),
+    )
+
+class InventorySummary(Base):
+    """
+    Stock aggregates per (category, supplier), kept up to date by triggers on `products`
+    (see `app/db/migrations.py`). Money is stored in cents so the running sums stay exact;
+    id 0 groups the products without a category or supplier.
+    """
+    __tablename__ = "inventory_summary"
+
+    category_id = Column(Integer, primary_key=True, autoincrement=False)
+    supplier_id = Column(Integer, primary_key=True, autoincrement=False)
+    product_count = Column(Integer, nullable=False, server_default=text("0"))
+    total_quantity = Column(Integer, nullable=False, server_default=text("0"))
+    stock_cost_cents = Column(Integer, nullable=False, server_default=text("0"))
+    stock_revenue_cents = Column(Integer, nullable=False, server_default=text("0"))
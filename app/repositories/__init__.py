@@ -1,3 +1,7 @@
 from .category_repository import CategoryRepository
 from .product_repository import ProductRepository
-from .supplier_repository import SupplierRepository
\ No newline at end of file
+from .supplier_repository import SupplierRepository
+from .async_category_repository import AsyncCategoryRepository
+from .async_product_repository import AsyncProductRepository
+from .async_supplier_repository import AsyncSupplierRepository
+from .async_user_repository import AsyncUserRepository
\ No newline at end of file
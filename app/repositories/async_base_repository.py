@@ -0,0 +1,60 @@
+from typing import Any, Callable, ClassVar, Generic, List, Optional, Type, TypeVar
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.cache import CachedEntity
+from app.repositories.base_repository import CrudRepository
+from app.schemas.sync_schema import SyncResult
+
+RepositoryT = TypeVar("RepositoryT")
+T = TypeVar("T")
+
+class AsyncRepository(Generic[RepositoryT]):
+    """
+    asyncio facade over a synchronous repository.
+
+    Each method runs the synchronous one with `AsyncSession.run_sync`: the statements, the
+    entity cache and the cache invalidation are the synchronous repository's own, and the
+    I/O is awaited on the asyncio driver. So the async repositories cannot drift from the
+    sync ones. Like them, they never commit; `get_async_db` commits once per request.
+    """
+
+    repository: ClassVar[type]
+
+    def __init__(self, db: AsyncSession):
+        """
+        Initializes the repository with an asyncio database session.
+
+        Args:
+            db (AsyncSession): The SQLAlchemy asyncio session for database interaction.
+        """
+        self.db = db
+
+    async def _run(self, method: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Await `method(repository, *args, **kwargs)` on the synchronous repository of the session."""
+        return await self.db.run_sync(lambda session: method(self.repository(session), *args, **kwargs))
+
+class AsyncCrudRepository(AsyncRepository[RepositoryT]):
+    """Async counterpart of `CrudRepository`; see it for the semantics of each method."""
+
+    repository: ClassVar[Type[CrudRepository]]
+
+    async def create(self, data: BaseModel) -> BaseModel:
+        return await self._run(CrudRepository.create, data)
+
+    async def get_by_id(self, entity_id: int) -> Optional[BaseModel]:
+        return await self._run(CrudRepository.get_by_id, entity_id)
+
+    async def get_entry(self, entity_id: int) -> Optional[CachedEntity]:
+        return await self._run(CrudRepository.get_entry, entity_id)
+
+    async def get_all(self) -> list:
+        return await self._run(self.repository.get_all)
+
+    async def update(self, entity_id: int, data: BaseModel) -> Optional[BaseModel]:
+        return await self._run(CrudRepository.update, entity_id, data)
+
+    async def delete(self, entity_id: int) -> bool:
+        return await self._run(CrudRepository.delete, entity_id)
+
+    async def sync(self, items: List[BaseModel], batch_size: int) -> SyncResult:
+        return await self._run(CrudRepository.sync, items, batch_size)
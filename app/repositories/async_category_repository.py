@@ -0,0 +1,22 @@
+from app.models.models import Category
+from app.repositories.async_base_repository import AsyncCrudRepository
+from app.repositories.category_repository import CategoryRepository
+
+class AsyncCategoryRepository(AsyncCrudRepository[CategoryRepository]):
+    """
+    Async counterpart of `CategoryRepository`.
+
+    Lazy loading is not available outside `run_sync`, so the products of a category are only
+    usable when they were loaded up front (`get_with_products`, `get_all(include_products=True)`).
+    """
+
+    repository = CategoryRepository
+
+    async def get_with_products(self, category_id: int) -> Category:
+        return await self._run(CategoryRepository.get_with_products, category_id)
+
+    async def get_all(self, include_products: bool = False) -> list:
+        return await self._run(CategoryRepository.get_all, include_products)
+
+    async def get_category_id_and_names(self) -> list:
+        return await self._run(CategoryRepository.get_category_id_and_names)
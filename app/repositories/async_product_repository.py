@@ -0,0 +1,25 @@
+from typing import Optional
+from app.repositories.async_base_repository import AsyncCrudRepository
+from app.repositories.product_repository import ProductRepository
+from app.schemas.product_schema import ProductBulkUpdate, ProductListFilters, ProductUpdateExpression
+
+class AsyncProductRepository(AsyncCrudRepository[ProductRepository]):
+    """Async counterpart of `ProductRepository`."""
+
+    repository = ProductRepository
+
+    async def get_page(self, limit: int, after: Optional[int] = None, filters: Optional[ProductListFilters] = None) -> list:
+        return await self._run(ProductRepository.get_page, limit, after, filters)
+
+    async def search(
+        self,
+        text: str,
+        limit: int,
+        offset: int = 0,
+        category_id: Optional[int] = None,
+        supplier_id: Optional[int] = None,
+    ) -> list:
+        return await self._run(ProductRepository.search, text, limit, offset, category_id, supplier_id)
+
+    async def bulk_update(self, selection: ProductBulkUpdate, expression: ProductUpdateExpression) -> int:
+        return await self._run(ProductRepository.bulk_update, selection, expression)
@@ -0,0 +1,7 @@
+from app.repositories.async_base_repository import AsyncCrudRepository
+from app.repositories.supplier_repository import SupplierRepository
+
+class AsyncSupplierRepository(AsyncCrudRepository[SupplierRepository]):
+    """Async counterpart of `SupplierRepository`."""
+
+    repository = SupplierRepository
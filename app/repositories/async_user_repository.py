@@ -0,0 +1,35 @@
+import asyncio
+from app.models.models import User
+from app.repositories.async_base_repository import AsyncRepository
+from app.repositories.user_repository import UserRepository
+from app.services.password_hasher import hash_password
+
+class AsyncUserRepository(AsyncRepository[UserRepository]):
+    """Async counterpart of `UserRepository`."""
+
+    repository = UserRepository
+
+    async def find_by_email(self, email: str) -> User:
+        return await self._run(UserRepository.find_by_email, email)
+
+    async def create_user(self, email: str, password: str) -> User:
+        """
+        Creates a new user, like `UserRepository.create_user`.
+
+        The password hash is awaited from a worker thread, so the event loop is not blocked
+        while the hashing pool works.
+
+        Raises:
+            ValueError: If a user with the provided email already exists.
+            PoolSaturatedError: If the password hashing pool is saturated.
+            PoolTimeoutError: If the password is not hashed in time.
+            SQLAlchemyError: If there are database operation failures during creation.
+        """
+        password_hash = await asyncio.to_thread(hash_password, password)
+        return await self.insert_user(email, password_hash)
+
+    async def insert_user(self, email: str, password_hash: str) -> User:
+        return await self._run(UserRepository.insert_user, email, password_hash)
+
+    async def update_password_hash(self, user: User, password_hash: str) -> None:
+        await self._run(UserRepository.update_password_hash, user, password_hash)
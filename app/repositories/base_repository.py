@@ -0,0 +1,306 @@
+from typing import ClassVar, Generic, Hashable, Iterable, List, Optional, Tuple, Type, TypeVar
+from pydantic import BaseModel
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import InstrumentedAttribute, Session
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.cache import CachedEntity, entity_cache
+from app.db.unit_of_work import on_transaction_end
+from app.schemas.sync_schema import SyncError, SyncResult
+
+ModelT = TypeVar("ModelT")
+CreateSchemaT = TypeVar("CreateSchemaT", bound=BaseModel)
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+# Dialetos com INSERT ... ON CONFLICT
+UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+# Chave em Connection.info com o último PRAGMA data_version lido pela conexão
+_DATA_VERSION_KEY = "entity_cache_data_version"
+
+class CrudRepository(Generic[ModelT, CreateSchemaT, SchemaT]):
+    """
+    Create, read, update and delete by ID for one model, with its entries in the entity cache.
+
+    Writes are single statements: `INSERT … RETURNING`, `UPDATE … RETURNING` and `DELETE`, with
+    a missing row detected from the returned row or the rowcount instead of a SELECT first.
+    They are not committed here: the request's unit of work (`app.db.unit_of_work`) commits
+    once, or rolls back, when the request ends. Subclasses set the class attributes below.
+    """
+
+    model: ClassVar[type]
+    schema: ClassVar[Type[BaseModel]]
+    # Prefixo das chaves no entity_cache e nome usado nas mensagens de erro
+    cache_namespace: ClassVar[str]
+    entity_name: ClassVar[str]
+    # Chaves estrangeiras de outras tabelas anuladas ao excluir, como fazia o relationship do ORM
+    nullify_on_delete: ClassVar[Tuple[InstrumentedAttribute, ...]] = ()
+    # Coluna única que identifica a linha na sincronização (upsert)
+    natural_key: ClassVar[str] = "name"
+
+    def __init__(self, db: Session):
+        """
+        Initializes the repository with a database session.
+
+        Args:
+            db (Session): The SQLAlchemy session for database interaction.
+        """
+        self.db = db
+
+    def create(self, data: CreateSchemaT) -> SchemaT:
+        """
+        Inserts a new row with one `INSERT … RETURNING` statement.
+
+        Args:
+            data (CreateSchemaT): Data used to create the row.
+
+        Returns:
+            SchemaT: The created entity, with its generated ID.
+
+        Raises:
+            SQLAlchemyError: If a database operation fails.
+        """
+        try:
+            instance = self.db.scalars(insert(self.model).values(**data.model_dump()).returning(self.model)).one()
+        except SQLAlchemyError as e:
+            raise SQLAlchemyError(f"Failed to create {self.entity_name} due to: {e}")
+        created = self.schema.model_validate(instance)
+        self.invalidate_cache((self.cache_namespace, created.id))
+        return created
+
+    def get_by_id(self, entity_id: int) -> Optional[SchemaT]:
+        """
+        Retrieves an entity by its ID, from the entity cache when possible.
+
+        Args:
+            entity_id (int): The ID of the entity to retrieve.
+
+        Returns:
+            Optional[SchemaT]: The entity, or None if not found.
+
+        Raises:
+            SQLAlchemyError: If a database operation fails.
+        """
+        entry = self.get_entry(entity_id)
+        return entry.value if entry else None
+
+    def get_entry(self, entity_id: int) -> Optional[CachedEntity]:
+        """
+        Retrieves the cached entry (schema, JSON body and ETag) of an entity.
+
+        On a cache miss the row is read from the database and cached until it is written
+        through a repository or its TTL expires. On SQLite the cache is first dropped if
+        another connection committed since (see `_drop_cache_if_changed_elsewhere`).
+
+        Args:
+            entity_id (int): The ID of the entity to retrieve.
+
+        Returns:
+            Optional[CachedEntity]: The cached entry, or None if the entity does not exist.
+
+        Raises:
+            SQLAlchemyError: If a database operation fails.
+        """
+        self._drop_cache_if_changed_elsewhere()
+        key = (self.cache_namespace, entity_id)
+        entry = entity_cache.get(key)
+        if entry is None:
+            try:
+                instance = self.db.get(self.model, entity_id)
+            except SQLAlchemyError as e:
+                raise SQLAlchemyError(f"Failed to retrieve {self.entity_name} due to: {e}")
+            if instance is None:
+                return None
+            entry = CachedEntity.from_model(self.schema.model_validate(instance))
+            entity_cache.set(key, entry)
+        return entry
+
+    def _drop_cache_if_changed_elsewhere(self) -> None:
+        """
+        Clear the entity cache when another connection committed to the SQLite database since
+        this connection last checked.
+
+        A write only invalidates the cache of the process that made it. `PRAGMA data_version`
+        changes for every commit made through any other connection, another worker's included,
+        so the other processes notice the write before serving the old body. Any change drops
+        the whole cache, since the pragma does not tell which rows changed.
+
+        Raises:
+            SQLAlchemyError: If the pragma cannot be read.
+        """
+        if entity_cache.maxsize <= 0 or self.db.get_bind().dialect.name != "sqlite":
+            return
+        connection = self.db.connection()
+        version = connection.exec_driver_sql("PRAGMA data_version").scalar()
+        if connection.info.get(_DATA_VERSION_KEY) != version:
+            connection.info[_DATA_VERSION_KEY] = version
+            entity_cache.clear()
+
+    def get_all(self) -> list:
+        """
+        Retrieves every row of the model.
+
+        Returns:
+            list: The ORM instances.
+
+        Raises:
+            SQLAlchemyError: If a database operation fails.
+        """
+        try:
+            return self.db.scalars(select(self.model)).all()
+        except SQLAlchemyError as e:
+            raise SQLAlchemyError(f"Failed to retrieve all {self.cache_namespace} due to: {e}")
+
+    def update(self, entity_id: int, data: CreateSchemaT) -> Optional[SchemaT]:
+        """
+        Replaces the fields of an entity with one `UPDATE … RETURNING` statement.
+
+        On databases without `UPDATE … RETURNING` (SQLite before 3.35) the row is read back
+        with a SELECT in the same transaction.
+
+        Args:
+            entity_id (int): The ID of the entity to update.
+            data (CreateSchemaT): New data for the entity.
+
+        Returns:
+            Optional[SchemaT]: The updated entity, or None if it does not exist.
+
+        Raises:
+            SQLAlchemyError: If a database operation fails.
+        """
+        stmt = update(self.model).where(self.model.id == entity_id).values(**data.model_dump())
+        try:
+            if self.db.get_bind().dialect.update_returning:
+                instance = self.db.scalars(
+                    stmt.returning(self.model), execution_options={"populate_existing": True}
+                ).one_or_none()
+            elif self.db.execute(stmt).rowcount:
+                instance = self.db.get(self.model, entity_id, populate_existing=True)
+            else:
+                instance = None
+        except SQLAlchemyError as e:
+            raise SQLAlchemyError(f"Failed to update {self.entity_name} due to: {e}")
+        if instance is None:
+            return None
+        self.invalidate_cache((self.cache_namespace, entity_id))
+        return self.schema.model_validate(instance)
+
+    def delete(self, entity_id: int) -> bool:
+        """
+        Deletes an entity by its ID with one `DELETE` statement, detecting a missing row from
+        the rowcount. References listed in `nullify_on_delete` are set to NULL in the same
+        transaction.
+
+        Args:
+            entity_id (int): The ID of the entity to delete.
+
+        Returns:
+            bool: True if the entity was deleted, False if it does not exist.
+
+        Raises:
+            SQLAlchemyError: If a database operation fails.
+        """
+        try:
+            # Sem RETURNING: nada da linha excluída é devolvido, e o rowcount já diz se ela existia
+            if not self.db.execute(delete(self.model).where(self.model.id == entity_id)).rowcount:
+                return False
+            referencing = []
+            for foreign_key in self.nullify_on_delete:
+                stmt = update(foreign_key.class_).where(foreign_key == entity_id).values({foreign_key: None})
+                if self.db.execute(stmt).rowcount:
+                    referencing.append(foreign_key.class_.__tablename__)
+        except SQLAlchemyError as e:
+            raise SQLAlchemyError(f"Failed to delete {self.entity_name} due to: {e}")
+        # As linhas que apontavam para a entidade mudaram: o cache delas também
+        self.invalidate_cache((self.cache_namespace, entity_id), namespaces=referencing)
+        return True
+
+    def sync(self, items: List[CreateSchemaT], batch_size: int) -> SyncResult:
+        """
+        Upsert many entities by `natural_key` with `INSERT … ON CONFLICT DO UPDATE` in batches.
+
+        Each batch costs two statements: a SELECT of the keys that already exist, then the
+        upsert, which only rewrites rows whose other columns changed and returns the keys it
+        wrote. Entities repeated in `items` are reduced to the last one. Each batch runs in a
+        savepoint; if it violates another unique constraint it is retried row by row inside
+        savepoints, so the valid rows are still written and the failing ones are reported.
+
+        Args:
+            items (List[CreateSchemaT]): The entities to create or update.
+            batch_size (int): Rows per statement.
+
+        Returns:
+            SyncResult: Created, updated, unchanged and failed counts with the errors.
+
+        Raises:
+            NotImplementedError: If the database has no `INSERT … ON CONFLICT`.
+            SQLAlchemyError: If a database operation fails.
+        """
+        rows = list({getattr(item, self.natural_key): item.model_dump() for item in items}.values())
+        result = SyncResult()
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            try:
+                with self.db.begin_nested():
+                    self._upsert(batch, result)
+                continue
+            except IntegrityError:
+                pass
+            for row in batch:
+                try:
+                    with self.db.begin_nested():
+                        self._upsert([row], result)
+                except IntegrityError as e:
+                    result.failed += 1
+                    result.errors.append(SyncError(key=str(row[self.natural_key]), error=str(e.orig)))
+        if result.updated:
+            self.invalidate_cache(namespaces=[self.cache_namespace])
+        return result
+
+    def invalidate_cache(self, *keys: Hashable, namespaces: Iterable[str] = ()) -> None:
+        """
+        Drop entries of the entity cache now, so later reads of this request see its writes, and
+        again when the transaction ends, in case another request cached the rows before the commit.
+
+        Args:
+            *keys (Hashable): Cache keys to drop, e.g. `("products", 1)`.
+            namespaces (Iterable[str]): Cache namespaces to drop entirely.
+        """
+        namespaces = tuple(namespaces)
+
+        def invalidate() -> None:
+            for key in keys:
+                entity_cache.invalidate(key)
+            for namespace in namespaces:
+                entity_cache.invalidate_namespace(namespace)
+
+        invalidate()
+        on_transaction_end(self.db, invalidate)
+
+    def _upsert(self, batch: List[dict], result: SyncResult) -> None:
+        """Upsert one batch and add its counts to `result`."""
+        dialect = self.db.get_bind().dialect.name
+        if dialect not in UPSERT_INSERTS:
+            raise NotImplementedError(f"INSERT ... ON CONFLICT is not supported on {dialect}")
+        table = self.model.__table__
+        key = table.c[self.natural_key]
+        keys = [row[self.natural_key] for row in batch]
+        existing = set(self.db.scalars(select(key).where(key.in_(keys))))
+
+        stmt = UPSERT_INSERTS[dialect](table).values(batch)
+        columns = [name for name in batch[0] if name != self.natural_key]
+        if columns:
+            # Só reescreve (e devolve) as linhas em que algum valor mudou
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[key],
+                set_={name: stmt.excluded[name] for name in columns},
+                where=or_(*(table.c[name].is_distinct_from(stmt.excluded[name]) for name in columns)),
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[key])
+        written = self.db.scalars(stmt.returning(key)).all()
+
+        created = sum(1 for value in written if value not in existing)
+        result.created += created
+        result.updated += len(written) - created
+        result.unchanged += len(batch) - len(written)
@@ -0,0 +1,91 @@
+from typing import List
+from sqlalchemy import Integer, column, func, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from app.db.database import is_sqlite
+from app.db.migrations import INVENTORY_GROUP_BY
+from app.models.models import Category, InventorySummary, Supplier
+
+SUMMARY_COLUMNS = ("category_id", "supplier_id", "product_count", "total_quantity", "stock_cost_cents", "stock_revenue_cents")
+
+# Dimensão do relatório -> (coluna do resumo, modelo com o nome)
+DIMENSIONS = {
+    "category": ("category_id", Category),
+    "supplier": ("supplier_id", Supplier),
+}
+
+class InventoryReportRepository:
+    def __init__(self, db: Session):
+        """
+        Initializes the InventoryReportRepository with a database session.
+
+        Args:
+            db (Session): The SQLAlchemy session for database interaction.
+        """
+        self.db = db
+        # O resumo só é mantido por triggers no SQLite; nos outros bancos agrega direto de products
+        self.summary_maintained = is_sqlite(str(db.get_bind().url))
+
+    def _source(self, live: bool):
+        """The per-(category, supplier) aggregates: the summary table, or a live GROUP BY over products."""
+        if live or not self.summary_maintained:
+            return text(INVENTORY_GROUP_BY).columns(*(column(name, Integer) for name in SUMMARY_COLUMNS)).subquery("inventory")
+        return InventorySummary.__table__
+
+    @staticmethod
+    def _sums(source) -> list:
+        return [
+            func.coalesce(func.sum(source.c.product_count), 0).label("product_count"),
+            func.coalesce(func.sum(source.c.total_quantity), 0).label("total_quantity"),
+            func.coalesce(func.sum(source.c.stock_cost_cents), 0).label("stock_cost_cents"),
+            func.coalesce(func.sum(source.c.stock_revenue_cents), 0).label("stock_revenue_cents"),
+        ]
+
+    def get_grouped(self, dimension: str, live: bool = False) -> List:
+        """
+        Retrieves the stock aggregates grouped by category or supplier.
+
+        Args:
+            dimension (str): "category" or "supplier".
+            live (bool): Aggregate straight from `products` instead of the summary table.
+
+        Returns:
+            list: Rows with `id`, `name`, `product_count`, `total_quantity`, `stock_cost_cents`
+            and `stock_revenue_cents`, ordered by id. Id 0 groups products without one.
+
+        Raises:
+            SQLAlchemyError: If a database operation fails.
+        """
+        key_name, model = DIMENSIONS[dimension]
+        source = self._source(live)
+        key = source.c[key_name]
+        query = (
+            select(key.label("id"), model.name, *self._sums(source))
+            .select_from(source)
+            .outerjoin(model, model.id == key)
+            .group_by(key, model.name)
+            .order_by(key)
+        )
+        try:
+            return self.db.execute(query).all()
+        except SQLAlchemyError as e:
+            raise SQLAlchemyError(f"Failed to retrieve inventory report due to: {e}")
+
+    def get_totals(self, live: bool = False):
+        """
+        Retrieves the stock aggregates of the whole inventory.
+
+        Args:
+            live (bool): Aggregate straight from `products` instead of the summary table.
+
+        Returns:
+            Row: `product_count`, `total_quantity`, `stock_cost_cents` and `stock_revenue_cents`.
+
+        Raises:
+            SQLAlchemyError: If a database operation fails.
+        """
+        source = self._source(live)
+        try:
+            return self.db.execute(select(*self._sums(source)).select_from(source)).one()
+        except SQLAlchemyError as e:
+            raise SQLAlchemyError(f"Failed to retrieve inventory report due to: {e}")
@@ -1,112 +1,319 @@
-from sqlalchemy.orm import Session
+import operator
+import re
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import Float, Integer, cast, column, func, insert, literal, literal_column, select, table, tuple_, type_coerce, update
+from sqlalchemy.engine import Row
 from sqlalchemy.exc import SQLAlchemyError
-from app.models.models import Product
-from app.schemas.product_schema import ProductCreate
+from sqlalchemy.sql.expression import UnaryExpression
+from sqlalchemy.sql.operators import custom_op
+from app.db.database import is_sqlite
+from app.models.models import Category, Product, Supplier
+from app.exceptions import NotFoundError
+from app.repositories.base_repository import CrudRepository
+from app.schemas.product_schema import (
+    Product as ProductSchema, ProductBulkUpdate, ProductCreate, ProductListFilters, ProductUpdateExpression,
+)
 
-class ProductRepository:
-    def __init__(self, db: Session):
+# Ordenações aceitas pela listagem; cada uma tem um índice em Product, sozinha e depois de
+# category_id e de supplier_id, então a página sai do índice já na ordem pedida
+SORT_COLUMNS = {
+    "id": Product.id,
+    "name": Product.name,
+    "sale_price": Product.sale_price,
+    "quantity": Product.quantity,
+}
+
+# Colunas do schema Product, com os preços já como float: as linhas da listagem vão direto para o JSON
+LISTING_COLUMNS = (
+    Product.name,
+    type_coerce(Product.purchase_price, Float).label("purchase_price"),
+    Product.quantity,
+    type_coerce(Product.sale_price, Float).label("sale_price"),
+    Product.id,
+    Product.category_id,
+    Product.supplier_id,
+)
+
+def _unindexed(column):
+    """`+column`: on SQLite a term over it cannot drive an index, it is checked row by row."""
+    return UnaryExpression(column, operator=custom_op("+"), type_=column.type)
+
+# Colunas e operadores aceitos pela atualização em massa
+UPDATABLE_COLUMNS = {
+    "purchase_price": Product.purchase_price,
+    "sale_price": Product.sale_price,
+    "quantity": Product.quantity,
+}
+UPDATE_OPERATORS = {"*": operator.mul, "/": operator.truediv, "+": operator.add, "-": operator.sub}
+
+# Índice FTS5 criado por app/db/migrations.py; "rank" é a coluna oculta com o bm25
+products_fts = table("products_fts", column("rowid"), column("rank"))
+
+def fts_prefix_query(text: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query where every word is a prefix term (`"cad"* "azu"*`).
+
+    Words are quoted, so FTS5 operators typed by the user are searched as plain text.
+
+    Returns:
+        Optional[str]: The MATCH expression, or None if the text has no words.
+    """
+    terms = re.findall(r"\w+", text)
+    return " ".join(f'"{term}"*' for term in terms) if terms else None
+
+class ProductRepository(CrudRepository[Product, ProductCreate, ProductSchema]):
+    model = Product
+    schema = ProductSchema
+    cache_namespace = "products"
+    entity_name = "product"
+
+    def _listing_query(self, filters: Optional[ProductListFilters], after: Optional[int]):
         """
-        Initializes the ProductRepository with a database session.
+        Build the filtered, sorted listing query, starting after the product `after`.
 
-        Args:
-            db (Session): The SQLAlchemy session for database interaction.
+        The cursor is a product ID. For sorts other than ID the page continues after the
+        `(sort value, id)` pair of that product, so the pagination stays keyset-based.
+
+        Raises:
+            NotFoundError: If the cursor product no longer exists.
         """
-        self.db = db
+        filters = filters or ProductListFilters()
+        query = self.db.query(Product)
+        if filters.category_id is not None:
+            query = query.filter(Product.category_id == filters.category_id)
+        if filters.supplier_id is not None:
+            query = query.filter(Product.supplier_id == filters.supplier_id)
+
+        descending = filters.sort.startswith("-")
+        sort_column = SORT_COLUMNS[filters.sort.lstrip("-")]
+
+        # A página é lida em um índice na ordem da ordenação e para no LIMIT. Uma faixa sobre
+        # outra coluna não pode escolher o índice dela, o que exigiria ordenar tudo o que ela
+        # seleciona (TEMP B-TREE); ela é conferida linha a linha enquanto o índice é percorrido
+        sqlite = is_sqlite(str(self.db.get_bind().url))
+        ranges = (
+            (Product.sale_price, operator.ge, filters.min_price),
+            (Product.sale_price, operator.le, filters.max_price),
+            (Product.quantity, operator.ge, filters.min_quantity),
+            (Product.quantity, operator.le, filters.max_quantity),
+        )
+        for range_column, compare, bound in ranges:
+            if bound is not None:
+                if sqlite and range_column is not sort_column:
+                    range_column = _unindexed(range_column)
+                query = query.filter(compare(range_column, bound))
+        if after is not None:
+            if sort_column is Product.id:
+                key, cursor = Product.id, after
+            else:
+                value = self.db.query(sort_column).filter(Product.id == after).first()
+                if value is None:
+                    raise NotFoundError("Product", after)
+                key, cursor = tuple_(sort_column, Product.id), tuple_(value[0], after)
+            query = query.filter(key < cursor if descending else key > cursor)
+
+        order = [sort_column, Product.id] if sort_column is not Product.id else [Product.id]
+        return query.order_by(*(column.desc() if descending else column for column in order))
 
-    def create(self, product_data: ProductCreate) -> Product:
+    def get_page(self, limit: int, after: Optional[int] = None, filters: Optional[ProductListFilters] = None) -> list:
         """
-        Create a new product using the provided product data.
+        Retrieve a filtered, sorted page of products using keyset pagination.
+
+        Only the `LISTING_COLUMNS` are selected, so no ORM objects are built.
 
         Args:
-            product_data (ProductCreate): Data used to create a new product.
+            limit (int): Maximum number of products to return.
+            after (Optional[int]): ID of the last product of the previous page.
+            filters (Optional[ProductListFilters]): Filters and sort order; by default every
+                product, ordered by ID.
 
         Returns:
-            Product: The newly created product instance.
+            list: Up to `limit` rows with the `LISTING_COLUMNS`.
 
         Raises:
-            SQLAlchemyError: If any database operation fails.
+            NotFoundError: If the cursor product no longer exists.
         """
+        query = self._listing_query(filters, after)
         try:
-            product = Product(**product_data.dict())
-            self.db.add(product)
-            self.db.commit()
-            self.db.refresh(product)
-            return product
+            return query.with_entities(*LISTING_COLUMNS).limit(limit).all()
         except SQLAlchemyError as e:
-            raise SQLAlchemyError(f"Failed to create product due to: {e}")
+            raise SQLAlchemyError(f"Failed to retrieve products page due to: {e}")
 
-    def get_by_id(self, product_id: int) -> Product:
+    def search(
+        self,
+        text: str,
+        limit: int,
+        offset: int = 0,
+        category_id: Optional[int] = None,
+        supplier_id: Optional[int] = None,
+    ) -> list:
         """
-        Retrieve a product by its ID.
+        Search products by the words of their name, best matches first.
+
+        On SQLite the words are matched as prefixes against the `products_fts` index and the
+        results are ranked by bm25; other backends fall back to a `LIKE` per word, ordered by ID.
 
         Args:
-            product_id (int): The ID of the product to retrieve.
+            text (str): The words to search for; every word must match.
+            limit (int): Maximum number of products to return.
+            offset (int): Number of matches to skip.
+            category_id (Optional[int]): Only products of this category.
+            supplier_id (Optional[int]): Only products of this supplier.
 
         Returns:
-            Product: The retrieved product or None if not found.
+            list: Up to `limit` matching products.
         """
+        match = fts_prefix_query(text)
+        if match is None:
+            return []
+        query = select(Product)
+        if is_sqlite(str(self.db.get_bind().url)):
+            query = (
+                query.join(products_fts, products_fts.c.rowid == Product.id)
+                .where(literal_column("products_fts").op("MATCH")(match))
+                .order_by(products_fts.c.rank, Product.id)
+            )
+        else:
+            for term in re.findall(r"\w+", text):
+                query = query.where(Product.name.ilike(f"%{term}%"))
+            query = query.order_by(Product.id)
+        if category_id is not None:
+            query = query.where(Product.category_id == category_id)
+        if supplier_id is not None:
+            query = query.where(Product.supplier_id == supplier_id)
         try:
-            return self.db.query(Product).filter(Product.id == product_id).first()
+            return self.db.scalars(query.limit(limit).offset(offset)).all()
         except SQLAlchemyError as e:
-            raise SQLAlchemyError(f"Failed to retrieve product due to: {e}")
+            raise SQLAlchemyError(f"Failed to search products due to: {e}")
 
-    def get_all(self) -> list:
+    def iter_all(
+        self,
+        after: Optional[int] = None,
+        batch_size: int = 1000,
+        filters: Optional[ProductListFilters] = None,
+    ) -> Iterator[Row]:
         """
-        Retrieve all products.
+        Iterate over the filtered, sorted products without loading them all in memory.
+
+        Rows with the `LISTING_COLUMNS` are fetched from a server-side cursor `batch_size` at a time.
+
+        Args:
+            after (Optional[int]): ID of the product after which the iteration starts.
+            batch_size (int): Number of rows fetched per round trip.
+            filters (Optional[ProductListFilters]): Filters and sort order; by default every
+                product, ordered by ID.
 
         Returns:
-            list: A list of all products.
+            Iterator[Row]: Each matching product, in the requested order.
+
+        Raises:
+            NotFoundError: If the cursor product no longer exists.
         """
-        try:
-            return self.db.query(Product).all()
-        except SQLAlchemyError as e:
-            raise SQLAlchemyError(f"Failed to retrieve all products due to: {e}")
+        return iter(self._listing_query(filters, after).with_entities(*LISTING_COLUMNS).yield_per(batch_size))
 
-    def update(self, product_id: int, product_data: ProductCreate) -> Product:
+    def iter_export_rows(self, batch_size: int = 5000) -> Iterator[Row]:
         """
-        Update an existing product with the provided data.
+        Iterate over every product joined with its category and supplier names.
+
+        A single Core SELECT is executed over a server-side cursor, so memory stays constant
+        regardless of the number of products. The query runs when this method is called, so
+        its errors are raised here and not on the first row.
 
         Args:
-            product_id (int): The ID of the product to update.
-            product_data (ProductCreate): New data for the product.
+            batch_size (int): Number of rows fetched per round trip.
 
         Returns:
-            Product: The updated product or None if the product does not exist.
+            Iterator[Row]: One row per product, with the columns in export order.
 
         Raises:
-            SQLAlchemyError: If any database operation fails.
+            SQLAlchemyError: If the query fails.
         """
-        try:
-            product = self.db.query(Product).filter(Product.id == product_id).first()
-            if product:
-                for var, value in product_data.dict().items():
-                    setattr(product, var, value)
-                self.db.commit()
-                self.db.refresh(product)
-                return product
-            return None
-        except SQLAlchemyError as e:
-            raise SQLAlchemyError(f"Failed to update product due to: {e}")
+        stmt = (
+            select(
+                Product.id,
+                Product.name,
+                Product.purchase_price,
+                Product.quantity,
+                Product.sale_price,
+                Product.category_id,
+                Category.name.label("category_name"),
+                Product.supplier_id,
+                Supplier.name.label("supplier_name"),
+                Supplier.email.label("supplier_email"),
+            )
+            .outerjoin(Category, Product.category_id == Category.id)
+            .outerjoin(Supplier, Product.supplier_id == Supplier.id)
+            .order_by(Product.id)
+            .execution_options(stream_results=True, yield_per=batch_size)
+        )
+        return iter(self.db.execute(stmt))
 
-    def delete(self, product_id: int) -> bool:
+    def bulk_update(self, selection: ProductBulkUpdate, expression: ProductUpdateExpression) -> int:
         """
-        Delete a product by its ID.
+        Apply an expression to every selected product with a single `UPDATE` statement.
+
+        Prices are rounded to cents and quantities to integers. The inventory summary is kept in
+        sync by its triggers, and the cached products are dropped.
 
         Args:
-            product_id (int): The ID of the product to delete.
+            selection (ProductBulkUpdate): The category, supplier and/or ID filters.
+            expression (ProductUpdateExpression): The value assigned to the target column.
 
         Returns:
-            bool: True if the product was successfully deleted, False otherwise.
+            int: The number of products updated.
 
         Raises:
-            SQLAlchemyError: If any database operation fails.
+            SQLAlchemyError: If the update fails.
         """
+        target = UPDATABLE_COLUMNS[expression.target]
+        value = literal(expression.operand)
+        if expression.source is not None:
+            value = UPDATE_OPERATORS[expression.operator](UPDATABLE_COLUMNS[expression.source], value)
+        value = cast(func.round(value), Integer) if expression.target == "quantity" else func.round(value, 2)
+
+        conditions = []
+        if selection.category_id is not None:
+            conditions.append(Product.category_id == selection.category_id)
+        if selection.supplier_id is not None:
+            conditions.append(Product.supplier_id == selection.supplier_id)
+        if selection.ids is not None:
+            conditions.append(Product.id.in_(selection.ids))
+
+        stmt = update(Product).where(*conditions).values({target: value}).execution_options(synchronize_session=False)
         try:
-            product = self.db.query(Product).filter(Product.id == product_id).first()
-            if product:
-                self.db.delete(product)
-                self.db.commit()
-                return True
-            return False
+            updated = self.db.execute(stmt).rowcount
         except SQLAlchemyError as e:
-            raise SQLAlchemyError(f"Failed to delete product due to: {e}")
+            raise SQLAlchemyError(f"Failed to update products due to: {e}")
+        self.invalidate_cache(namespaces=[self.cache_namespace])
+        return updated
+
+    def bulk_insert(self, rows: List[dict]) -> List[Tuple[int, str]]:
+        """
+        Insert many products with a single executemany statement.
+
+        The batch runs in a savepoint. If the database rejects it, the batch is retried row by
+        row, each row in its own savepoint, so that valid rows are still stored and the failing
+        ones are reported. Nothing is committed here; the caller commits each batch (see
+        `ProductImportService`).
+
+        Args:
+            rows (List[dict]): Validated product data, one dict per row.
+
+        Returns:
+            List[Tuple[int, str]]: The index within `rows` and the error of each row that failed.
+        """
+        try:
+            with self.db.begin_nested():
+                self.db.execute(insert(Product), rows)
+            return []
+        except SQLAlchemyError:
+            pass
+
+        failures = []
+        for index, row in enumerate(rows):
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(insert(Product), [row])
+            except SQLAlchemyError as e:
+                failures.append((index, str(getattr(e, "orig", None) or e)))
+        return failures
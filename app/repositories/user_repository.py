@@ -1,7 +1,28 @@
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from app.models.models import User
-from werkzeug.security import check_password_hash, generate_password_hash
+from app.repositories.base_repository import UPSERT_INSERTS
+from app.services.password_hasher import hash_password
+
+def insert_user_statement(db, email: str, password_hash: str):
+    """
+    Builds the `INSERT … ON CONFLICT (email) DO NOTHING RETURNING` of a new user.
+
+    Args:
+        db (Session | AsyncSession): The session the statement will run on, read for its dialect.
+        email (str): The email of the new user.
+        password_hash (str): The already hashed password.
+
+    Returns:
+        Insert: The statement, returning the user or no row if the email is taken.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect in UPSERT_INSERTS:
+        stmt = UPSERT_INSERTS[dialect](User).on_conflict_do_nothing(index_elements=[User.email])
+    else:
+        stmt = insert(User)
+    return stmt.values(email=email, password=password_hash).returning(User)
 
 class UserRepository:
     def __init__(self, db: Session):
@@ -41,27 +62,58 @@ class UserRepository:
         
         Raises:
             ValueError: If a user with the provided email already exists.
+            PoolSaturatedError: If the password hashing pool is saturated.
+            PoolTimeoutError: If the password is not hashed in time.
             SQLAlchemyError: If there are database operation failures during creation.
 
         Description:
-        - Checks for an existing user with the provided email. If found, raises a ValueError to prevent duplicates.
-        - Hashes the provided password to ensure passwords are not stored as plain text.
-        - Creates a new user instance, adds it to the database session, and commits the transaction.
-        - If any database errors occur during commit, a rollback is executed to undo the transaction,
-        and an SQLAlchemyError is raised.
-        - The new user's state is refreshed from the database to ensure it contains all updated fields like auto-generated IDs.
+        - Hashes the provided password in the password hashing pool to ensure passwords are not stored as plain text.
+        - Inserts the user with a single `INSERT … ON CONFLICT (email) DO NOTHING RETURNING` statement, so two
+        concurrent sign-ups with the same email cannot both pass a separate existence check.
+        - If no row is returned the email is already taken and a ValueError is raised.
+        - The insert is committed by the request's unit of work; database errors are raised as SQLAlchemyError.
+        """
+        return self.insert_user(email, hash_password(password))
+
+    def insert_user(self, email: str, password_hash: str) -> User:
+        """
+        Inserts a user whose password is already hashed (see `create_user`).
+
+        Args:
+            email (str): The email address for the new user, must be unique.
+            password_hash (str): The hashed password.
+
+        Returns:
+            User: The newly created user object.
+
+        Raises:
+            ValueError: If a user with the provided email already exists.
+            SQLAlchemyError: If there are database operation failures during creation.
         """
-        existing_user = self.find_by_email(email)
-        if existing_user:
-            raise ValueError("A user with the given email already exists.")
-        
-        hashed_password = generate_password_hash(password)
-        new_user = User(email=email, password=hashed_password)
         try:
-            self.db.add(new_user)
-            self.db.commit()
-            self.db.refresh(new_user)
-            return new_user
+            new_user = self.db.scalars(insert_user_statement(self.db, email, password_hash)).one_or_none()
+        except IntegrityError:
+            # Dialetos sem ON CONFLICT: a restrição única é quem detecta o e-mail repetido
+            raise ValueError("A user with the given email already exists.")
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise SQLAlchemyError(f"Failed to create user due to: {e}")
+        if new_user is None:
+            raise ValueError("A user with the given email already exists.")
+        return new_user
+
+    def update_password_hash(self, user: User, password_hash: str) -> None:
+        """
+        Replaces the stored password hash of a user.
+
+        Args:
+            user (User): The user to update.
+            password_hash (str): The new, already hashed, password.
+
+        Raises:
+            SQLAlchemyError: If there are database operation failures during the update.
+        """
+        try:
+            user.password = password_hash
+            self.db.flush()
+        except SQLAlchemyError as e:
+            raise SQLAlchemyError(f"Failed to update user password due to: {e}")
@@ -11,7 +11,9 @@ class CategoryCreate(CategoryBase):
 
 class Category(CategoryBase):
     id: int
-    products: Optional[List[Product]] = None  # Inclui produtos de maneira opcional.
 
     class Config:
         from_attributes = True
+
+class CategoryWithProducts(Category):
+    products: Optional[List[Product]] = None  # Só preenchido com ?include=products
@@ -1,5 +1,6 @@
 # app/schemas/product_schema.py
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Literal, Optional
 
 class ProductBase(BaseModel):
     name: str
@@ -18,3 +19,48 @@ class Product(ProductBase):
 
     class Config:
         from_attributes = True
+
+class ProductListFilters(BaseModel):
+    category_id: Optional[int] = None
+    supplier_id: Optional[int] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_quantity: Optional[int] = None
+    max_quantity: Optional[int] = None
+    # Coluna de ordenação; prefixo "-" para decrescente. O ID desempata.
+    sort: str = "id"
+
+class ProductImportError(BaseModel):
+    row: int
+    errors: List[str]
+
+class ProductImportResult(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[ProductImportError]
+
+class ProductBulkUpdate(BaseModel):
+    # Filtros combinados com AND; sem nenhum deles é preciso pedir all_products explicitamente
+    category_id: Optional[int] = None
+    supplier_id: Optional[int] = None
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=10000)
+    all_products: bool = False
+    # "sale_price = purchase_price * 1.35", "+5%" (sobre sale_price), "quantity = 0"
+    expression: str
+
+    @model_validator(mode="after")
+    def require_filter(self):
+        has_filter = self.category_id is not None or self.supplier_id is not None or self.ids is not None
+        if has_filter == self.all_products:
+            raise ValueError("use either category_id, supplier_id and/or ids, or all_products=true")
+        return self
+
+class ProductUpdateExpression(BaseModel):
+    # target = operand, ou target = source <operator> operand
+    target: Literal["purchase_price", "sale_price", "quantity"]
+    source: Optional[Literal["purchase_price", "sale_price", "quantity"]] = None
+    operator: Optional[Literal["*", "/", "+", "-"]] = None
+    operand: float
+
+class ProductBulkUpdateResult(BaseModel):
+    updated: int
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class InventoryValuation(BaseModel):
+    product_count: int
+    total_quantity: int
+    stock_cost: float
+    potential_revenue: float
+    margin: float
+    margin_percent: Optional[float] = None
+
+class InventoryGroup(InventoryValuation):
+    id: int
+    name: Optional[str] = None
@@ -0,0 +1,14 @@
+# app/schemas/sync_schema.py
+from pydantic import BaseModel
+from typing import List
+
+class SyncError(BaseModel):
+    key: str
+    error: str
+
+class SyncResult(BaseModel):
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    errors: List[SyncError] = []
@@ -1,10 +1,16 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 import jwt
-from datetime import datetime, timedelta
+import logging
+from datetime import datetime, timedelta, timezone
 
+from app import config
 from app.repositories.user_repository import UserRepository
 from app.schemas.user_schema import LoginData, UserCreate
+from app.exceptions import PoolSaturatedError, PoolTimeoutError
+from app.services.password_hasher import hash_password, needs_rehash, verify_password
+
+logger = logging.getLogger(__name__)
 
 class AuthService:
     def __init__(self, db: Session):
@@ -14,48 +20,73 @@ class AuthService:
         Args:
             db (Session): The SQLAlchemy session for database interaction.
         """
+        self.db = db
         self.user_repository = UserRepository(db)
 
     def authenticate(self, email: str, password: str) -> str:
         """
         Authenticate a user and return a JWT token if valid.
 
+        The password is verified in the password hashing pool. When the stored hash was made
+        with other parameters than the configured ones, it is upgraded after a successful login.
+
         Args:
-            login_data (LoginData): The data used for authenticating the user.
+            email (str): The email of the user.
+            password (str): The plain-text password.
 
         Returns:
             str: A JWT token if authentication is successful.
 
         Raises:
             SQLAlchemyError: If a database error occurs during the authentication process.
+            PoolSaturatedError: If the password hashing pool is saturated.
+            PoolTimeoutError: If the password check does not finish in time.
             ValueError: If authentication fails (incorrect email or password).
         """
         try:
             user = self.user_repository.find_by_email(email)
-            if user is None or not user.check_password(password):
+            if user is None or not verify_password(user.password, password):
                 raise ValueError("Incorrect email or password")
-            return self.create_token(user.id)
+            if needs_rehash(user.password):
+                self._upgrade_password_hash(user, password)
+            return self.create_token(user.id, user.email)
         except SQLAlchemyError as e:
             raise SQLAlchemyError(f"Authentication process failed due to database error: {e}")
 
-    def create_token(self, user_id: int) -> str:
+    def _upgrade_password_hash(self, user, password: str) -> None:
+        """
+        Rehash the password with the current parameters; a failure never blocks the login.
+
+        The update runs in a savepoint, so a failed flush is rolled back and the request's
+        session stays usable.
         """
-        Create a JWT token for a given user ID.
+        try:
+            password_hash = hash_password(password)
+            with self.db.begin_nested():
+                self.user_repository.update_password_hash(user, password_hash)
+        except (PoolSaturatedError, PoolTimeoutError, SQLAlchemyError) as e:
+            logger.warning(f"Could not upgrade password hash for user {user.id}: {e}")
+
+    def create_token(self, user_id: int, email: str) -> str:
+        """
+        Create a JWT token for a given user.
 
         Args:
             user_id (int): The user's ID for whom the token is created.
+            email (str): The user's email, sent in the `email` claim.
 
         Returns:
             str: A JWT token.
         """
+        now = datetime.now(timezone.utc)
         payload = {
-            'exp': datetime.utcnow() + timedelta(days=1),
-            'iat': datetime.utcnow(),
-            'sub': user_id
+            'exp': now + timedelta(seconds=config.JWT_EXPIRATION_SECONDS),
+            'iat': now,
+            'sub': str(user_id),
+            'email': email,
         }
-        SECRET_KEY = "9ba263503b01ce2ef81f6641f504b45333aa0662183d0184db79d9e92ccef620" 
-        return jwt.encode(payload, SECRET_KEY, algorithm='HS256')
-    
+        return jwt.encode(payload, config.JWT_SECRET_KEY, algorithm=config.JWT_ALGORITHM)
+
 
     def create_user(self, user_data: UserCreate):
         return self.user_repository.create_user(user_data.email, user_data.password)
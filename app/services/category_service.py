@@ -1,7 +1,11 @@
+from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
+from app import config
 from app.schemas.category_schema import CategoryCreate, Category
+from app.schemas.sync_schema import SyncResult
 from app.repositories.category_repository import CategoryRepository
+from app.cache import CachedEntity
 
 class CategoryService:
     def __init__(self, db: Session):
@@ -49,10 +53,49 @@ class CategoryService:
         except SQLAlchemyError as e:
             raise Exception(f"Failed to retrieve category due to database error: {e}")
 
-    def get_categories(self) -> list:
+    def get_category_entry(self, category_id: int) -> Optional[CachedEntity]:
+        """
+        Retrieves the cached entry (schema, JSON body and ETag) of a category.
+
+        Args:
+            category_id (int): The ID of the category to retrieve.
+
+        Returns:
+            Optional[CachedEntity]: The cached entry, or None if not found.
+
+        Raises:
+            SQLAlchemyError: If a database error occurs during the retrieval process.
+        """
+        try:
+            return self.repository.get_entry(category_id)
+        except SQLAlchemyError as e:
+            raise Exception(f"Failed to retrieve category due to database error: {e}")
+
+    def get_category_with_products(self, category_id: int) -> Category:
+        """
+        Retrieves a category by its ID together with its products.
+
+        Args:
+            category_id (int): The ID of the category to retrieve.
+
+        Returns:
+            Category: The retrieved category, or None if not found.
+
+        Raises:
+            SQLAlchemyError: If a database error occurs during the retrieval process.
+        """
+        try:
+            return self.repository.get_with_products(category_id)
+        except SQLAlchemyError as e:
+            raise Exception(f"Failed to retrieve category due to database error: {e}")
+
+    def get_categories(self, include_products: bool = False) -> list:
         """
         Retrieves all categories from the database.
 
+        Args:
+            include_products (bool): Whether to eager-load the products of each category.
+
         Returns:
             list of Category: A list of categories.
 
@@ -60,7 +103,7 @@ class CategoryService:
             SQLAlchemyError: If a database error occurs during the retrieval process.
         """
         try:
-            return self.repository.get_all()
+            return self.repository.get_all(include_products)
         except SQLAlchemyError as e:
             raise Exception(f"Failed to retrieve all categories due to database error: {e}")
 
@@ -83,6 +126,21 @@ class CategoryService:
         except SQLAlchemyError as e:
             raise Exception(f"Failed to update category due to database error: {e}")
 
+    def sync_categories(self, categories: List[CategoryCreate]) -> SyncResult:
+        """
+        Creates the categories whose names do not exist yet, in batches of `SYNC_BATCH_SIZE`.
+
+        Args:
+            categories (List[CategoryCreate]): The full list of categories to make sure exist.
+
+        Returns:
+            SyncResult: Created and unchanged counts (a category has nothing else to update).
+
+        Raises:
+            SQLAlchemyError: If a database error occurs.
+        """
+        return self.repository.sync(categories, config.SYNC_BATCH_SIZE)
+
     def delete_category(self, category_id: int) -> bool:
         """
         Deletes a category by its ID.
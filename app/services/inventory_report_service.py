@@ -0,0 +1,56 @@
+from typing import List
+from sqlalchemy.orm import Session
+from app.repositories.inventory_report_repository import InventoryReportRepository
+from app.schemas.report_schema import InventoryGroup, InventoryValuation
+
+def _valuation(row) -> dict:
+    """Convert the cent sums of a report row into the valuation fields."""
+    margin_cents = row.stock_revenue_cents - row.stock_cost_cents
+    return {
+        "product_count": row.product_count,
+        "total_quantity": row.total_quantity,
+        "stock_cost": row.stock_cost_cents / 100,
+        "potential_revenue": row.stock_revenue_cents / 100,
+        "margin": margin_cents / 100,
+        "margin_percent": round(margin_cents * 100 / row.stock_revenue_cents, 2) if row.stock_revenue_cents else None,
+    }
+
+class InventoryReportService:
+    def __init__(self, db: Session):
+        """
+        Initializes the InventoryReportService with a database session and attaches an InventoryReportRepository.
+
+        Args:
+            db (Session): The SQLAlchemy session for database interaction.
+        """
+        self.repository = InventoryReportRepository(db)
+
+    def get_by(self, dimension: str) -> List[InventoryGroup]:
+        """
+        Stock value, potential revenue and margin per category or supplier.
+
+        Args:
+            dimension (str): "category" or "supplier".
+
+        Returns:
+            List[InventoryGroup]: One entry per category or supplier that has products.
+
+        Raises:
+            SQLAlchemyError: If a database error occurs.
+        """
+        return [
+            InventoryGroup(id=row.id, name=row.name, **_valuation(row))
+            for row in self.repository.get_grouped(dimension)
+        ]
+
+    def get_totals(self) -> InventoryValuation:
+        """
+        Stock value, potential revenue and margin of the whole inventory.
+
+        Returns:
+            InventoryValuation: The totals.
+
+        Raises:
+            SQLAlchemyError: If a database error occurs.
+        """
+        return InventoryValuation(**_valuation(self.repository.get_totals()))
@@ -0,0 +1,76 @@
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+from app import config
+from app.services.process_pool import BoundedProcessPool
+
+# Pool dedicado: o KDF não disputa CPU com as threads que atendem as outras rotas
+hash_pool = BoundedProcessPool(
+    "password hashing",
+    max_workers=config.PASSWORD_HASH_WORKERS,
+    max_queue=config.PASSWORD_HASH_QUEUE_DEPTH,
+)
+
+def hash_password(password: str) -> str:
+    """
+    Hash a password with the configured method in the hashing pool.
+
+    Args:
+        password (str): The plain-text password.
+
+    Returns:
+        str: The Werkzeug-formatted hash (`method$salt$hash`).
+
+    Raises:
+        PoolSaturatedError: If the hashing pool is saturated.
+        PoolTimeoutError: If the hash is not ready within `PASSWORD_HASH_TIMEOUT_SECONDS`.
+    """
+    return hash_pool.run(
+        generate_password_hash,
+        password,
+        config.PASSWORD_HASH_METHOD,
+        config.PASSWORD_HASH_SALT_LENGTH,
+        timeout=config.PASSWORD_HASH_TIMEOUT_SECONDS,
+    )
+
+def verify_password(password_hash: str, password: str) -> bool:
+    """
+    Check a password against a stored hash in the hashing pool.
+
+    Args:
+        password_hash (str): The stored hash.
+        password (str): The plain-text password to check.
+
+    Returns:
+        bool: True if the password matches.
+
+    Raises:
+        PoolSaturatedError: If the hashing pool is saturated.
+        PoolTimeoutError: If the check is not done within `PASSWORD_HASH_TIMEOUT_SECONDS`.
+    """
+    return hash_pool.run(check_password_hash, password_hash, password, timeout=config.PASSWORD_HASH_TIMEOUT_SECONDS)
+
+def _method_prefix(method: str) -> str:
+    # Prefixo que o Werkzeug grava para o método, com os parâmetros padrão completados
+    # ("scrypt" -> "scrypt:32768:8:1"), sem calcular um hash para descobri-lo
+    name, *args = method.split(":")
+    if name == "scrypt" and not args:
+        return "scrypt:32768:8:1"
+    if name == "pbkdf2" and len(args) < 2:
+        hash_name = args[0] if args else "sha256"
+        return f"pbkdf2:{hash_name}:{DEFAULT_PBKDF2_ITERATIONS}"
+    return method
+
+def needs_rehash(password_hash: str) -> bool:
+    """
+    Tell whether a stored hash was produced with parameters other than the configured ones,
+    the salt length included.
+
+    Args:
+        password_hash (str): The stored hash.
+
+    Returns:
+        bool: True if the hash should be upgraded on the next successful login.
+    """
+    method, _, rest = password_hash.partition("$")
+    salt = rest.partition("$")[0]
+    return method != _method_prefix(config.PASSWORD_HASH_METHOD) or len(salt) != config.PASSWORD_HASH_SALT_LENGTH
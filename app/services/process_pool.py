@@ -0,0 +1,89 @@
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Optional
+
+from app.exceptions import PoolSaturatedError, PoolTimeoutError
+
+class BoundedProcessPool:
+    """
+    A lazily started `ProcessPoolExecutor` that rejects work beyond a fixed queue depth.
+
+    At most `max_workers + max_queue` tasks are accepted at a time; further submissions raise
+    `PoolSaturatedError` immediately instead of queueing without bound. With `max_workers=0`
+    tasks run inline in the calling thread.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        """
+        Args:
+            name (str): Name used in error messages.
+            max_workers (int): Number of worker processes; 0 runs tasks inline.
+            max_queue (int): Number of tasks allowed to wait for a free worker.
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self._slots = threading.BoundedSemaphore(max(max_workers, 1) + max_queue)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: os workers não herdam as threads e conexões do processo web
+                self._executor = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """
+        Submit `fn(*args)` to the pool.
+
+        Raises:
+            PoolSaturatedError: If every slot is taken.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise PoolSaturatedError(self.name)
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn: Callable, *args, timeout: Optional[float] = None):
+        """
+        Run `fn(*args)` in the pool and wait for its result.
+
+        Args:
+            fn (Callable): A picklable, module-level function.
+            timeout (Optional[float]): Seconds to wait for the result.
+
+        Returns:
+            The return value of `fn`.
+
+        Raises:
+            PoolSaturatedError: If every slot is taken.
+            PoolTimeoutError: If the result is not ready within `timeout`.
+        """
+        if self.max_workers <= 0:
+            if not self._slots.acquire(blocking=False):
+                raise PoolSaturatedError(self.name)
+            try:
+                return fn(*args)
+            finally:
+                self._slots.release()
+        future = self.submit(fn, *args)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            # Antes do Python 3.11 não é o TimeoutError embutido; uma tarefa ainda na fila é descartada
+            future.cancel()
+            raise PoolTimeoutError(self.name, timeout) from None
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, if they were started."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,68 @@
+import csv
+import io
+from decimal import Decimal
+from typing import Iterable, Iterator
+
+import orjson
+
+# Linhas acumuladas antes de enviar um pedaço da resposta
+ROWS_PER_CHUNK = 1000
+
+# Colunas na ordem devolvida por ProductRepository.iter_export_rows
+EXPORT_COLUMNS = (
+    "id", "name", "purchase_price", "quantity", "sale_price",
+    "category_id", "category_name", "supplier_id", "supplier_name", "supplier_email",
+)
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError
+
+def iter_ndjson(rows: Iterable) -> Iterator[bytes]:
+    """
+    Encode export rows as NDJSON, one object per line, in chunks of `ROWS_PER_CHUNK` rows.
+
+    Args:
+        rows (Iterable): Rows from `ProductRepository.iter_export_rows`.
+
+    Yields:
+        bytes: A chunk of NDJSON lines.
+    """
+    chunk = []
+    for row in rows:
+        chunk.append(orjson.dumps(row._asdict(), default=_json_default))
+        if len(chunk) >= ROWS_PER_CHUNK:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+def iter_csv(rows: Iterable) -> Iterator[str]:
+    """
+    Encode export rows as CSV with a header line, in chunks of `ROWS_PER_CHUNK` rows.
+
+    Args:
+        rows (Iterable): Rows from `ProductRepository.iter_export_rows`.
+
+    Yields:
+        str: A chunk of CSV lines.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= ROWS_PER_CHUNK:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue()
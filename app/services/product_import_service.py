@@ -0,0 +1,268 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Iterator, List, Tuple
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.db.unit_of_work import unit_of_work
+from app.repositories.product_repository import ProductRepository
+from app.schemas.product_schema import ProductCreate, ProductImportError, ProductImportResult
+
+# Content types aceitos pelo endpoint de importação
+JSON_TYPES = ("application/json",)
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+CSV_TYPES = ("text/csv",)
+
+# Bytes do corpo acumulados no event loop antes de cada passagem pelo threadpool
+READ_SIZE = 64 * 1024
+
+class UnsupportedImportFormat(ValueError):
+    """Raised when the request content type is not one of the supported import formats."""
+
+class ProductImportService:
+    def __init__(self, db: Session, batch_size: int):
+        """
+        Initializes the import service for one upload.
+
+        Args:
+            db (Session): The SQLAlchemy session used to insert the batches.
+            batch_size (int): Number of rows inserted per statement and transaction.
+        """
+        self.db = db
+        self.repository = ProductRepository(db)
+        self.batch_size = batch_size
+        self.inserted = 0
+        self.errors: List[ProductImportError] = []
+        self._batch: List[Tuple[int, dict]] = []
+        self._row_number = 0
+
+    async def import_stream(self, content_type: str, chunks: AsyncIterator[bytes]) -> ProductImportResult:
+        """
+        Validates rows as they are parsed from the body and inserts them in batches.
+
+        Only the body is read on the event loop: every `READ_SIZE` bytes are decoded, parsed,
+        validated and, once a batch is full, inserted in the threadpool. Invalid rows are
+        collected in the error report; the remaining rows are still imported.
+
+        Args:
+            content_type (str): The request media type, selecting the JSON, NDJSON or CSV parser.
+            chunks (AsyncIterator[bytes]): The raw request body.
+
+        Returns:
+            ProductImportResult: Inserted and failed counts with a per-row error report.
+
+        Raises:
+            UnsupportedImportFormat: If the content type is not supported.
+            ValueError: If the body is not well-formed for its format.
+        """
+        parser = RowParser(content_type)
+        pending: List[bytes] = []
+        pending_size = 0
+        async for chunk in chunks:
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if pending_size >= READ_SIZE:
+                await run_in_threadpool(self._consume, parser, b"".join(pending))
+                pending, pending_size = [], 0
+        await run_in_threadpool(self._consume, parser, b"".join(pending), True)
+
+        self.errors.sort(key=lambda error: error.row)
+        return ProductImportResult(inserted=self.inserted, failed=len(self.errors), errors=self.errors)
+
+    def _consume(self, parser: "RowParser", data: bytes, final: bool = False) -> None:
+        for data_row in parser.feed(data, final):
+            self._row_number += 1
+            try:
+                if isinstance(data_row, ValueError):
+                    raise data_row
+                if not isinstance(data_row, dict):
+                    raise ValueError("row must be an object")
+                self._batch.append((self._row_number, ProductCreate.model_validate(data_row).model_dump()))
+            except ValidationError as e:
+                self.errors.append(ProductImportError(row=self._row_number, errors=_format_validation_errors(e)))
+            except ValueError as e:
+                self.errors.append(ProductImportError(row=self._row_number, errors=[str(e)]))
+            if len(self._batch) >= self.batch_size:
+                self._insert_batch()
+        if final and self._batch:
+            self._insert_batch()
+
+    def _insert_batch(self) -> None:
+        # Cada lote é uma unidade de trabalho: as linhas já importadas ficam gravadas se o
+        # corpo, que não tem tamanho limitado, falhar mais adiante
+        batch, self._batch = self._batch, []
+        with unit_of_work(self.db):
+            failures = self.repository.bulk_insert([data for _, data in batch])
+        for index, error in failures:
+            self.errors.append(ProductImportError(row=batch[index][0], errors=[error]))
+        self.inserted += len(batch) - len(failures)
+
+def _format_validation_errors(error: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors()]
+
+class RowParser:
+    """
+    Incremental parser of an import body: bytes go in as they arrive, decoded rows come out.
+
+    A row that cannot be decoded is returned as a `ValueError` so it can be reported without
+    aborting the rest of the import.
+    """
+
+    def __init__(self, content_type: str):
+        """
+        Args:
+            content_type (str): The request media type.
+
+        Raises:
+            UnsupportedImportFormat: If the content type is not supported.
+        """
+        media_type = content_type.split(";")[0].strip().lower()
+        if media_type in JSON_TYPES:
+            self._parser = _JsonArrayParser()
+        elif media_type in NDJSON_TYPES:
+            self._parser = _NdjsonParser()
+        elif media_type in CSV_TYPES:
+            self._parser = _CsvParser()
+        else:
+            raise UnsupportedImportFormat(f"Unsupported content type '{media_type}', use JSON, NDJSON or CSV")
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+
+    def feed(self, data: bytes, final: bool = False) -> Iterator[object]:
+        """
+        Parse the next bytes of the body.
+
+        Args:
+            data (bytes): The next part of the body.
+            final (bool): `data` is the end of the body.
+
+        Yields:
+            object: Each row completed by `data`.
+
+        Raises:
+            ValueError: If the body is not well-formed for its format.
+        """
+        text = self._decoder.decode(data, final)
+        if text:
+            yield from self._parser.feed(text)
+        if final:
+            yield from self._parser.close()
+
+class _LineSplitter:
+    def __init__(self):
+        self.pending = ""
+
+    def feed(self, text: str) -> List[str]:
+        lines = (self.pending + text).split("\n")
+        self.pending = lines.pop()
+        return [line + "\n" for line in lines]
+
+    def close(self) -> List[str]:
+        lines = [self.pending] if self.pending else []
+        self.pending = ""
+        return lines
+
+class _NdjsonParser:
+    def __init__(self):
+        self.lines = _LineSplitter()
+
+    def feed(self, text: str) -> Iterator[object]:
+        return self._rows(self.lines.feed(text))
+
+    def close(self) -> Iterator[object]:
+        return self._rows(self.lines.close())
+
+    def _rows(self, lines: List[str]) -> Iterator[object]:
+        for line in lines:
+            if line.strip():
+                try:
+                    yield orjson.loads(line)
+                except orjson.JSONDecodeError as e:
+                    yield ValueError(f"invalid JSON: {e}")
+
+class _CsvParser:
+    def __init__(self):
+        self.lines = _LineSplitter()
+        self.header = None
+        self.record_lines: List[str] = []
+        self.quotes = 0
+
+    def feed(self, text: str) -> Iterator[object]:
+        return self._rows(self.lines.feed(text))
+
+    def close(self) -> Iterator[object]:
+        yield from self._rows(self.lines.close())
+        if self.record_lines:
+            raise ValueError("CSV body ends inside a quoted field")
+
+    def _rows(self, lines: List[str]) -> Iterator[object]:
+        for line in lines:
+            self.record_lines.append(line)
+            self.quotes += line.count('"')
+            if self.quotes % 2:
+                continue  # campo entre aspas com quebra de linha: o registro continua na próxima linha
+            values = next(csv.reader(self.record_lines), [])
+            self.record_lines, self.quotes = [], 0
+            if not any(value.strip() for value in values):
+                continue
+            if self.header is None:
+                self.header = [name.strip() for name in values]
+            elif len(values) != len(self.header):
+                yield ValueError(f"expected {len(self.header)} columns, got {len(values)}")
+            else:
+                yield dict(zip(self.header, values))
+
+class _JsonArrayParser:
+    def __init__(self):
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.position = 0
+        # O que pode vir em seguida: "[" no início, um elemento ou "]" logo depois dele, um
+        # elemento depois de cada vírgula e, depois de cada elemento, uma vírgula ou "]"
+        self.expected = "start"
+
+    def feed(self, text: str) -> Iterator[object]:
+        self.buffer = self.buffer[self.position:] + text
+        self.position = 0
+        while True:
+            position = _skip_whitespace(self.buffer, self.position)
+            self.position = position
+            if position >= len(self.buffer):
+                break
+            char = self.buffer[position]
+            if self.expected == "start":
+                if char != "[":
+                    raise ValueError("JSON body must be an array of products")
+                self.expected, self.position = "first", position + 1
+            elif self.expected == "end":
+                raise ValueError("unexpected data after the JSON array")
+            elif char == "]" and self.expected in ("first", "separator"):
+                self.expected, self.position = "end", position + 1
+            elif self.expected == "separator":
+                if char != ",":
+                    raise ValueError(f"expected ',' or ']' between the array elements, got {char!r}")
+                self.expected, self.position = "element", position + 1
+            elif char in ",]":
+                raise ValueError(f"expected an array element, got {char!r}")
+            else:
+                try:
+                    row, end = self.decoder.raw_decode(self.buffer, position)
+                except json.JSONDecodeError:
+                    break  # elemento ainda incompleto, espera o próximo pedaço do corpo
+                if end >= len(self.buffer):
+                    break  # um número no fim do pedaço pode continuar no próximo
+                self.expected, self.position = "separator", end
+                yield row
+
+    def close(self) -> Iterator[object]:
+        if self.expected != "end":
+            raise ValueError("JSON body is not a complete array")
+        return iter(())
+
+def _skip_whitespace(buffer: str, position: int) -> int:
+    while position < len(buffer) and buffer[position] in " \t\r\n":
+        position += 1
+    return position
@@ -1,17 +1,32 @@
+from typing import Callable, Iterator, Optional, TypeVar
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from app.schemas.product_schema import ProductCreate, Product
+from app.cache import CachedEntity
+from app.db.group_commit import GroupCommitWriter
+from app.schemas.product_schema import ProductBulkUpdate, ProductCreate, Product, ProductListFilters
 from app.repositories.product_repository import ProductRepository
+from app.services.product_update_expression import parse_update_expression
+
+T = TypeVar("T")
 
 class ProductService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, writer: Optional[GroupCommitWriter] = None):
         """
         Initializes the ProductService with a database session and attaches a ProductRepository for database operations.
 
         Args:
             db (Session): The SQLAlchemy session for database interaction.
+            writer (Optional[GroupCommitWriter]): When given, creates, updates and deletes are
+                committed together with those of concurrent requests instead of in `db`.
         """
         self.repository = ProductRepository(db)
+        self.writer = writer
+
+    def _write(self, operation: Callable[[ProductRepository], T]) -> T:
+        """Run a repository write in the request's session, or in the group-commit writer."""
+        if self.writer is None:
+            return operation(self.repository)
+        return self.writer.run(lambda db: operation(ProductRepository(db)))
 
     def create_product(self, product_data: ProductCreate) -> Product:
         """
@@ -27,7 +42,7 @@ class ProductService:
             SQLAlchemyError: If a database error occurs.
         """
         try:
-            return self.repository.create(product_data)
+            return self._write(lambda repository: repository.create(product_data))
         except SQLAlchemyError as e:
             raise Exception(f"Failed to create product due to database error: {e}")
 
@@ -49,6 +64,24 @@ class ProductService:
         except SQLAlchemyError as e:
             raise Exception(f"Failed to retrieve product due to database error: {e}")
 
+    def get_product_entry(self, product_id: int) -> Optional[CachedEntity]:
+        """
+        Retrieves the cached entry (schema, JSON body and ETag) of a product.
+
+        Args:
+            product_id (int): The ID of the product to retrieve.
+
+        Returns:
+            Optional[CachedEntity]: The cached entry, or None if not found.
+
+        Raises:
+            SQLAlchemyError: If a database error occurs.
+        """
+        try:
+            return self.repository.get_entry(product_id)
+        except SQLAlchemyError as e:
+            raise Exception(f"Failed to retrieve product due to database error: {e}")
+
     def get_products(self) -> list:
         """
         Retrieves all products from the database.
@@ -64,6 +97,86 @@ class ProductService:
         except SQLAlchemyError as e:
             raise Exception(f"Failed to retrieve all products due to database error: {e}")
 
+    def get_products_page(
+        self,
+        limit: int,
+        after: Optional[int] = None,
+        filters: Optional[ProductListFilters] = None,
+    ) -> list:
+        """
+        Retrieves a filtered, sorted page of products using the product ID as cursor.
+
+        Args:
+            limit (int): Maximum number of products to return.
+            after (Optional[int]): ID of the last product of the previous page.
+            filters (Optional[ProductListFilters]): Filters and sort order.
+
+        Returns:
+            list of Row: Up to `limit` products with the listing columns, ordered by ID unless another sort is given.
+
+        Raises:
+            NotFoundError: If the cursor product no longer exists.
+            SQLAlchemyError: If a database error occurs.
+        """
+        try:
+            return self.repository.get_page(limit, after, filters)
+        except SQLAlchemyError as e:
+            raise Exception(f"Failed to retrieve products page due to database error: {e}")
+
+    def search_products(
+        self,
+        text: str,
+        limit: int,
+        offset: int = 0,
+        category_id: Optional[int] = None,
+        supplier_id: Optional[int] = None,
+    ) -> list:
+        """
+        Searches products by the words of their name, best matches first.
+
+        Args:
+            text (str): The words to search for, matched as prefixes.
+            limit (int): Maximum number of products to return.
+            offset (int): Number of matches to skip.
+            category_id (Optional[int]): Only products of this category.
+            supplier_id (Optional[int]): Only products of this supplier.
+
+        Returns:
+            list of Product: Up to `limit` matching products.
+
+        Raises:
+            SQLAlchemyError: If a database error occurs.
+        """
+        return self.repository.search(text, limit, offset, category_id, supplier_id)
+
+    def iter_products(self, after: Optional[int] = None, filters: Optional[ProductListFilters] = None) -> Iterator:
+        """
+        Iterates over the filtered, sorted products, streaming them from the database.
+
+        Args:
+            after (Optional[int]): ID after which the iteration starts.
+            filters (Optional[ProductListFilters]): Filters and sort order.
+
+        Returns:
+            Iterator[Row]: Each matching product with the listing columns, ordered by ID unless another sort is given.
+
+        Raises:
+            NotFoundError: If the cursor product no longer exists.
+        """
+        return self.repository.iter_all(after, filters=filters)
+
+    def iter_export_rows(self) -> Iterator:
+        """
+        Iterates over all products joined with their category and supplier, in a single query.
+
+        Returns:
+            Iterator[Row]: One row per product.
+
+        Raises:
+            SQLAlchemyError: If the query fails.
+        """
+        return self.repository.iter_export_rows()
+
     def update_product(self, product_id: int, product_data: ProductCreate) -> Product:
         """
         Updates an existing product with new data.
@@ -79,10 +192,26 @@ class ProductService:
             SQLAlchemyError: If a database error occurs.
         """
         try:
-            return self.repository.update(product_id, product_data)
+            return self._write(lambda repository: repository.update(product_id, product_data))
         except SQLAlchemyError as e:
             raise Exception(f"Failed to update product due to database error: {e}")
 
+    def bulk_update_products(self, selection: ProductBulkUpdate) -> int:
+        """
+        Applies the update expression to every product matching the filters in one statement.
+
+        Args:
+            selection (ProductBulkUpdate): The filters and the update expression.
+
+        Returns:
+            int: The number of products updated.
+
+        Raises:
+            InvalidUpdateExpression: If the expression is not supported.
+            SQLAlchemyError: If a database error occurs.
+        """
+        return self.repository.bulk_update(selection, parse_update_expression(selection.expression))
+
     def delete_product(self, product_id: int) -> bool:
         """
         Deletes a product by its ID.
@@ -97,6 +226,6 @@ class ProductService:
             SQLAlchemyError: If a database error occurs.
         """
         try:
-            return self.repository.delete(product_id)
+            return self._write(lambda repository: repository.delete(product_id))
         except SQLAlchemyError as e:
             raise Exception(f"Failed to delete product due to database error: {e}")
@@ -0,0 +1,49 @@
+import re
+
+from app.schemas.product_schema import ProductUpdateExpression
+
+_COLUMN = r"(purchase_price|sale_price|quantity)"
+_NUMBER = r"(\d+(?:\.\d+)?)"
+
+# "sale_price = purchase_price * 1.35", "quantity = 0"
+_ASSIGNMENT = re.compile(rf"^\s*{_COLUMN}\s*=\s*(?:{_COLUMN}\s*([*/+-])\s*)?{_NUMBER}\s*$")
+# "+5%", "-10%" (sobre sale_price) ou "purchase_price +3%"
+_PERCENT = re.compile(rf"^\s*(?:{_COLUMN}\s*)?([+-])\s*{_NUMBER}\s*%\s*$")
+
+class InvalidUpdateExpression(ValueError):
+    """Raised when a bulk update expression does not match the supported grammar."""
+
+def parse_update_expression(text: str) -> ProductUpdateExpression:
+    """
+    Parse a bulk update expression.
+
+    Supported forms are `<column> = <number>`, `<column> = <column> <op> <number>` with `op`
+    one of `* / + -`, and `[<column>] ±<number>%`, which adjusts the column (`sale_price` by
+    default) by a percentage. Columns are `purchase_price`, `sale_price` and `quantity`.
+
+    Args:
+        text (str): The expression, e.g. "sale_price = purchase_price * 1.35" or "+5%".
+
+    Returns:
+        ProductUpdateExpression: The parsed expression.
+
+    Raises:
+        InvalidUpdateExpression: If the expression is not supported.
+    """
+    match = _PERCENT.match(text)
+    if match:
+        column, sign, percent = match.groups()
+        factor = 1 + float(percent) / 100 * (1 if sign == "+" else -1)
+        column = column or "sale_price"
+        return ProductUpdateExpression(target=column, source=column, operator="*", operand=factor)
+
+    match = _ASSIGNMENT.match(text)
+    if not match:
+        raise InvalidUpdateExpression(
+            f"Invalid update expression {text!r}: use '<column> = <number>', "
+            "'<column> = <column> <* / + -> <number>' or '±<number>%'"
+        )
+    target, source, operator, operand = match.groups()
+    if operator == "/" and float(operand) == 0:
+        raise InvalidUpdateExpression("Division by zero in update expression")
+    return ProductUpdateExpression(target=target, source=source, operator=operator, operand=float(operand))
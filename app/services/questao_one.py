@@ -1,43 +1,110 @@
+import codecs
+import re
 import time
+from typing import AsyncIterator, Optional
 
-def encontrar_vogal_especial(entrada: str):
-    inicio = time.time()
-    
-    vogais = 'aeiouAEIOU'
-    contagem_vogais = {}
-    encontrou_consoante_apos_vogal = False
-    primeira_consoante_apos_vogal = None
-    
-    for char in entrada:
-        if char in vogais:
-            if char in contagem_vogais:
-                contagem_vogais[char] += 1
+VOGAIS = 'aeiouAEIOU'
+
+# Primeira vogal seguida de um caractere que não é vogal
+_VOGAL_SEGUIDA_DE_CONSOANTE = re.compile('[aeiouAEIOU][^aeiouAEIOU]', re.DOTALL)
+
+class VogalEspecialScanner:
+    """
+    Finds the special vowel in a single streaming pass over the input.
+
+    The special vowel is the first vowel, at or after the first character that follows a
+    vowel and is not a vowel, that occurs exactly once in the whole input. While the input
+    is fed chunk by chunk, the scanner keeps per-vowel counts, the position where each vowel
+    was first seen and the position of that first consonant-after-vowel; nothing else is
+    retained, so memory is constant whatever the input size. Counting and searching inside a
+    chunk are done by `str.count`/`str.find`/`re.search`, which run in C.
+    """
+
+    def __init__(self):
+        self.contagem = dict.fromkeys(VOGAIS, 0)
+        self.primeira_posicao = {}
+        self.primeira_consoante_apos_vogal: Optional[int] = None
+        self.tamanho = 0
+        self._ultimo_era_vogal = False
+
+    def feed(self, trecho: str) -> None:
+        """Process the next chunk of the input."""
+        if not trecho:
+            return
+        if self.primeira_consoante_apos_vogal is None:
+            if self._ultimo_era_vogal and trecho[0] not in VOGAIS:
+                self.primeira_consoante_apos_vogal = self.tamanho
             else:
-                contagem_vogais[char] = 1
-    
-    for i in range(len(entrada) - 1):
-        char = entrada[i]
-        if char in vogais:
-            if entrada[i + 1] not in vogais:
-                if not encontrou_consoante_apos_vogal:
-                    primeira_consoante_apos_vogal = i + 1
-                    encontrou_consoante_apos_vogal = True
-                    break
-    
-    vogal_alvo = None
-    if primeira_consoante_apos_vogal is not None:
-        for i in range(primeira_consoante_apos_vogal, len(entrada)):
-            char = entrada[i]
-            if char in vogais and contagem_vogais[char] == 1:
-                vogal_alvo = char
-                break
-    
-    fim = time.time()
-    tempo_total_ms = int((fim - inicio) * 1000)
-    
+                encontrado = _VOGAL_SEGUIDA_DE_CONSOANTE.search(trecho)
+                if encontrado:
+                    self.primeira_consoante_apos_vogal = self.tamanho + encontrado.start() + 1
+        for vogal in VOGAIS:
+            ocorrencias = trecho.count(vogal)
+            if ocorrencias:
+                if not self.contagem[vogal]:
+                    self.primeira_posicao[vogal] = self.tamanho + trecho.find(vogal)
+                self.contagem[vogal] += ocorrencias
+        self._ultimo_era_vogal = trecho[-1] in VOGAIS
+        self.tamanho += len(trecho)
+
+    def resultado(self) -> Optional[str]:
+        """Return the special vowel of everything fed so far, or None."""
+        inicio = self.primeira_consoante_apos_vogal
+        if inicio is None:
+            return None
+        candidatas = [
+            (posicao, vogal)
+            for vogal, posicao in self.primeira_posicao.items()
+            if self.contagem[vogal] == 1 and posicao >= inicio
+        ]
+        return min(candidatas)[1] if candidatas else None
+
+def _formatar_tempo(nanossegundos: int) -> str:
+    return f"{nanossegundos / 1_000_000:.3f}ms"
+
+def encontrar_vogal_especial(entrada: str):
+    inicio = time.perf_counter_ns()
+
+    scanner = VogalEspecialScanner()
+    scanner.feed(entrada)
+    vogal_alvo = scanner.resultado()
+
+    tempo_total = time.perf_counter_ns() - inicio
+
     return {
         "string": entrada,
         "vogal": vogal_alvo,
-        "tempoTotal": f"{tempo_total_ms}ms"
+        "tempoTotal": _formatar_tempo(tempo_total)
     }
 
+async def encontrar_vogal_especial_stream(trechos: AsyncIterator[bytes]):
+    """
+    Same as `encontrar_vogal_especial`, for an UTF-8 input received in chunks.
+
+    The input is not echoed back; its length in characters is returned instead. The reported
+    time is the processing time, excluding the time spent waiting for the chunks.
+
+    Args:
+        trechos (AsyncIterator[bytes]): The input, e.g. a chunked request body.
+
+    Returns:
+        dict: The input length, the special vowel and the processing time.
+    """
+    scanner = VogalEspecialScanner()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    tempo_total = 0
+    async for trecho in trechos:
+        inicio = time.perf_counter_ns()
+        scanner.feed(decoder.decode(trecho))
+        tempo_total += time.perf_counter_ns() - inicio
+
+    inicio = time.perf_counter_ns()
+    scanner.feed(decoder.decode(b"", final=True))
+    vogal_alvo = scanner.resultado()
+    tempo_total += time.perf_counter_ns() - inicio
+
+    return {
+        "tamanho": scanner.tamanho,
+        "vogal": vogal_alvo,
+        "tempoTotal": _formatar_tempo(tempo_total)
+    }
@@ -0,0 +1,118 @@
+import asyncio
+from typing import List, Optional
+
+import numpy as np
+from starlette.concurrency import run_in_threadpool
+
+from app import config
+from app.exceptions import PoolSaturatedError
+from app.services.process_pool import BoundedProcessPool
+from app.services.questao_one import VOGAIS, VogalEspecialScanner
+
+_BYTES_VOGAIS = VOGAIS.encode("ascii")
+_TABELA_VOGAIS = np.zeros(256, dtype=bool)
+_TABELA_VOGAIS[list(_BYTES_VOGAIS)] = True
+# Blocos para a busca da primeira transição vogal -> não vogal (para assim que encontra)
+_BLOCO_TRANSICAO = 64 * 1024
+
+vowel_pool = BoundedProcessPool(
+    "vowel analysis",
+    max_workers=config.VOWEL_BATCH_WORKERS,
+    max_queue=config.VOWEL_BATCH_QUEUE_DEPTH,
+)
+
+def _primeira_consoante_apos_vogal(dados: bytes) -> Optional[int]:
+    """Index of the first byte that follows a vowel and is not a vowel, or None."""
+    bytes_ = np.frombuffer(dados, dtype=np.uint8)
+    for inicio in range(0, len(bytes_) - 1, _BLOCO_TRANSICAO):
+        # Um byte de sobreposição para pegar a transição na fronteira dos blocos
+        eh_vogal = _TABELA_VOGAIS[bytes_[inicio:inicio + _BLOCO_TRANSICAO + 1]]
+        transicoes = eh_vogal[:-1] & ~eh_vogal[1:]
+        indice = int(transicoes.argmax())
+        if transicoes[indice]:
+            return inicio + indice + 1
+    return None
+
+def vogal_especial_ascii(dados: bytes) -> Optional[str]:
+    """
+    Find the special vowel of an ASCII byte string.
+
+    The consonant-after-vowel boundary is located with a vectorized lookup over a NumPy view
+    of the bytes. A vowel occurs exactly once when its first and last occurrences coincide,
+    which `bytes.find`/`bytes.rfind` answer with memchr-speed scans that usually stop early,
+    so the vowels are never counted one by one.
+
+    Args:
+        dados (bytes): ASCII-encoded input.
+
+    Returns:
+        Optional[str]: The special vowel, or None.
+    """
+    inicio = _primeira_consoante_apos_vogal(dados)
+    if inicio is None:
+        return None
+    posicoes = []
+    for vogal in _BYTES_VOGAIS:
+        posicao = dados.find(vogal)
+        if posicao >= inicio and posicao == dados.rfind(vogal):
+            posicoes.append(posicao)
+    return chr(dados[min(posicoes)]) if posicoes else None
+
+def vogal_especial(entrada: str) -> Optional[str]:
+    """Special vowel of `entrada`, using the NumPy kernel for ASCII text and the scanner otherwise."""
+    if entrada.isascii():
+        return vogal_especial_ascii(entrada.encode("ascii"))
+    scanner = VogalEspecialScanner()
+    scanner.feed(entrada)
+    return scanner.resultado()
+
+def analisar_lote(entradas: List[str]) -> List[Optional[str]]:
+    """Special vowel of each string; runs inside the worker processes."""
+    return [vogal_especial(entrada) for entrada in entradas]
+
+def _agrupar(entradas: List[str], tamanho_grupo: int) -> List[List[str]]:
+    """Split the batch into consecutive groups of roughly `tamanho_grupo` characters."""
+    grupos, atual, tamanho_atual = [], [], 0
+    for entrada in entradas:
+        atual.append(entrada)
+        tamanho_atual += len(entrada)
+        if tamanho_atual >= tamanho_grupo:
+            grupos.append(atual)
+            atual, tamanho_atual = [], 0
+    if atual:
+        grupos.append(atual)
+    return grupos
+
+async def encontrar_vogais_especiais(entradas: List[str]) -> List[Optional[str]]:
+    """
+    Find the special vowel of every string in a batch.
+
+    Batches of up to `VOWEL_BATCH_INLINE_CHARS` characters in total are analysed in a thread
+    of the threadpool, never on the event loop. Larger ones, a single multi-MB string
+    included, are split into groups of about `VOWEL_BATCH_GROUP_CHARS` characters (a big
+    string is a group on its own) and the groups are analysed in parallel in the vowel pool.
+
+    Args:
+        entradas (List[str]): The strings to analyse.
+
+    Returns:
+        List[Optional[str]]: The special vowel of each string, in the input order.
+
+    Raises:
+        PoolSaturatedError: If the pool has no free slot for every group.
+    """
+    if sum(map(len, entradas)) <= config.VOWEL_BATCH_INLINE_CHARS or vowel_pool.max_workers <= 0:
+        return await run_in_threadpool(analisar_lote, entradas)
+
+    grupos = _agrupar(entradas, config.VOWEL_BATCH_GROUP_CHARS)
+
+    futures = []
+    try:
+        for grupo in grupos:
+            futures.append(vowel_pool.submit(analisar_lote, grupo))
+    except PoolSaturatedError:
+        for future in futures:
+            future.cancel()
+        raise
+    resultados = await asyncio.gather(*(asyncio.wrap_future(future) for future in futures))
+    return [vogal for resultado in resultados for vogal in resultado]
@@ -1,8 +1,12 @@
+from typing import List
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
+from app import config
 from app.repositories.supplier_repository import SupplierRepository
 from app.schemas.supplier_schema import SupplierCreate, Supplier
+from app.schemas.sync_schema import SyncResult
 from app.exceptions import DatabaseOperationError, NotFoundError
+from app.cache import CachedEntity
 
 class SupplierService:
     def __init__(self, db: Session):
@@ -73,6 +77,24 @@ class SupplierService:
             raise NotFoundError("Supplier", supplier_id)
         return supplier
 
+    def get_supplier_entry(self, supplier_id: int) -> CachedEntity:
+        """
+        Retrieves the cached entry (schema, JSON body and ETag) of a supplier.
+
+        Args:
+            supplier_id (int): The ID of the supplier to retrieve.
+
+        Returns:
+            CachedEntity: The cached entry of the supplier.
+
+        Raises:
+            NotFoundError: If no supplier is found with the specified ID.
+        """
+        entry = self.repository.get_entry(supplier_id)
+        if not entry:
+            raise NotFoundError("Supplier", supplier_id)
+        return entry
+
     def get_suppliers(self) -> list:
         """
         Retrieves a list of suppliers with an optional limit on the number of results.
@@ -82,6 +104,24 @@ class SupplierService:
         """
         return self.repository.get_all()
 
+    def sync_suppliers(self, suppliers: List[SupplierCreate]) -> SyncResult:
+        """
+        Creates or updates suppliers by name, in batches of `SYNC_BATCH_SIZE`.
+
+        Args:
+            suppliers (List[SupplierCreate]): The suppliers exported by the ERP.
+
+        Returns:
+            SyncResult: Created, updated, unchanged and failed counts with the errors.
+
+        Raises:
+            DatabaseOperationError: If a database error occurs.
+        """
+        try:
+            return self.repository.sync(suppliers, config.SYNC_BATCH_SIZE)
+        except SQLAlchemyError as e:
+            raise DatabaseOperationError(e)
+
     def delete_supplier(self, supplier_id: int) -> bool:
         """
         Deletes a supplier identified by its ID.
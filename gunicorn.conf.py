@@ -0,0 +1,65 @@
+"""
+Gunicorn configuration for production: `gunicorn app.main:app` (or `python server.py`).
+
+The app is imported once in the master, the migrations run there (and only there: the app's
+lifespan does not migrate), and the heap is frozen before forking so the workers share those
+pages instead of copying them on the first GC.
+Each worker is a uvicorn worker, which picks uvloop and httptools when they are installed.
+"""
+import gc
+import os
+import tempfile
+from app import config as app_config
+
+bind = f"{app_config.SERVER_HOST}:{app_config.SERVER_PORT}"
+workers = app_config.WEB_CONCURRENCY
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = app_config.SERVER_TIMEOUT
+# SIGTERM: para de aceitar conexões e espera as requisições em andamento por até este tempo
+graceful_timeout = app_config.SERVER_GRACEFUL_TIMEOUT
+keepalive = app_config.SERVER_KEEPALIVE
+max_requests = app_config.SERVER_MAX_REQUESTS
+max_requests_jitter = app_config.SERVER_MAX_REQUESTS // 10
+accesslog = "-"
+
+# Métricas de todos os workers em /metrics: precisa estar definido antes do import do app
+if app_config.METRICS_ENABLED and workers > 1 and not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+
+def on_starting(server):
+    from app.cache import configure_entity_cache
+    from app.db.database import Base, check_multiprocess_support, engine
+    from app.db.migrations import apply_migrations
+
+    try:
+        check_multiprocess_support(engine, server.cfg.workers)
+    except RuntimeError as e:
+        server.log.error(str(e))
+        raise SystemExit(1)
+    configure_entity_cache(server.cfg.workers, engine.dialect.name == "sqlite")
+    # Uma vez no master, para os workers não disputarem a criação das tabelas e triggers
+    Base.metadata.create_all(bind=engine)
+    apply_migrations(engine)
+    engine.dispose()
+
+def pre_fork(server, worker):
+    # Objetos do app pré-carregado vão para a geração permanente: o GC dos workers não os
+    # visita e as páginas continuam compartilhadas (copy-on-write)
+    gc.freeze()
+
+def post_fork(server, worker):
+    from app.db.async_database import async_engine, async_read_engine
+    from app.db.database import engine, read_engine
+
+    # Conexões abertas no master não podem ser usadas pelo processo filho
+    engine.dispose(close=False)
+    read_engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+    async_read_engine.sync_engine.dispose(close=False)
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
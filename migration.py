@@ -1,21 +1,22 @@
 import os
 import sys
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.db.database import Base
+from app.db.database import Base, create_db_engine
+from app.db.migrations import apply_migrations
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from app.models.models import Category, Supplier, Product
+from app import config
+from app.models.models import Category, Supplier, Product, InventorySummary
 
 # URLs dos bancos de produção e testes
-SQLALCHEMY_DATABASE_URL = "sqlite:///{}".format(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app/db/prod.db'))
+SQLALCHEMY_DATABASE_URL = config.DATABASE_URL
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///{}".format(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app/db/test.db'))
 
 def init_db(db_url):
     """Cria o banco de dados e todas as tabelas definidas nos modelos."""
-    engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    engine = create_db_engine(db_url)
     Base.metadata.create_all(engine)
+    apply_migrations(engine)
     print(f"Database and tables created at {db_url}!")
 
 if __name__ == "__main__":
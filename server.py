@@ -1,4 +1,18 @@
+import sys
 import uvicorn
 
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="127.0.0.1", port=8080, reload=True)
+    if "--reload" in sys.argv or sys.platform == "win32":
+        # Desenvolvimento (e Windows, onde o gunicorn não roda): um processo com auto-reload,
+        # migrado aqui uma vez; na produção as migrations rodam no master do gunicorn
+        from migration import init_db
+        from app import config
+
+        init_db(config.DATABASE_URL)
+        uvicorn.run("app.main:app", host="127.0.0.1", port=8080, reload=True)
+    else:
+        # Produção: gunicorn com workers uvicorn, configurado em gunicorn.conf.py
+        from gunicorn.app.wsgiapp import run
+
+        sys.argv = ["gunicorn", "--config", "gunicorn.conf.py", "app.main:app"]
+        run()
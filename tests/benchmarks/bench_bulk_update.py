@@ -0,0 +1,82 @@
+"""
+Reprecificação em massa: `PATCH /products/bulk` (um único UPDATE) contra um
+`ProductRepository.update` por produto, como faria um cliente chamando `PUT /products/editar/{id}`.
+
+Popula um banco temporário com `--rows` produtos (com as triggers do resumo de estoque e da
+busca) e mede o UPDATE em todos eles e em uma categoria. O caminho por produto é medido em
+`--sample` produtos e extrapolado para o total.
+
+Uso:
+    python -m tests.benchmarks.bench_bulk_update --rows 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base, create_db_engine
+from app.db.unit_of_work import unit_of_work
+from app.db.migrations import apply_migrations
+from app.models.models import Product
+from app.repositories.product_repository import ProductRepository
+from app.schemas.product_schema import ProductBulkUpdate, ProductCreate
+from app.services.product_update_expression import parse_update_expression
+
+
+def seed(engine, rows: int):
+    with engine.begin() as connection:
+        connection.execute(insert(Product), [
+            {"name": f"produto {i}", "purchase_price": 10, "quantity": i % 50, "sale_price": 15,
+             "category_id": i % 20 + 1, "supplier_id": i % 7 + 1}
+            for i in range(rows)
+        ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--sample", type=int, default=1_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'bulk.db')}")
+        Base.metadata.create_all(engine)
+        apply_migrations(engine)
+        seed(engine, args.rows)
+
+        with sessionmaker(bind=engine)() as db:
+            repository = ProductRepository(db)
+            ids = db.scalars(select(Product.id).order_by(Product.id)).all()
+
+            cases = {
+                "todos: sale_price = purchase_price * 1.35": ProductBulkUpdate(
+                    all_products=True, expression="sale_price = purchase_price * 1.35"
+                ),
+                "categoria 3: +5%": ProductBulkUpdate(category_id=3, expression="+5%"),
+            }
+            print(f"{'atualização':<44} {'linhas':>8} {'tempo (ms)':>11}")
+            for name, selection in cases.items():
+                start = time.perf_counter()
+                with unit_of_work(db):
+                    updated = repository.bulk_update(selection, parse_update_expression(selection.expression))
+                print(f"{name:<44} {updated:>8} {(time.perf_counter() - start) * 1000:>11.1f}")
+
+            start = time.perf_counter()
+            for product_id in ids[:args.sample]:
+                with unit_of_work(db):
+                    product = db.get(Product, product_id)
+                    repository.update(product_id, ProductCreate(
+                        name=product.name, purchase_price=float(product.purchase_price), quantity=product.quantity,
+                        sale_price=round(float(product.purchase_price) * 1.35, 2),
+                        category_id=product.category_id, supplier_id=product.supplier_id,
+                    ))
+            per_row = (time.perf_counter() - start) / args.sample
+            print(f"{'PUT por produto (extrapolado)':<44} {args.rows:>8} {per_row * args.rows * 1000:>11.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
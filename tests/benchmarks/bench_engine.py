@@ -0,0 +1,88 @@
+"""
+Benchmark de throughput de escrita e leitura para cada perfil de engine.
+
+Compara o SQLite padrão (rollback journal, synchronous=FULL), o perfil SQLite ajustado
+de `create_db_engine` e, se `BENCH_SERVER_DATABASE_URL` estiver definido, o perfil com
+pool para banco servidor. Cada escrita é uma transação própria, como no repositório.
+
+Uso:
+    python -m tests.benchmarks.bench_engine --threads 8 --writes 500 --reads 5000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base, create_db_engine
+from app.models.models import Product
+
+
+def run_writes(session_factory, threads: int, writes_per_thread: int):
+    def worker(_):
+        errors = 0
+        for i in range(writes_per_thread):
+            with session_factory() as db:
+                try:
+                    db.add(Product(name=f"produto {i}", purchase_price=10, quantity=i, sale_price=15, category_id=1, supplier_id=1))
+                    db.commit()
+                except OperationalError:
+                    db.rollback()
+                    errors += 1
+        return errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        errors = sum(pool.map(worker, range(threads)))
+    elapsed = time.perf_counter() - start
+    return (threads * writes_per_thread - errors) / elapsed, errors
+
+
+def run_reads(session_factory, threads: int, reads_per_thread: int, max_id: int):
+    def worker(_):
+        with session_factory() as db:
+            for _ in range(reads_per_thread):
+                db.get(Product, random.randint(1, max_id))
+                db.expunge_all()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(worker, range(threads)))
+    return threads * reads_per_thread / (time.perf_counter() - start)
+
+
+def bench_profile(name: str, engine, args):
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    write_rate, errors = run_writes(session_factory, args.threads, args.writes)
+    read_rate = run_reads(session_factory, args.threads, args.reads, args.threads * args.writes - errors)
+    engine.dispose()
+    print(f"{name:<16} {write_rate:>12,.0f} {errors:>8} {read_rate:>12,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=200, help="writes per thread")
+    parser.add_argument("--reads", type=int, default=2000, help="reads per thread")
+    args = parser.parse_args()
+
+    print(f"{'profile':<16} {'writes/s':>12} {'locked':>8} {'reads/s':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        default_url = f"sqlite:///{os.path.join(tmp, 'default.db')}"
+        bench_profile("sqlite-default", create_engine(default_url, connect_args={"check_same_thread": False}), args)
+        bench_profile("sqlite-tuned", create_db_engine(f"sqlite:///{os.path.join(tmp, 'tuned.db')}"), args)
+
+    server_url = os.getenv("BENCH_SERVER_DATABASE_URL")
+    if server_url:
+        bench_profile("pooled", create_db_engine(server_url), args)
+
+
+if __name__ == "__main__":
+    main()
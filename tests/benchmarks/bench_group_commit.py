@@ -0,0 +1,80 @@
+"""
+Group commit: vazão de `PUT /products/editar/{id}` concorrentes com uma transação por
+requisição (unit of work) e com o `GroupCommitWriter` (uma transação por lote).
+
+Cada thread simula um terminal de PDV atualizando produtos em sequência. Roda com
+`synchronous=NORMAL` (padrão do perfil, sem fsync por commit no WAL) e `FULL` (um fsync por
+commit), onde o ganho do group commit é maior.
+
+Uso:
+    python -m tests.benchmarks.bench_group_commit --threads 16 --writes 200
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app import config
+from app.db.database import Base, create_db_engine
+from app.db.group_commit import GroupCommitWriter
+from app.db.unit_of_work import unit_of_work
+from app.models.models import Product
+from app.repositories.product_repository import ProductRepository
+from app.schemas.product_schema import ProductCreate
+
+PRODUCTS = 1000
+
+
+def data(i: int) -> ProductCreate:
+    return ProductCreate(name=f"produto {i}", purchase_price=10, quantity=i % 50, sale_price=15, category_id=1, supplier_id=1)
+
+
+def run(threads: int, writes: int, write) -> float:
+    def terminal(t: int):
+        for i in range(writes):
+            write((t * writes + i) % PRODUCTS + 1, data(i))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(terminal, range(threads)))
+    return threads * writes / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--window-ms", type=float, default=config.GROUP_COMMIT_WINDOW_MS)
+    args = parser.parse_args()
+
+    print(f"{'synchronous':<12} {'modo':<28} {'escritas/s':>11}")
+    for synchronous in ("NORMAL", "FULL"):
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(config, "SQLITE_SYNCHRONOUS", synchronous):
+            engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'group.db')}")
+            Base.metadata.create_all(engine)
+            with engine.begin() as connection:
+                connection.execute(insert(Product), [data(i).model_dump() for i in range(PRODUCTS)])
+            session_factory = sessionmaker(bind=engine)
+
+            def per_request(product_id, product):
+                with session_factory() as db, unit_of_work(db):
+                    ProductRepository(db).update(product_id, product)
+
+            writer = GroupCommitWriter(session_factory, args.window_ms, config.GROUP_COMMIT_MAX_BATCH)
+
+            def grouped(product_id, product):
+                writer.run(lambda db: ProductRepository(db).update(product_id, product))
+
+            for name, write in (("uma transação por requisição", per_request), ("group commit", grouped)):
+                print(f"{synchronous:<12} {name:<28} {run(args.threads, args.writes, write):>11.0f}")
+            writer.shutdown()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Microbenchmark da verificação de JWT com e sem o cache de tokens verificados.
+
+"uncached" faz o que era feito a cada requisição: base64 + HMAC + JSON + validação
+de claims. "cached" é `verify_token` com o token já no cache (digest SHA-256 + lookup).
+
+Uso:
+    python -m tests.benchmarks.bench_jwt --iterations 100000
+"""
+import argparse
+import timeit
+
+import jwt
+
+from app import config
+from app.api.routes.validated_token import token_cache, verify_token
+from app.services.auth_service import AuthService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100000)
+    args = parser.parse_args()
+
+    token = AuthService(db=None).create_token(1, "teste@teste.com")
+
+    def uncached():
+        jwt.decode(token, config.JWT_SECRET_KEY, algorithms=[config.JWT_ALGORITHM], options={"require": ["exp", "sub"]})
+
+    token_cache.clear()
+    verify_token(token)
+
+    for name, fn in (("uncached", uncached), ("cached", lambda: verify_token(token))):
+        seconds = min(timeit.repeat(fn, number=args.iterations, repeat=3))
+        print(f"{name:<10} {seconds / args.iterations * 1e6:8.2f} us/verify  {args.iterations / seconds:>12,.0f} verify/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Latência de `GET /products/search` (sem HTTP) sobre um catálogo sintético.
+
+Popula um banco temporário com `--rows` produtos de nomes aleatórios (as triggers mantêm o
+índice FTS5) e mede consultas por termo raro, termo comum, prefixo curto e com filtro de
+categoria, comparando com `LIKE '%termo%'` na tabela.
+
+Uso:
+    python -m tests.benchmarks.bench_search --rows 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base, create_db_engine
+from app.db.migrations import apply_migrations
+from app.models.models import Product
+from app.repositories.product_repository import ProductRepository
+
+NOUNS = ["cadeira", "mesa", "sofá", "armário", "estante", "poltrona", "cama", "banco", "escrivaninha", "rack"]
+ADJECTIVES = ["azul", "preta", "branca", "madeira", "metal", "escritório", "gamer", "infantil", "retrátil", "dobrável"]
+
+
+def seed(engine, rows: int):
+    rng = random.Random(7)
+    with engine.begin() as connection:
+        for start in range(0, rows, 50_000):
+            batch = [
+                {
+                    "name": f"{rng.choice(NOUNS)} {rng.choice(ADJECTIVES)} modelo{rng.randrange(100_000)}",
+                    "purchase_price": 10, "quantity": 1, "sale_price": 15,
+                    "category_id": rng.randrange(1, 50), "supplier_id": rng.randrange(1, 200),
+                }
+                for _ in range(start, min(start + 50_000, rows))
+            ]
+            connection.execute(insert(Product), batch)
+
+
+def timed(fn, repeat: int = 20):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'search.db')}")
+        Base.metadata.create_all(engine)
+        apply_migrations(engine)
+        start = time.perf_counter()
+        seed(engine, args.rows)
+        print(f"seed: {args.rows} produtos em {time.perf_counter() - start:.1f}s")
+
+        with sessionmaker(bind=engine)() as db:
+            repository = ProductRepository(db)
+            cases = {
+                "termo raro (modelo12345)": lambda: repository.search("modelo12345", 20),
+                "dois termos (cad azul)": lambda: repository.search("cad azul", 20),
+                "prefixo curto (mo)": lambda: repository.search("mo", 20),
+                "filtro categoria": lambda: repository.search("cadeira gamer", 20, category_id=7),
+                "LIKE '%modelo12345%'": lambda: db.scalars(
+                    select(Product).where(Product.name.like("%modelo12345%")).limit(20)
+                ).all(),
+            }
+            print(f"{'consulta':<28} {'mediana (ms)':>12}")
+            for name, fn in cases.items():
+                print(f"{name:<28} {timed(fn, 5 if 'LIKE' in name else 20):>12.2f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
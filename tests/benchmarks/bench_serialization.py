@@ -0,0 +1,96 @@
+"""
+CPU por resposta de listagem com 10k produtos: caminho padrão do FastAPI contra o caminho rápido.
+
+"padrão" reproduz a rota original: objetos ORM devolvidos com `response_model=List[Product]`
+(validação pelo pydantic, `jsonable_encoder` e `json.dumps`). "rápido" é a rota atual
+`/products/produtos/listagem`: colunas selecionadas e codificadas com orjson. Os dois passam
+pelo mesmo TestClient, então o overhead de HTTP/ASGI entra nas duas medidas.
+
+Uso:
+    python -m tests.benchmarks.bench_serialization --rows 10000 --requests 20
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import List
+
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api.dependencies import get_db
+from app.db.database import Base, create_db_engine
+from app.main import app
+from app.models.models import Product
+from app.schemas.product_schema import Product as ProductSchema
+
+
+def legacy_app(session_factory) -> FastAPI:
+    legacy = FastAPI(default_response_class=JSONResponse)
+
+    def db_dependency():
+        with session_factory() as db:
+            yield db
+
+    @legacy.get("/listagem", response_model=List[ProductSchema])
+    def read_products(limit: int, db: Session = Depends(db_dependency)):
+        return db.query(Product).order_by(Product.id).limit(limit).all()
+
+    return legacy
+
+
+def cpu_per_request(client: TestClient, url: str, params: dict, requests: int) -> float:
+    client.get(url, params=params)
+    start = time.process_time()
+    for _ in range(requests):
+        response = client.get(url, params=params)
+        assert response.status_code == 200
+    return (time.process_time() - start) / requests * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        with engine.begin() as connection:
+            connection.execute(insert(Product), [
+                {"name": f"produto {i}", "purchase_price": 10.5, "quantity": i, "sale_price": 12.25,
+                 "category_id": 1, "supplier_id": 1}
+                for i in range(args.rows)
+            ])
+        session_factory = sessionmaker(bind=engine)
+
+        def db_dependency():
+            with session_factory() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = db_dependency
+        try:
+            legacy_client = TestClient(legacy_app(session_factory))
+            fast_client = TestClient(app)
+            params = {"limit": args.rows}
+            assert legacy_client.get("/listagem", params=params).json() == \
+                fast_client.get("/products/produtos/listagem", params=params).json()
+
+            legacy = cpu_per_request(legacy_client, "/listagem", params, args.requests)
+            fast = cpu_per_request(fast_client, "/products/produtos/listagem", params, args.requests)
+        finally:
+            app.dependency_overrides.clear()
+            engine.dispose()
+
+    print(f"{'caminho':<10} {'CPU/resposta (ms)':>18}")
+    print(f"{'padrão':<10} {legacy:>18.1f}")
+    print(f"{'rápido':<10} {fast:>18.1f}")
+    print(f"redução: {legacy / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
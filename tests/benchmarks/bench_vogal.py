@@ -0,0 +1,76 @@
+"""
+Benchmark de `encontrar_vogal_especial`: implementação original (três laços Python sobre a
+string) contra o scanner de passada única, para entradas de 1 KB a 100 MB.
+
+Uso:
+    python -m tests.benchmarks.bench_vogal --max-size 100000000
+"""
+import argparse
+import random
+import time
+
+from app.services.questao_one import VogalEspecialScanner
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000]
+
+
+def encontrar_vogal_original(entrada: str):
+    """Algoritmo original, mantido aqui como referência de comportamento e desempenho."""
+    vogais = 'aeiouAEIOU'
+    contagem_vogais = {}
+    primeira_consoante_apos_vogal = None
+
+    for char in entrada:
+        if char in vogais:
+            contagem_vogais[char] = contagem_vogais.get(char, 0) + 1
+
+    for i in range(len(entrada) - 1):
+        if entrada[i] in vogais and entrada[i + 1] not in vogais:
+            primeira_consoante_apos_vogal = i + 1
+            break
+
+    if primeira_consoante_apos_vogal is not None:
+        for i in range(primeira_consoante_apos_vogal, len(entrada)):
+            char = entrada[i]
+            if char in vogais and contagem_vogais[char] == 1:
+                return char
+    return None
+
+
+def encontrar_vogal_scanner(entrada: str, chunk_size: int = 64 * 1024):
+    scanner = VogalEspecialScanner()
+    for inicio in range(0, len(entrada), chunk_size):
+        scanner.feed(entrada[inicio:inicio + chunk_size])
+    return scanner.resultado()
+
+
+def gerar_entrada(tamanho: int) -> str:
+    # Consoantes com as vogais minúsculas repetidas e um único "E" no final,
+    # o pior caso para a busca (a resposta só aparece no último caractere).
+    gerador = random.Random(42)
+    bloco = "".join(gerador.choice("bcdfghaeiou") for _ in range(1000))
+    return (bloco * (tamanho // len(bloco) + 1))[:tamanho - 1] + "E"
+
+
+def medir(fn, entrada):
+    inicio = time.perf_counter_ns()
+    resultado = fn(entrada)
+    return resultado, (time.perf_counter_ns() - inicio) / 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-size", type=int, default=100_000_000)
+    args = parser.parse_args()
+
+    print(f"{'tamanho':>12} {'original (ms)':>14} {'scanner (ms)':>13} {'speedup':>8}")
+    for tamanho in (s for s in SIZES if s <= args.max_size):
+        entrada = gerar_entrada(tamanho)
+        esperado, tempo_original = medir(encontrar_vogal_original, entrada)
+        obtido, tempo_scanner = medir(encontrar_vogal_scanner, entrada)
+        assert obtido == esperado, (tamanho, obtido, esperado)
+        print(f"{tamanho:>12} {tempo_original:>14.3f} {tempo_scanner:>13.3f} {tempo_original / tempo_scanner:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
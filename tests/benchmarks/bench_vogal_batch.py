@@ -0,0 +1,55 @@
+"""
+Vazão de `POST /teste/batch` (sem HTTP): o mesmo lote analisado pelo scanner em um único
+processo e pelo kernel NumPy com 1, 2, 4, ... processos.
+
+Uso:
+    python -m tests.benchmarks.bench_vogal_batch --strings 200 --size 500000
+"""
+import argparse
+import asyncio
+import os
+import time
+from unittest.mock import patch
+
+from app.services import questao_one_batch
+from app.services.process_pool import BoundedProcessPool
+from app.services.questao_one import VogalEspecialScanner
+from tests.benchmarks.bench_vogal import gerar_entrada
+
+
+def scanner(entrada):
+    s = VogalEspecialScanner()
+    s.feed(entrada)
+    return s.resultado()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--strings", type=int, default=200)
+    parser.add_argument("--size", type=int, default=500_000)
+    args = parser.parse_args()
+
+    lote = [gerar_entrada(args.size)] * args.strings
+    total_mb = args.strings * args.size / 1_000_000
+
+    inicio = time.perf_counter()
+    esperado = [scanner(entrada) for entrada in lote]
+    tempo = time.perf_counter() - inicio
+    print(f"{'scanner, 1 processo':<24} {tempo:8.3f}s {total_mb / tempo:9.1f} MB/s")
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        pool = BoundedProcessPool("bench", max_workers=workers, max_queue=len(lote))
+        pool.run(len, "aquecimento")
+        with patch.object(questao_one_batch, "vowel_pool", pool):
+            inicio = time.perf_counter()
+            obtido = asyncio.run(questao_one_batch.encontrar_vogais_especiais(lote))
+            tempo = time.perf_counter() - inicio
+        pool.shutdown()
+        assert obtido == esperado
+        print(f"{f'numpy, {workers} processo(s)':<24} {tempo:8.3f}s {total_mb / tempo:9.1f} MB/s")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
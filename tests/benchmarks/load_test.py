@@ -0,0 +1,299 @@
+"""
+Teste de carga HTTP com gate de regressão.
+
+Popula um SQLite descartável (por padrão 100k produtos, 1k categorias e 5k fornecedores), sobe
+a API com uvicorn apontando para ele e dispara, com `--concurrency` clientes simultâneos, cada
+cenário de `/auth`, `/categories`, `/suppliers`, `/products`, `/reports` e `/teste/`. Para cada
+cenário mede p50/p95/p99, vazão e erros.
+
+Sem `--save-baseline`, o resultado é comparado com o baseline salvo: o processo termina com
+código 1 se algum cenário tiver p95 ou vazão pior que o baseline além de `--tolerance`, ou
+erros que o baseline não tinha. O baseline depende da máquina; regrave-o ao trocar de ambiente.
+
+Uso:
+    python -m tests.benchmarks.load_test
+    python -m tests.benchmarks.load_test --products 10000 --requests 100 --save-baseline
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import httpx
+from sqlalchemy import insert
+
+from app.db.database import Base, create_db_engine
+from app.db.migrations import apply_migrations
+from app.models.models import Category, Product, Supplier
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "load_baseline.json")
+SEED_BATCH = 10_000
+TEXT_SAMPLE = "aAbBABacafe" * 100
+
+
+@dataclass
+class LoadContext:
+    """Volumes seeded and ids created during the run, shared by the scenarios."""
+    products: int
+    categories: int
+    suppliers: int
+    rng: random.Random = field(default_factory=lambda: random.Random(42))
+    sequence: itertools.count = field(default_factory=lambda: itertools.count(1))
+    created: Dict[str, List[int]] = field(default_factory=lambda: {"products": [], "categories": [], "suppliers": []})
+
+    def product_id(self) -> int:
+        return self.rng.randint(1, self.products)
+
+    def product_body(self) -> dict:
+        return {
+            "name": f"carga {next(self.sequence)}", "purchase_price": 10.5, "quantity": self.rng.randint(0, 100),
+            "sale_price": 15.75, "category_id": self.rng.randint(1, self.categories),
+            "supplier_id": self.rng.randint(1, self.suppliers),
+        }
+
+    def supplier_body(self) -> dict:
+        n = next(self.sequence)
+        return {"name": f"fornecedor carga {n}", "email": f"carga{n}@teste.com", "phone": f"55{n:09d}"}
+
+
+@dataclass
+class Scenario:
+    """One route under load: `build` returns the httpx request arguments for each request."""
+    name: str
+    method: str
+    build: Callable[[LoadContext], dict]
+    # Fração de --requests usada pelo cenário (rotas caras recebem menos requisições)
+    weight: float = 1.0
+    # Coleção em LoadContext.created onde guardar o id devolvido
+    collect: Optional[str] = None
+    # Limite de clientes simultâneos para rotas que devolvem o catálogo inteiro
+    max_concurrency: Optional[int] = None
+
+
+def _pop(context: LoadContext, collection: str) -> int:
+    return context.created[collection].pop()
+
+
+SCENARIOS = [
+    Scenario("auth register", "POST", lambda c: {"url": "/auth/register", "json": {"email": f"u{next(c.sequence)}@teste.com", "password": "senha-segura"}}, 0.2),
+    Scenario("auth login", "POST", lambda c: {"url": "/auth/login", "json": {"email": "carga@teste.com", "password": "senha-segura"}}, 0.2),
+    Scenario("categories create", "POST", lambda c: {"url": "/categories/cadastrar", "json": {"name": f"categoria carga {next(c.sequence)}"}}, collect="categories"),
+    Scenario("categories get", "GET", lambda c: {"url": f"/categories/{c.rng.randint(1, c.categories)}"}),
+    Scenario("categories list", "GET", lambda c: {"url": "/categories/categorias/listagem"}),
+    Scenario("categories list+products", "GET", lambda c: {"url": "/categories/categorias/listagem", "params": {"include": "products"}}, 0.01, max_concurrency=2),
+    Scenario("categories names", "GET", lambda c: {"url": "/categories/categorias/nomes"}),
+    Scenario("categories update", "PUT", lambda c: {"url": f"/categories/editar/{c.created['categories'][-1]}", "json": {"name": f"categoria editada {next(c.sequence)}"}}),
+    Scenario("suppliers create", "POST", lambda c: {"url": "/suppliers/cadastrar", "json": c.supplier_body()}, collect="suppliers"),
+    Scenario("suppliers get", "GET", lambda c: {"url": f"/suppliers/{c.rng.randint(1, c.suppliers)}"}),
+    Scenario("suppliers list", "GET", lambda c: {"url": "/suppliers/fornecedores/listagem"}, 0.1, max_concurrency=4),
+    Scenario("suppliers update", "PUT", lambda c: {"url": f"/suppliers/editar/{c.created['suppliers'][-1]}", "json": c.supplier_body()}),
+    Scenario("products create", "POST", lambda c: {"url": "/products/cadastrar", "json": c.product_body()}, collect="products"),
+    Scenario("products bulk", "POST", lambda c: {"url": "/products/bulk", "json": [c.product_body() for _ in range(100)]}, 0.1),
+    Scenario("products get", "GET", lambda c: {"url": f"/products/{c.product_id()}"}),
+    Scenario("products list", "GET", lambda c: {"url": "/products/produtos/listagem", "params": {"limit": 100, "after": c.product_id()}}),
+    Scenario("products list filtered", "GET", lambda c: {"url": "/products/produtos/listagem", "params": {"category_id": c.rng.randint(1, c.categories), "sort": "-sale_price", "limit": 50}}),
+    Scenario("products search", "GET", lambda c: {"url": "/products/search", "params": {"q": f"produto {c.product_id()}"}}),
+    Scenario("products export", "GET", lambda c: {"url": "/products/export", "params": {"format": "ndjson"}}, 0.01, max_concurrency=2),
+    Scenario("products update", "PUT", lambda c: {"url": f"/products/editar/{c.created['products'][-1]}", "json": c.product_body()}),
+    Scenario("reports inventory", "GET", lambda c: {"url": "/reports/inventory/categorias"}, 0.1, max_concurrency=4),
+    Scenario("teste vowel", "POST", lambda c: {"url": "/teste/", "params": {"input_string": TEXT_SAMPLE}}),
+    Scenario("teste stream", "POST", lambda c: {"url": "/teste/stream", "content": TEXT_SAMPLE.encode() * 100}),
+    Scenario("teste batch", "POST", lambda c: {"url": "/teste/batch", "json": {"strings": [TEXT_SAMPLE] * 50}}),
+    # Remoções por último, sobre o que os cenários de criação inseriram
+    Scenario("products delete", "DELETE", lambda c: {"url": f"/products/delete/{_pop(c, 'products')}"}),
+    Scenario("suppliers delete", "DELETE", lambda c: {"url": f"/suppliers/delete/{_pop(c, 'suppliers')}"}),
+    Scenario("categories delete", "DELETE", lambda c: {"url": f"/categories/delete/{_pop(c, 'categories')}"}),
+]
+
+
+def seed(database_url: str, products: int, categories: int, suppliers: int) -> None:
+    """Create the schema and insert the synthetic catalog in batches."""
+    engine = create_db_engine(database_url)
+    Base.metadata.create_all(engine)
+    apply_migrations(engine)
+    rng = random.Random(7)
+    with engine.begin() as connection:
+        connection.execute(insert(Category), [{"name": f"categoria {i}"} for i in range(categories)])
+        connection.execute(insert(Supplier), [
+            {"name": f"fornecedor {i}", "email": f"fornecedor{i}@teste.com", "phone": f"11{i:09d}"}
+            for i in range(suppliers)
+        ])
+        for start in range(0, products, SEED_BATCH):
+            connection.execute(insert(Product), [
+                {"name": f"produto {i}", "purchase_price": rng.randint(100, 10000) / 100, "quantity": rng.randint(0, 500),
+                 "sale_price": rng.randint(100, 20000) / 100, "category_id": rng.randint(1, categories),
+                 "supplier_id": rng.randint(1, suppliers)}
+                for i in range(start, min(start + SEED_BATCH, products))
+            ])
+    engine.dispose()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database_url: str, port: int) -> subprocess.Popen:
+    """Start uvicorn on the seeded database and wait until it answers."""
+    env = dict(os.environ, DATABASE_URL=database_url)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+            return server
+        except httpx.TransportError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("API did not start in 30 seconds")
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, context: LoadContext, requests: int, concurrency: int) -> dict:
+    """Send `requests` requests with `concurrency` workers and summarize the latencies."""
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            try:
+                arguments = scenario.build(context)
+            except IndexError:
+                return  # nada mais para remover
+            start = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, **arguments)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                response, failed = None, True
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += failed
+            if scenario.collect and not failed:
+                context.created[scenario.collect].append(response.json()["id"])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(quantiles[49], 2),
+        "p95_ms": round(quantiles[94], 2),
+        "p99_ms": round(quantiles[98], 2),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+    }
+
+
+async def run_load(base_url: str, context: LoadContext, args) -> Dict[str, dict]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        await client.post("/auth/register", json={"email": "carga@teste.com", "password": "senha-segura"})
+        results = {}
+        for scenario in SCENARIOS:
+            requests = max(2, int(args.requests * scenario.weight))
+            concurrency = min(args.concurrency, scenario.max_concurrency or args.concurrency, requests)
+            results[scenario.name] = await run_scenario(client, scenario, context, requests, concurrency)
+            result = results[scenario.name]
+            print(f"{scenario.name:<26} {result['requests']:>6} {result['errors']:>6} {result['p50_ms']:>9.1f} "
+                  f"{result['p95_ms']:>9.1f} {result['p99_ms']:>9.1f} {result['throughput_rps']:>9.1f}")
+        return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """
+    List the regressions of `results` against `baseline`.
+
+    A scenario regresses when its p95 grows, or its throughput drops, by more than `tolerance`
+    (a fraction), or when it has errors and the baseline had none.
+    """
+    regressions = []
+    for name, expected in baseline.items():
+        actual = results.get(name)
+        if actual is None:
+            regressions.append(f"{name}: missing from this run")
+            continue
+        if actual["p95_ms"] > expected["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {actual['p95_ms']}ms > baseline {expected['p95_ms']}ms")
+        if actual["throughput_rps"] < expected["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {actual['throughput_rps']}/s < baseline {expected['throughput_rps']}/s")
+        if actual["errors"] and not expected["errors"]:
+            regressions.append(f"{name}: {actual['errors']} errors")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--categories", type=int, default=1_000)
+    parser.add_argument("--suppliers", type=int, default=5_000)
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario (scaled by its weight)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed regression, as a fraction")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'load.db')}"
+        start = time.perf_counter()
+        seed(database_url, args.products, args.categories, args.suppliers)
+        print(f"seed: {args.products} produtos, {args.categories} categorias, {args.suppliers} fornecedores "
+              f"em {time.perf_counter() - start:.1f}s")
+
+        port = _free_port()
+        server = start_server(database_url, port)
+        try:
+            context = LoadContext(args.products, args.categories, args.suppliers)
+            print(f"{'cenário':<26} {'reqs':>6} {'erros':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9}")
+            results = asyncio.run(run_load(f"http://127.0.0.1:{port}", context, args))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    report = {
+        "config": {key: getattr(args, key) for key in ("products", "categories", "suppliers", "requests", "concurrency")},
+        "scenarios": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline salvo em {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"sem baseline em {args.baseline}; rode com --save-baseline")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline["config"] != report["config"]:
+        print(f"aviso: baseline gravado com outra configuração {baseline['config']}")
+    regressions = compare(results, baseline["scenarios"], args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSÃO {regression}")
+    if regressions:
+        sys.exit(1)
+    print("sem regressões")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import unittest
+from app.models.models import Category, Product, Supplier
+from app.cache import entity_cache
+from app.repositories import AsyncCategoryRepository, AsyncProductRepository, AsyncSupplierRepository, AsyncUserRepository
+from app.repositories.category_repository import CategoryRepository
+from app.schemas.category_schema import CategoryCreate
+from app.schemas.product_schema import ProductCreate
+from app.schemas.supplier_schema import SupplierCreate
+from app.db.unit_of_work import async_unit_of_work
+from app.db.test_database import create_test_database, TestSessionLocal, TestAsyncSessionLocal
+
+
+class TestAsyncRepositories(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        create_test_database()
+
+    async def asyncSetUp(self):
+        self.db = TestAsyncSessionLocal()
+        entity_cache.clear()
+
+    async def asyncTearDown(self):
+        await self.db.close()
+        with TestSessionLocal() as db:
+            db.query(Product).delete()
+            db.query(Category).delete()
+            db.query(Supplier).delete()
+            db.commit()
+
+    async def test_category_crud(self):
+        repository = AsyncCategoryRepository(self.db)
+        async with async_unit_of_work(self.db):
+            category = await repository.create(CategoryCreate(name="teste"))
+        self.assertEqual((await repository.get_with_products(category.id)).products, [])
+
+        async with async_unit_of_work(self.db):
+            updated = await repository.update(category.id, CategoryCreate(name="Teste editado"))
+        self.assertEqual(updated.name, "Teste editado")
+        self.assertEqual([c.name for c in await repository.get_all()], ["Teste editado"])
+        self.assertEqual((await repository.get_entry(category.id)).value.name, "Teste editado")
+
+        async with async_unit_of_work(self.db):
+            self.assertTrue(await repository.delete(category.id))
+        self.assertIsNone(await repository.get_by_id(category.id))
+
+    async def test_writes_are_committed_by_the_unit_of_work(self):
+        repository = AsyncSupplierRepository(self.db)
+        with self.assertRaises(RuntimeError):
+            async with async_unit_of_work(self.db):
+                await repository.create(SupplierCreate(name="teste", email="teste@teste.com", phone="123"))
+                raise RuntimeError("falha depois da escrita")
+
+        with TestSessionLocal() as db:
+            self.assertEqual(db.query(Supplier).count(), 0)
+
+        async with async_unit_of_work(self.db):
+            supplier = await repository.create(SupplierCreate(name="teste", email="teste@teste.com", phone="123"))
+        with TestSessionLocal() as db:
+            self.assertEqual(db.get(Supplier, supplier.id).email, "teste@teste.com")
+
+    async def test_sync_and_async_repositories_share_the_cache(self):
+        async with async_unit_of_work(self.db):
+            category = await AsyncCategoryRepository(self.db).create(CategoryCreate(name="teste"))
+        self.assertEqual((await AsyncCategoryRepository(self.db).get_entry(category.id)).value.name, "teste")
+
+        # Uma escrita pelo repositório síncrono invalida a entrada lida pelo assíncrono
+        with TestSessionLocal() as db:
+            CategoryRepository(db).update(category.id, CategoryCreate(name="editada"))
+            db.commit()
+        await self.db.rollback()
+        self.assertEqual((await AsyncCategoryRepository(self.db).get_entry(category.id)).value.name, "editada")
+
+    async def test_supplier_crud(self):
+        repository = AsyncSupplierRepository(self.db)
+        async with async_unit_of_work(self.db):
+            supplier = await repository.create(SupplierCreate(name="teste", email="teste@teste.com", phone="123"))
+
+        async with async_unit_of_work(self.db):
+            updated = await repository.update(supplier.id, SupplierCreate(name="teste", email="outro@teste.com", phone="123"))
+        self.assertEqual(updated.email, "outro@teste.com")
+
+        async with async_unit_of_work(self.db):
+            self.assertTrue(await repository.delete(supplier.id))
+            self.assertFalse(await repository.delete(supplier.id))
+
+    async def test_product_pagination_and_search(self):
+        repository = AsyncProductRepository(self.db)
+        ids = []
+        async with async_unit_of_work(self.db):
+            for i in range(3):
+                product = await repository.create(
+                    ProductCreate(name=f"cadeira {i}", purchase_price=10, quantity=i, sale_price=15, category_id=1, supplier_id=1)
+                )
+                ids.append(product.id)
+
+        page = await repository.get_page(limit=2)
+        self.assertEqual([p.id for p in page], ids[:2])
+        self.assertEqual([p.id for p in await repository.get_page(limit=2, after=ids[1])], ids[2:])
+        self.assertEqual(len(await repository.search("cad", limit=10)), 3)
+
+    async def test_user_create_and_find(self):
+        repository = AsyncUserRepository(self.db)
+        try:
+            async with async_unit_of_work(self.db):
+                user = await repository.create_user("async@teste.com", "senha123")
+            self.assertEqual((await repository.find_by_email("async@teste.com")).id, user.id)
+            with self.assertRaises(ValueError):
+                async with async_unit_of_work(self.db):
+                    await repository.create_user("async@teste.com", "outra")
+        finally:
+            async with async_unit_of_work(self.db):
+                await self.db.delete(await repository.find_by_email("async@teste.com"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import unittest
+from concurrent.futures import Future
+from unittest import mock
+import jwt
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from werkzeug.security import generate_password_hash
+from app.main import app
+from app.models.models import User
+from app.api.dependencies import get_db
+from app.db.test_database import create_test_database, TestSessionLocal, Base, session_dependency
+from app.api.routes.validated_token import token_cache, token_required
+from app.services import password_hasher
+from app.repositories.user_repository import UserRepository
+from app.services.auth_service import AuthService
+from app.services.process_pool import BoundedProcessPool
+
+
+class TestAuthEndpoints(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        create_test_database()
+
+    def setUp(self):
+        self.db = TestSessionLocal()
+        Base.metadata.create_all(bind=self.db.get_bind())
+        self.client = TestClient(app)
+        app.dependency_overrides[get_db] = session_dependency(self.db)
+
+    def tearDown(self):
+        self.db.query(User).delete()
+        self.db.commit()
+        self.db.close()
+        app.dependency_overrides.clear()
+
+    def test_register_and_login(self):
+        response = self.client.post("/auth/register", json={"email": "teste@teste.com", "password": "12345678"})
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post("/auth/register", json={"email": "teste@teste.com", "password": "outra000"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["detail"], "A user with the given email already exists.")
+
+        response = self.client.post("/auth/login", json={"email": "teste@teste.com", "password": "12345678"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["token_type"], "bearer")
+
+        response = self.client.post("/auth/login", json={"email": "teste@teste.com", "password": "errada00"})
+        self.assertEqual(response.status_code, 401)
+
+    def test_login_upgrades_outdated_hash(self):
+        self.db.add(User(email="teste@teste.com", password=generate_password_hash("12345678", "pbkdf2:sha256:1000")))
+        self.db.commit()
+
+        response = self.client.post("/auth/login", json={"email": "teste@teste.com", "password": "12345678"})
+        self.assertEqual(response.status_code, 200)
+
+        user = self.db.query(User).filter(User.email == "teste@teste.com").one()
+        self.db.refresh(user)
+        self.assertFalse(password_hasher.needs_rehash(user.password))
+        self.assertTrue(user.check_password("12345678"))
+
+    def test_login_returns_503_when_hash_pool_is_saturated(self):
+        self.db.add(User(email="teste@teste.com", password=generate_password_hash("12345678")))
+        self.db.commit()
+
+        saturated_pool = BoundedProcessPool("password hashing", max_workers=0, max_queue=0)
+        saturated_pool._slots.acquire()
+        with mock.patch.object(password_hasher, "hash_pool", saturated_pool):
+            response = self.client.post("/auth/login", json={"email": "teste@teste.com", "password": "12345678"})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["Retry-After"], "1")
+
+    def test_login_returns_503_when_hash_pool_times_out(self):
+        self.db.add(User(email="teste@teste.com", password=generate_password_hash("12345678")))
+        self.db.commit()
+
+        # Um Future que nunca termina: result() levanta o concurrent.futures.TimeoutError real
+        stalled_pool = BoundedProcessPool("password hashing", max_workers=1, max_queue=0)
+        with mock.patch.object(password_hasher, "hash_pool", stalled_pool), \
+                mock.patch.object(stalled_pool, "submit", side_effect=lambda *args: Future()), \
+                mock.patch.object(password_hasher.config, "PASSWORD_HASH_TIMEOUT_SECONDS", 0.01):
+            response = self.client.post("/auth/login", json={"email": "teste@teste.com", "password": "12345678"})
+            register = self.client.post("/auth/register", json={"email": "novo@teste.com", "password": "12345678"})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["Retry-After"], "1")
+        self.assertEqual(register.status_code, 503)
+        self.assertIn("did not answer", register.json()["detail"])
+
+    def test_method_prefix_matches_werkzeug(self):
+        for method in ("scrypt", "scrypt:16384:8:1", "pbkdf2", "pbkdf2:sha512", "pbkdf2:sha256:1000"):
+            self.assertEqual(password_hasher._method_prefix(method), generate_password_hash("", method).split("$", 1)[0])
+
+    def test_needs_rehash_checks_salt_length(self):
+        with mock.patch.object(password_hasher.config, "PASSWORD_HASH_METHOD", "pbkdf2:sha256:1000"):
+            self.assertTrue(password_hasher.needs_rehash(generate_password_hash("12345678", "pbkdf2:sha256:1000", 8)))
+            self.assertFalse(password_hasher.needs_rehash(generate_password_hash("12345678", "pbkdf2:sha256:1000", 16)))
+
+    def test_failed_hash_upgrade_keeps_the_login(self):
+        self.db.add(User(email="teste@teste.com", password=generate_password_hash("12345678", "pbkdf2:sha256:1000")))
+        self.db.add(User(email="outro@teste.com", password=generate_password_hash("12345678")))
+        self.db.commit()
+        old_hash = self.db.query(User).filter(User.email == "teste@teste.com").one().password
+
+        def failing_update(repository, user, password_hash):
+            # Flush que falha (e-mail duplicado) no meio da atualização do hash
+            user.password = password_hash
+            user.email = "outro@teste.com"
+            repository.db.flush()
+
+        with mock.patch.object(UserRepository, "update_password_hash", failing_update):
+            response = self.client.post("/auth/login", json={"email": "teste@teste.com", "password": "12345678"})
+        self.assertEqual(response.status_code, 200)
+
+        self.db.rollback()
+        user = self.db.query(User).filter(User.password == old_hash).one()
+        self.assertEqual(user.email, "teste@teste.com")
+
+
+
+class TestTokenRequired(unittest.TestCase):
+    def setUp(self):
+        protected_app = FastAPI()
+
+        @protected_app.get("/protegido")
+        def protected(claims: dict = Depends(token_required)):
+            return claims
+
+        self.client = TestClient(protected_app)
+        token_cache.clear()
+
+    def test_valid_token_is_verified_once(self):
+        token = AuthService(db=None).create_token(7, "teste@teste.com")
+        headers = {"Authorization": f"Bearer {token}"}
+
+        with mock.patch("app.api.routes.validated_token.jwt.decode", wraps=jwt.decode) as decode:
+            for _ in range(3):
+                response = self.client.get("/protegido", headers=headers)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()["email"], "teste@teste.com")
+                self.assertEqual(response.json()["sub"], "7")
+        self.assertEqual(decode.call_count, 1)
+
+    def test_missing_expired_and_invalid_tokens(self):
+        self.assertEqual(self.client.get("/protegido").status_code, 401)
+
+        with mock.patch("app.config.JWT_EXPIRATION_SECONDS", -1):
+            expired = AuthService(db=None).create_token(7, "teste@teste.com")
+        response = self.client.get("/protegido", headers={"Authorization": f"Bearer {expired}"})
+        self.assertEqual(response.json()["detail"], "Token has expired")
+
+        response = self.client.get("/protegido", headers={"Authorization": "Bearer invalido"})
+        self.assertEqual(response.json()["detail"], "Invalid token")
+
+
+if __name__ == "__main__":
+    unittest.main()
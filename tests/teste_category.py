@@ -1,9 +1,16 @@
 import unittest
 from fastapi.testclient import TestClient
 from app.main import app
-from app.models.models import Category
-from app.api.dependencies import get_db
-from app.db.test_database import create_test_database, TestSessionLocal, Base
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from starlette.requests import Request
+from app.models.models import Category, Product, Supplier
+from app.repositories.category_repository import CategoryRepository
+from app.schemas.category_schema import CategoryCreate
+from app.db.unit_of_work import unit_of_work
+from app.api.dependencies import get_async_read_db, get_db, get_read_db
+from app.db import database
+from app.db.test_database import create_test_database, TestSessionLocal, Base, session_dependency, async_session_dependency, SQLALCHEMY_DATABASE_URL
 
 client = TestClient(app)
 
@@ -16,11 +23,13 @@ class TestCategoryEndpoints(unittest.TestCase):
         self.db = TestSessionLocal()
         Base.metadata.create_all(bind=self.db.get_bind())
         self.client = TestClient(app)
-        app.dependency_overrides[get_db] = lambda: self.db
+        app.dependency_overrides[get_db] = session_dependency(self.db)
+        app.dependency_overrides[get_read_db] = session_dependency(self.db)
+        app.dependency_overrides[get_async_read_db] = async_session_dependency
 
     def tearDown(self):
         self.db.close()
-        app.dependency_overrides[get_db] = get_db
+        app.dependency_overrides.clear()
 
     def test_create_category(self):
         response = self.client.post("/categories/cadastrar", json={"name": "teste"})
@@ -58,6 +67,29 @@ class TestCategoryEndpoints(unittest.TestCase):
         self.db.query(Category).filter(Category.id == sample_category.id).delete()
         self.db.commit()
 
+    def test_read_categories_include_products(self):
+        sample_category = Category(name="teste")
+        self.db.add(sample_category)
+        self.db.commit()
+        self.db.refresh(sample_category)
+        self.db.add(Product(name="produto", purchase_price=1, quantity=1, sale_price=2,
+                            category_id=sample_category.id, supplier_id=1))
+        self.db.commit()
+
+        response = self.client.get("/categories/categorias/listagem")
+        self.assertNotIn("products", response.json()[0])
+
+        response = self.client.get("/categories/categorias/listagem", params={"include": "products"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p["name"] for p in response.json()[0]["products"]], ["produto"])
+
+        response = self.client.get(f"/categories/{sample_category.id}", params={"include": "products"})
+        self.assertEqual(response.json()["products"][0]["name"], "produto")
+
+        self.db.query(Product).filter(Product.category_id == sample_category.id).delete()
+        self.db.query(Category).filter(Category.id == sample_category.id).delete()
+        self.db.commit()
+
     def test_update_category(self):
         sample_category = Category(name="teste")
         self.db.add(sample_category)
@@ -77,8 +109,86 @@ class TestCategoryEndpoints(unittest.TestCase):
         self.db.commit()
         self.db.refresh(sample_category)
 
+        product = Product(name="produto", purchase_price=1, quantity=1, sale_price=2,
+                          category_id=sample_category.id, supplier_id=1)
+        self.db.add(product)
+        self.db.commit()
+
         response = self.client.delete(f"/categories/delete/{sample_category.id}")
         self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.client.delete(f"/categories/delete/{sample_category.id}").status_code, 404)
+        self.db.refresh(product)
+        self.assertIsNone(product.category_id)
+
+        self.db.delete(product)
+        self.db.commit()
+
+    def test_sync_categories_and_suppliers(self):
+        response = self.client.put("/categories/sync", json=[{"name": "a"}, {"name": "b"}])
+        self.assertEqual(response.json()["created"], 2)
+        response = self.client.put("/categories/sync", json=[{"name": "a"}, {"name": "c"}, {"name": "c"}])
+        self.assertEqual((response.json()["created"], response.json()["unchanged"]), (1, 1))
+
+        suppliers = [
+            {"name": "f1", "email": "f1@teste.com", "phone": "1"},
+            {"name": "f2", "email": "f2@teste.com", "phone": "2"},
+        ]
+        self.assertEqual(self.client.put("/suppliers/sync", json=suppliers).json()["created"], 2)
+        suppliers[0]["phone"] = "11"
+        suppliers.append({"name": "f3", "email": "f2@teste.com", "phone": "3"})
+        result = self.client.put("/suppliers/sync", json=suppliers).json()
+        self.assertEqual(
+            (result["created"], result["updated"], result["unchanged"], result["failed"]), (0, 1, 1, 1)
+        )
+        self.assertEqual(result["errors"][0]["key"], "f3")
+        self.assertEqual(self.db.query(Supplier).filter(Supplier.name == "f1").one().phone, "11")
+
+        self.db.query(Supplier).delete()
+        self.db.query(Category).delete()
+        self.db.commit()
+
+    def test_unit_of_work_commits_once(self):
+        commits = []
+        event.listen(self.db, "after_commit", lambda session: commits.append(session))
+        with unit_of_work(self.db):
+            repository = CategoryRepository(self.db)
+            category = repository.create(CategoryCreate(name="a"))
+            repository.update(category.id, CategoryCreate(name="b"))
+        self.assertEqual(len(commits), 1)
+
+        with self.assertRaises(RuntimeError), unit_of_work(self.db):
+            CategoryRepository(self.db).create(CategoryCreate(name="c"))
+            raise RuntimeError("falha depois da escrita")
+        self.assertEqual([name for name, in self.db.query(Category.name)], ["b"])
+        self.assertEqual(self.client.get(f"/categories/{category.id}").json()["name"], "b")
+
+        self.db.query(Category).delete()
+        self.db.commit()
+
+    def test_unit_of_work_rolls_back_savepoints(self):
+        with self.assertRaises(RuntimeError), unit_of_work(self.db):
+            CategoryRepository(self.db).sync([CategoryCreate(name="a"), CategoryCreate(name="b")], batch_size=1)
+            self.assertTrue(self.db.connection().connection.dbapi_connection.in_transaction)
+            raise RuntimeError("falha depois da sincronização")
+        self.assertEqual(self.db.query(Category).count(), 0)
+
+    def test_read_only_engine(self):
+        self.db.add(Category(name="leitura"))
+        self.db.commit()
+        read_engine = database.create_db_engine(database.read_only_url(SQLALCHEMY_DATABASE_URL), read_only=True)
+        with read_engine.connect() as connection:
+            self.assertEqual(connection.execute(text("SELECT name FROM categories")).scalars().all(), ["leitura"])
+            with self.assertRaises(OperationalError):
+                connection.execute(text("DELETE FROM categories"))
+        read_engine.dispose()
+
+        for headers, bind in (([], database.read_engine), ([(b"x-read-your-writes", b"true")], database.engine)):
+            dependency = get_read_db(Request({"type": "http", "headers": headers}))
+            self.assertIs(next(dependency).get_bind(), bind)
+            dependency.close()
+
+        self.db.query(Category).delete()
+        self.db.commit()
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,84 @@
+import tempfile
+import unittest
+from unittest import mock
+from fastapi.testclient import TestClient
+from app import config
+from app.main import app
+from app.models.models import Category, Product
+from app.api.dependencies import get_db, get_read_db
+from app.diagnostics import DiagnosticsMiddleware, RequestQueryLog, current_query_log, report_repeated_statements
+from app.db.test_database import create_test_database, TestSessionLocal, session_dependency
+
+
+class TestDiagnostics(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        create_test_database()
+
+    def setUp(self):
+        self.db = TestSessionLocal()
+        self.client = TestClient(DiagnosticsMiddleware(app))
+        app.dependency_overrides[get_db] = session_dependency(self.db)
+        app.dependency_overrides[get_read_db] = session_dependency(self.db)
+        self.profile_dir = tempfile.TemporaryDirectory()
+        settings = {"DIAGNOSTICS_ENABLED": True, "PROFILE_TOKEN": "segredo", "PROFILE_DIR": self.profile_dir.name}
+        self.patches = [mock.patch.object(config, name, value) for name, value in settings.items()]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        self.profile_dir.cleanup()
+        self.db.query(Product).delete()
+        self.db.query(Category).delete()
+        self.db.commit()
+        self.db.close()
+        app.dependency_overrides.clear()
+
+    def test_slow_query_logged_with_route(self):
+        with mock.patch.object(config, "SLOW_QUERY_MS", 0), self.assertLogs("app.diagnostics", "WARNING") as logs:
+            self.client.get("/categories/categorias/nomes")
+        self.assertIn("Slow query", logs.output[0])
+        self.assertIn("/categories/categorias/nomes", logs.output[0])
+
+    def test_repeated_statement_flagged_as_n_plus_one(self):
+        categories = [Category(name=f"categoria {i}") for i in range(4)]
+        self.db.add_all(categories)
+        self.db.commit()
+        self.db.expire_all()
+
+        query_log = RequestQueryLog({"method": "GET", "path": "/categories/"})
+        token = current_query_log.set(query_log)
+        try:
+            for category in self.db.query(Category).all():
+                category.products  # lazy load: uma query por categoria
+        finally:
+            current_query_log.reset(token)
+
+        with mock.patch.object(config, "N_PLUS_ONE_THRESHOLD", 3), self.assertLogs("app.diagnostics", "WARNING") as logs:
+            report_repeated_statements(query_log)
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("executed 4 times", logs.output[0])
+        self.assertIn("FROM products", logs.output[0])
+
+    def test_profile_captured_and_downloaded(self):
+        response = self.client.get("/categories/categorias/nomes")
+        self.assertNotIn("X-Profile-Id", response.headers)
+        response = self.client.get("/categories/categorias/nomes", headers={"X-Profile": "errado"})
+        self.assertNotIn("X-Profile-Id", response.headers)
+
+        response = self.client.get("/categories/categorias/nomes", headers={"X-Profile": "segredo"})
+        self.assertEqual(response.status_code, 200)
+        profile_id = response.headers["X-Profile-Id"]
+
+        url = f"/diagnostics/profiles/{profile_id}"
+        self.assertEqual(self.client.get(url, headers={"X-Profile": "errado"}).status_code, 403)
+        self.assertEqual(self.client.get("/diagnostics/profiles/../x", headers={"X-Profile": "segredo"}).status_code, 404)
+        response = self.client.get(url, headers={"X-Profile": "segredo"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("attachment", response.headers["content-disposition"])
+
+
+if __name__ == "__main__":
+    unittest.main()
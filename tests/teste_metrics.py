@@ -0,0 +1,51 @@
+import unittest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from app.main import app
+from app.api.dependencies import get_db, get_read_db
+from app.db.test_database import create_test_database, TestSessionLocal, session_dependency
+
+
+class TestMetrics(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        create_test_database()
+
+    def setUp(self):
+        self.db = TestSessionLocal()
+        self.client = TestClient(app)
+        app.dependency_overrides[get_db] = session_dependency(self.db)
+        app.dependency_overrides[get_read_db] = session_dependency(self.db)
+
+    def tearDown(self):
+        self.db.close()
+        app.dependency_overrides.clear()
+
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_route_latency_status_and_sql_per_request(self):
+        route = "/categories/{category_id}"
+        requests_before = self.sample("http_requests_total", method="GET", route=route, status="404")
+        sql_count_before = self.sample("db_statements_per_request_count", route=route)
+        sql_sum_before = self.sample("db_statements_per_request_sum", route=route)
+
+        self.assertEqual(self.client.get("/categories/999999").status_code, 404)
+        self.client.get("/nao/existe")
+
+        self.assertEqual(self.sample("http_requests_total", method="GET", route=route, status="404"), requests_before + 1)
+        self.assertEqual(self.sample("db_statements_per_request_count", route=route), sql_count_before + 1)
+        self.assertGreaterEqual(self.sample("db_statements_per_request_sum", route=route), sql_sum_before + 1)
+        self.assertEqual(self.sample("http_requests_in_flight", method="GET"), 0)
+
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        self.assertIn('http_request_duration_seconds_bucket{le="0.005",method="GET",route="/categories/{category_id}"}',
+                      response.text)
+        self.assertIn('route="<unmatched>"', response.text)
+        self.assertNotIn('route="/nao/existe"', response.text)
+
+
+if __name__ == "__main__":
+    unittest.main()
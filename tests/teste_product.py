@@ -0,0 +1,468 @@
+import itertools
+import json
+import os
+import unittest
+from unittest import mock
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+from app.main import app
+from app.models.models import Category, Product, Supplier
+from app.api.dependencies import get_async_read_db, get_db, get_read_db, get_group_writer, get_session_factory
+from app.db.group_commit import GroupCommitWriter
+from app.cache import configure_entity_cache, entity_cache
+from app.metrics import RequestSqlStats, current_sql_stats
+from app.repositories.product_repository import SORT_COLUMNS, ProductRepository
+from app.schemas.product_schema import ProductCreate, ProductListFilters
+from app.services.product_import_service import RowParser
+from app.db.test_database import create_test_database, TestSessionLocal, Base, session_dependency, async_session_dependency, engine as test_engine
+
+
+class TestProductEndpoints(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        create_test_database()
+
+    def setUp(self):
+        self.db = TestSessionLocal()
+        Base.metadata.create_all(bind=self.db.get_bind())
+        self.client = TestClient(app)
+        app.dependency_overrides[get_db] = session_dependency(self.db)
+        app.dependency_overrides[get_read_db] = session_dependency(self.db)
+        app.dependency_overrides[get_async_read_db] = async_session_dependency
+        app.dependency_overrides[get_session_factory] = lambda: TestSessionLocal
+        entity_cache.clear()
+
+    def tearDown(self):
+        self.db.query(Product).delete()
+        self.db.commit()
+        self.db.close()
+        app.dependency_overrides.clear()
+
+    def create_products(self, total):
+        products = [
+            Product(name=f"produto {i}", purchase_price=10, quantity=i, sale_price=15, category_id=1, supplier_id=1)
+            for i in range(total)
+        ]
+        self.db.add_all(products)
+        self.db.commit()
+        return sorted(product.id for product in products)
+
+    def test_read_products_keyset_pagination(self):
+        ids = self.create_products(5)
+
+        response = self.client.get("/products/produtos/listagem", params={"limit": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p["id"] for p in response.json()], ids[:2])
+        self.assertEqual(response.json()[0], {"name": "produto 0", "purchase_price": 10.0, "quantity": 0,
+                                              "sale_price": 15.0, "id": ids[0], "category_id": 1, "supplier_id": 1})
+        cursor = response.headers["X-Next-Cursor"]
+
+        response = self.client.get("/products/produtos/listagem", params={"limit": 2, "after": cursor})
+        self.assertEqual([p["id"] for p in response.json()], ids[2:4])
+        cursor = response.headers["X-Next-Cursor"]
+
+        response = self.client.get("/products/produtos/listagem", params={"limit": 2, "after": cursor})
+        self.assertEqual([p["id"] for p in response.json()], ids[4:])
+        self.assertNotIn("X-Next-Cursor", response.headers)
+
+    def test_read_products_filtered_and_sorted(self):
+        products = [
+            Product(name=name, purchase_price=1, quantity=quantity, sale_price=price, category_id=category, supplier_id=1)
+            for name, quantity, price, category in [
+                ("a", 5, 30, 1), ("b", 1, 10, 1), ("c", 9, 20, 2), ("d", 3, 20, 1), ("e", 7, 50, 1),
+            ]
+        ]
+        self.db.add_all(products)
+        self.db.commit()
+
+        params = {"category_id": 1, "min_price": 15, "sort": "-sale_price", "limit": 2}
+        response = self.client.get("/products/produtos/listagem", params=params)
+        self.assertEqual([p["name"] for p in response.json()], ["e", "a"])
+        params["after"] = response.headers["X-Next-Cursor"]
+        response = self.client.get("/products/produtos/listagem", params=params)
+        self.assertEqual([p["name"] for p in response.json()], ["d"])
+
+        params = {"max_quantity": 5, "sort": "quantity", "format": "ndjson"}
+        response = self.client.get("/products/produtos/listagem", params=params)
+        self.assertEqual([json.loads(line)["name"] for line in response.text.splitlines()], ["b", "d", "a"])
+
+        response = self.client.get("/products/produtos/listagem", params={"sort": "name", "after": 999999})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get("/products/produtos/listagem", params={"sort": "price"})
+        self.assertEqual(response.status_code, 422)
+
+    def test_listing_query_plans_use_indexes(self):
+        cursor_id = self.create_products(1)[0]
+        repository = ProductRepository(self.db)
+        filter_sets = [
+            {},
+            {"category_id": 1},
+            {"supplier_id": 1},
+            {"category_id": 1, "supplier_id": 1},
+            {"min_price": 1.0},
+            {"max_price": 5.0},
+            {"min_price": 1.0, "max_price": 5.0},
+            {"min_quantity": 1},
+            {"max_quantity": 10},
+            {"category_id": 1, "min_price": 1.0, "max_quantity": 10},
+            {"supplier_id": 1, "min_quantity": 1},
+            {"supplier_id": 1, "max_price": 5.0},
+        ]
+        sorts = [prefix + name for name in SORT_COLUMNS for prefix in ("", "-")]
+        for filters, sort, after in itertools.product(filter_sets, sorts, (None, cursor_id)):
+            query = repository._listing_query(ProductListFilters(sort=sort, **filters), after).limit(10)
+            sql = query.statement.compile(self.db.get_bind(), compile_kwargs={"literal_binds": True})
+            plan = [row[3] for row in self.db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+            access = [step for step in plan if "products" in step]
+            with self.subTest(filters=filters, sort=sort, after=after, plan=plan):
+                # A página sai de um índice já na ordem pedida, nunca de uma ordenação à parte
+                self.assertFalse([step for step in plan if "TEMP B-TREE" in step])
+                self.assertEqual(len(access), 1)
+                if "category_id" in filters or "supplier_id" in filters or after is not None:
+                    self.assertTrue(access[0].startswith("SEARCH products USING"))
+
+    def test_read_products_ndjson_stream(self):
+        ids = self.create_products(3)
+
+        response = self.client.get("/products/produtos/listagem", params={"format": "ndjson", "after": ids[0]})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("application/x-ndjson"))
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual([row["id"] for row in rows], ids[1:])
+
+    def assert_stream_fails(self, url, params):
+        """The error raised mid-stream reaches the server instead of ending the body normally."""
+        with self.assertRaises(Exception) as raised:
+            self.client.get(url, params=params)
+        # O anyio pode entregar o erro dentro de um ExceptionGroup (o backport no Python 3.10)
+        errors = [raised.exception]
+        while errors and not isinstance(errors[0], OperationalError):
+            errors[:1] = getattr(errors[0], "exceptions", ())
+        self.assertTrue(errors, f"{raised.exception!r} does not contain an OperationalError")
+
+    def test_read_products_ndjson_stream_errors(self):
+        ids = self.create_products(3)
+
+        # Cursor inválido: 400 antes do corpo, como no JSON
+        params = {"format": "ndjson", "sort": "name", "after": ids[-1] + 1000}
+        response = self.client.get("/products/produtos/listagem", params=params)
+        self.assertEqual(response.status_code, 400)
+
+        # Falha no meio do stream: a conexão termina com erro, não com um corpo que parece completo
+        iter_all = ProductRepository.iter_all
+
+        def failing_iter_all(repository, *args, **kwargs):
+            yield next(iter_all(repository, *args, **kwargs))
+            raise OperationalError("SELECT", {}, Exception("disk I/O error"))
+
+        with mock.patch.object(ProductRepository, "iter_all", failing_iter_all):
+            self.assert_stream_fails("/products/produtos/listagem", {"format": "ndjson"})
+
+    def test_read_product_etag(self):
+        product_id = self.create_products(1)[0]
+
+        response = self.client.get(f"/products/{product_id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["name"], "produto 0")
+        etag = response.headers["ETag"]
+
+        response = self.client.get(f"/products/{product_id}", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+        data = {"name": "editado", "purchase_price": 10, "quantity": 1, "sale_price": 15, "category_id": 1, "supplier_id": 1}
+        self.client.put(f"/products/editar/{product_id}", json=data)
+        response = self.client.get(f"/products/{product_id}", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["name"], "editado")
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+        self.client.delete(f"/products/delete/{product_id}")
+        self.assertEqual(self.client.get(f"/products/{product_id}").status_code, 404)
+
+    def test_entity_cache_sees_writes_of_other_workers(self):
+        with mock.patch.object(entity_cache, "maxsize", 100), mock.patch.dict(os.environ):
+            os.environ.pop("ENTITY_CACHE_MAXSIZE", None)
+            configure_entity_cache(4, detects_external_writes=True)
+            self.assertEqual(entity_cache.maxsize, 100)
+
+            # Escrita por outra conexão, sem passar pelo repositório: o data_version do SQLite
+            # muda e o cache deste processo é descartado antes de responder 304
+            product_id = self.create_products(1)[0]
+            etag = self.client.get(f"/products/{product_id}").headers["ETag"]
+            self.assertEqual(self.client.get(f"/products/{product_id}", headers={"If-None-Match": etag}).status_code, 304)
+            with TestSessionLocal() as other_worker:
+                other_worker.query(Product).filter(Product.id == product_id).update({"name": "editado em outro worker"})
+                other_worker.commit()
+            self.db.rollback()
+            response = self.client.get(f"/products/{product_id}", headers={"If-None-Match": etag})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["name"], "editado em outro worker")
+
+    def test_entity_cache_off_with_several_workers(self):
+        with mock.patch.object(entity_cache, "maxsize", 100), mock.patch.dict(os.environ):
+            os.environ.pop("ENTITY_CACHE_MAXSIZE", None)
+            configure_entity_cache(1)
+            self.assertEqual(entity_cache.maxsize, 100)
+
+            os.environ["ENTITY_CACHE_MAXSIZE"] = "100"
+            configure_entity_cache(4)
+            self.assertEqual(entity_cache.maxsize, 100)
+
+            del os.environ["ENTITY_CACHE_MAXSIZE"]
+            configure_entity_cache(4)
+            self.assertEqual(entity_cache.maxsize, 0)
+
+            # Sem cache cada worker lê a linha atual: nada de corpo ou 304 antigos
+            product_id = self.create_products(1)[0]
+            etag = self.client.get(f"/products/{product_id}").headers["ETag"]
+            self.db.query(Product).filter(Product.id == product_id).update({"name": "editado em outro worker"})
+            self.db.commit()
+            response = self.client.get(f"/products/{product_id}", headers={"If-None-Match": etag})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["name"], "editado em outro worker")
+
+    def test_update_and_delete_are_single_statements(self):
+        product_id = self.create_products(1)[0]
+        repository = ProductRepository(self.db)
+        data = ProductCreate(name="editado", purchase_price=1, quantity=2, sale_price=3, category_id=1, supplier_id=1)
+        writes = [
+            (lambda: repository.update(product_id, data), "editado"),
+            (lambda: repository.update(999999, data), None),
+            (lambda: repository.delete(product_id), True),
+            (lambda: repository.delete(product_id), False),
+        ]
+        for write, expected in writes:
+            stats = RequestSqlStats()
+            token = current_sql_stats.set(stats)
+            try:
+                result = write()
+            finally:
+                current_sql_stats.reset(token)
+            self.assertEqual(getattr(result, "name", result), expected)
+            self.assertEqual(stats.statements, 1)
+
+    def test_group_commit(self):
+        ids = self.create_products(3)
+        writer = GroupCommitWriter(TestSessionLocal, window_ms=200, max_batch=10)
+        statements = []
+        trace = lambda connection, record: connection.set_trace_callback(statements.append)
+        # Conta os COMMIT que o SQLite executa de fato, não os eventos do ORM
+        test_engine.dispose()
+        event.listen(test_engine, "connect", trace)
+        try:
+            data = ProductCreate(name="lote", purchase_price=1, quantity=2, sale_price=3, category_id=1, supplier_id=1)
+            futures = [writer.submit(lambda db, product_id=product_id: ProductRepository(db).update(product_id, data)) for product_id in ids[1:]]
+            failing = writer.submit(lambda db: (ProductRepository(db).update(ids[0], data), 1 / 0))
+            self.assertEqual([future.result().name for future in futures], ["lote"] * 2)
+            self.assertRaises(ZeroDivisionError, failing.result)
+            self.assertEqual(statements.count("COMMIT"), 1)
+            self.db.rollback()
+            self.assertEqual([self.db.get(Product, product_id).name for product_id in ids], ["produto 0", "lote", "lote"])
+
+            app.dependency_overrides[get_group_writer] = lambda: writer
+            response = self.client.put(f"/products/editar/{ids[0]}", json={**data.model_dump(), "name": "pdv"})
+            self.assertEqual(response.json()["name"], "pdv")
+            self.assertEqual(self.client.get(f"/products/{ids[0]}").json()["name"], "pdv")
+        finally:
+            event.remove(test_engine, "connect", trace)
+            test_engine.dispose()
+            writer.shutdown()
+
+    def test_group_commit_failure_keeps_nothing(self):
+        ids = self.create_products(2)
+
+        class FailingCommitSession(Session):
+            def commit(self):
+                raise OperationalError("COMMIT", {}, Exception("disk I/O error"))
+
+        writer = GroupCommitWriter(sessionmaker(bind=test_engine, class_=FailingCommitSession), window_ms=200, max_batch=10)
+        try:
+            data = ProductCreate(name="lote", purchase_price=1, quantity=2, sale_price=3, category_id=1, supplier_id=1)
+            futures = [writer.submit(lambda db, product_id=product_id: ProductRepository(db).update(product_id, data)) for product_id in ids]
+            futures.append(writer.submit(lambda db: 1 / 0))
+            for future in futures:
+                self.assertIsNotNone(future.exception())
+        finally:
+            writer.shutdown()
+        self.db.rollback()
+        self.assertEqual([self.db.get(Product, product_id).name for product_id in ids], ["produto 0", "produto 1"])
+
+    def test_search_products(self):
+        names = ["Cadeira Azul", "Cadeira de Escritório", "Mesa Azul", "Sofá"]
+        products = [
+            Product(name=name, purchase_price=10, quantity=1, sale_price=15, category_id=1, supplier_id=i + 1)
+            for i, name in enumerate(names)
+        ]
+        self.db.add_all(products)
+        self.db.commit()
+
+        response = self.client.get("/products/search", params={"q": "cad"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(p["name"] for p in response.json()), ["Cadeira Azul", "Cadeira de Escritório"])
+
+        response = self.client.get("/products/search", params={"q": "azu cad"})
+        self.assertEqual([p["name"] for p in response.json()], ["Cadeira Azul"])
+
+        response = self.client.get("/products/search", params={"q": "escritorio"})
+        self.assertEqual([p["name"] for p in response.json()], ["Cadeira de Escritório"])
+
+        response = self.client.get("/products/search", params={"q": "azul", "supplier_id": 3})
+        self.assertEqual([p["name"] for p in response.json()], ["Mesa Azul"])
+
+        response = self.client.get("/products/search", params={"q": "cadeira", "limit": 1})
+        self.assertEqual(response.headers["X-Next-Offset"], "1")
+        second = self.client.get("/products/search", params={"q": "cadeira", "limit": 1, "offset": 1}).json()
+        self.assertNotEqual(response.json()[0]["id"], second[0]["id"])
+
+        products[3].name = "Poltrona"
+        self.db.commit()
+        self.assertEqual(self.client.get("/products/search", params={"q": "sofa"}).json(), [])
+        self.assertEqual(len(self.client.get("/products/search", params={"q": "poltr"}).json()), 1)
+        self.assertEqual(self.client.get("/products/search", params={"q": 'NOT "*'}).status_code, 200)
+
+    def test_bulk_update(self):
+        products = [
+            Product(name=f"produto {i}", purchase_price=10, quantity=5, sale_price=15, category_id=category, supplier_id=1)
+            for i, category in enumerate([1, 1, 2])
+        ]
+        self.db.add_all(products)
+        self.db.commit()
+        ids = [product.id for product in products]
+        etag = self.client.get(f"/products/{ids[0]}").headers["ETag"]
+
+        response = self.client.patch("/products/bulk", json={"category_id": 1, "expression": "sale_price = purchase_price * 1.35"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"updated": 2})
+        response = self.client.get(f"/products/{ids[0]}", headers={"If-None-Match": etag})
+        self.assertEqual(response.json()["sale_price"], 13.5)
+
+        self.client.patch("/products/bulk", json={"ids": ids[1:], "expression": "+5%"})
+        self.client.patch("/products/bulk", json={"category_id": 1, "supplier_id": 1, "expression": "quantity = 0"})
+        self.db.expire_all()
+        self.assertEqual([(float(p.sale_price), p.quantity) for p in products], [(13.5, 0), (14.18, 0), (15.75, 5)])
+
+        response = self.client.patch("/products/bulk", json={"ids": ids, "expression": "name = 'x'"})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.patch("/products/bulk", json={"expression": "+5%"})
+        self.assertEqual(response.status_code, 422)
+        response = self.client.patch("/products/bulk", json={"all_products": True, "expression": "quantity = quantity + 1"})
+        self.assertEqual(response.json(), {"updated": 3})
+
+    def test_bulk_import_json_array(self):
+        rows = [
+            {"name": "a", "purchase_price": 1, "quantity": 2, "sale_price": 3, "category_id": 1, "supplier_id": 1},
+            {"name": "b", "purchase_price": "x", "quantity": 2, "sale_price": 3, "category_id": 1, "supplier_id": 1},
+            {"name": "c", "purchase_price": 1, "quantity": 2, "sale_price": 3, "category_id": 1, "supplier_id": 1},
+        ]
+        response = self.client.post("/products/bulk", params={"batch_size": 1}, json=rows)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["inserted"], 2)
+        self.assertEqual(response.json()["failed"], 1)
+        self.assertEqual(response.json()["errors"][0]["row"], 2)
+        self.assertEqual(sorted(p.name for p in self.db.query(Product)), ["a", "c"])
+
+    def test_bulk_import_json_array_separators(self):
+        row = '{"name": "a", "purchase_price": 1, "quantity": 2, "sale_price": 3, "category_id": 1, "supplier_id": 1}'
+        for body in (f"[{row} {row}]", f"[,,{row}]", f"[{row},]", f"[{row},,{row}]", f"[{row}] {row}", f"[{row}"):
+            with self.subTest(body=body[:12]):
+                response = self.client.post("/products/bulk", content=body, headers={"Content-Type": "application/json"})
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.db.query(Product).count(), 0)
+
+        response = self.client.post("/products/bulk", content=f" [ {row} ,\n{row} ] ", headers={"Content-Type": "application/json"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["inserted"], 2)
+        response = self.client.post("/products/bulk", content="[]", headers={"Content-Type": "application/json"})
+        self.assertEqual(response.json()["inserted"], 0)
+
+    def test_bulk_import_keeps_committed_batches(self):
+        row = '{"name": "a", "purchase_price": 1, "quantity": 2, "sale_price": 3, "category_id": 1, "supplier_id": 1}'
+        response = self.client.post(
+            "/products/bulk", params={"batch_size": 1}, content=f"[{row}, {row}, x",
+            headers={"Content-Type": "application/json"},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("after 2 rows were imported", response.json()["detail"])
+        self.db.rollback()
+        self.assertEqual(self.db.query(Product).count(), 2)
+
+        # O repositório não faz commit: o lote só fica gravado pela unidade de trabalho
+        ProductRepository(self.db).bulk_insert([ProductCreate.model_validate(json.loads(row)).model_dump()])
+        self.db.rollback()
+        self.assertEqual(self.db.query(Product).count(), 2)
+
+    def test_import_parser_accepts_any_split(self):
+        body = '[{"name": "ação", "quantity": 12}, {"name": "b"}]'.encode()
+        parser = RowParser("application/json; charset=utf-8")
+        rows = [row for i in range(len(body)) for row in parser.feed(body[i:i + 1])]
+        rows += list(parser.feed(b"", final=True))
+        self.assertEqual(rows, [{"name": "ação", "quantity": 12}, {"name": "b"}])
+
+    def test_bulk_import_ndjson(self):
+        body = (
+            '{"name": "a", "purchase_price": 1, "quantity": 2, "sale_price": 3, "category_id": 1, "supplier_id": 1}\n'
+            "{not json}\n"
+            '{"name": "b", "purchase_price": 1, "quantity": 2, "sale_price": 3, "category_id": 1, "supplier_id": 1}\n'
+        )
+        response = self.client.post("/products/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["inserted"], 2)
+        self.assertEqual([e["row"] for e in response.json()["errors"]], [2])
+
+    def test_bulk_import_csv(self):
+        body = (
+            "name,purchase_price,quantity,sale_price,category_id,supplier_id\n"
+            '"produto, com virgula",1.5,2,3,1,1\n'
+            "sem preco,,2,3,1,1\n"
+        )
+        response = self.client.post("/products/bulk", content=body, headers={"Content-Type": "text/csv"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["inserted"], 1)
+        self.assertEqual(response.json()["errors"][0]["row"], 2)
+        self.assertEqual(self.db.query(Product).one().name, "produto, com virgula")
+
+    def test_bulk_import_unsupported_content_type(self):
+        response = self.client.post("/products/bulk", content="x", headers={"Content-Type": "text/plain"})
+        self.assertEqual(response.status_code, 415)
+
+    def test_export_csv_and_ndjson(self):
+        category = Category(name="teste")
+        supplier = Supplier(name="fornecedor", email="fornecedor@teste.com", phone="123")
+        self.db.add_all([category, supplier])
+        self.db.commit()
+        self.db.add(Product(name="produto", purchase_price=10, quantity=1, sale_price=15,
+                            category_id=category.id, supplier_id=supplier.id))
+        self.db.commit()
+
+        try:
+            response = self.client.get("/products/export", params={"format": "csv"})
+            self.assertEqual(response.status_code, 200)
+            lines = response.text.splitlines()
+            self.assertEqual(lines[0].split(",")[:2], ["id", "name"])
+            self.assertIn("produto", lines[1])
+            self.assertIn("fornecedor@teste.com", lines[1])
+
+            response = self.client.get("/products/export", params={"format": "ndjson"})
+            row = json.loads(response.text.splitlines()[0])
+            self.assertEqual(row["category_name"], "teste")
+            self.assertEqual(row["supplier_name"], "fornecedor")
+            self.assertEqual(row["sale_price"], 15)
+
+            error = OperationalError("SELECT", {}, Exception("disk I/O error"))
+            with mock.patch.object(ProductRepository, "iter_export_rows", side_effect=error):
+                response = self.client.get("/products/export", params={"format": "csv"})
+            self.assertEqual(response.status_code, 500)
+
+            with mock.patch.object(ProductRepository, "iter_export_rows", return_value=iter(mock.Mock(side_effect=error), None)):
+                self.assert_stream_fails("/products/export", {"format": "csv"})
+        finally:
+            self.db.query(Product).delete()
+            self.db.delete(category)
+            self.db.delete(supplier)
+            self.db.commit()
+
+
+if __name__ == "__main__":
+    unittest.main()
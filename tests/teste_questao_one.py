@@ -0,0 +1,39 @@
+import random
+import unittest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.questao_one import VogalEspecialScanner, encontrar_vogal_especial
+from tests.benchmarks.bench_vogal import encontrar_vogal_original
+
+
+class TestVogalEspecial(unittest.TestCase):
+    def test_exemplos(self):
+        self.assertEqual(encontrar_vogal_especial("aAbBABacafe")["vogal"], "e")
+        self.assertEqual(encontrar_vogal_especial("AAbE")["vogal"], "E")
+        self.assertIsNone(encontrar_vogal_especial("aeiou")["vogal"])
+        self.assertIsNone(encontrar_vogal_especial("")["vogal"])
+
+    def test_equivalente_ao_original_em_trechos(self):
+        gerador = random.Random(0)
+        for _ in range(2000):
+            entrada = "".join(gerador.choice("aeiouAEbcX") for _ in range(gerador.randint(0, 30)))
+            esperado = encontrar_vogal_original(entrada)
+            self.assertEqual(encontrar_vogal_especial(entrada)["vogal"], esperado, entrada)
+
+            scanner = VogalEspecialScanner()
+            for i in range(0, len(entrada), 3):
+                scanner.feed(entrada[i:i + 3])
+            self.assertEqual(scanner.resultado(), esperado, entrada)
+
+    def test_endpoint_stream(self):
+        client = TestClient(app)
+        corpo = ("aAbBABacaf" * 1000 + "é" + "e").encode("utf-8")
+        chunks = (corpo[i:i + 7] for i in range(0, len(corpo), 7))
+        response = client.post("/teste/stream", content=chunks)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["vogal"], "e")
+        self.assertEqual(response.json()["tamanho"], 10002)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import asyncio
+import random
+import threading
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app import config
+from app.main import app
+from app.services.questao_one import encontrar_vogal_especial
+from app.services import questao_one_batch
+from app.services.questao_one_batch import encontrar_vogais_especiais, vogal_especial, vowel_pool
+
+
+class TestVogalEspecialBatch(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+
+    def test_kernel_equivalente(self):
+        gerador = random.Random(1)
+        for _ in range(2000):
+            entrada = "".join(gerador.choice("aeiouAEbcXé") for _ in range(gerador.randint(0, 30)))
+            self.assertEqual(vogal_especial(entrada), encontrar_vogal_especial(entrada)["vogal"], entrada)
+
+    def test_kernel_transicao_na_fronteira_do_bloco(self):
+        entrada = "a" * (64 * 1024) + "b" + "e"
+        self.assertEqual(vogal_especial(entrada), "e")
+
+    def test_endpoint_batch(self):
+        strings = ["aAbBABacafe", "AAbE", "aeiou", "ãAbé e E"]
+        response = self.client.post("/teste/batch", json={"strings": strings})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["vogais"], [encontrar_vogal_especial(s)["vogal"] for s in strings])
+
+    def test_endpoint_batch_em_processos(self):
+        strings = ["aAbBABacafe" * 5, "AAbE" * 5, "abE"] * 10
+        with patch.object(config, "VOWEL_BATCH_GROUP_CHARS", 100), patch.object(vowel_pool, "max_workers", 2):
+            response = self.client.post("/teste/batch", json={"strings": strings})
+        vowel_pool.shutdown()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["vogais"], [encontrar_vogal_especial(s)["vogal"] for s in strings])
+
+    def test_lote_nao_bloqueia_o_event_loop(self):
+        threads = []
+        analisar_lote = questao_one_batch.analisar_lote
+
+        def registrar(entradas):
+            threads.append(threading.current_thread())
+            return analisar_lote(entradas)
+
+        with patch.object(questao_one_batch, "analisar_lote", registrar):
+            self.assertEqual(asyncio.run(encontrar_vogais_especiais(["abE"])), ["E"])
+        self.assertIsNot(threads[0], threading.main_thread())
+
+        # Uma única string grande vai para o pool, mesmo sendo um grupo só
+        with patch.object(config, "VOWEL_BATCH_INLINE_CHARS", 10), patch.object(vowel_pool, "max_workers", 1):
+            self.assertEqual(asyncio.run(encontrar_vogais_especiais(["a" * 100 + "bE"])), ["E"])
+            self.assertIsNotNone(vowel_pool._executor)
+        vowel_pool.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
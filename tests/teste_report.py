@@ -0,0 +1,92 @@
+import unittest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.models import Category, Product, Supplier
+from app.api.dependencies import get_db, get_read_db
+from app.repositories.inventory_report_repository import InventoryReportRepository
+from app.db.test_database import create_test_database, TestSessionLocal, session_dependency
+
+
+class TestInventoryReport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        create_test_database()
+
+    def setUp(self):
+        self.db = TestSessionLocal()
+        self.client = TestClient(app)
+        app.dependency_overrides[get_db] = session_dependency(self.db)
+        app.dependency_overrides[get_read_db] = session_dependency(self.db)
+        self.category = Category(name="relatorio")
+        self.supplier = Supplier(name="fornecedor relatorio", email="relatorio@teste.com", phone="999")
+        self.db.add_all([self.category, self.supplier])
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.query(Product).delete()
+        self.db.delete(self.category)
+        self.db.delete(self.supplier)
+        self.db.commit()
+        self.db.close()
+        app.dependency_overrides.clear()
+
+    def add_product(self, quantity, purchase_price, sale_price, category_id=None):
+        data = {"name": "produto", "purchase_price": purchase_price, "quantity": quantity, "sale_price": sale_price,
+                "category_id": category_id or self.category.id, "supplier_id": self.supplier.id}
+        response = self.client.post("/products/cadastrar", json=data)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["id"]
+
+    def assert_summary_matches_products(self):
+        repository = InventoryReportRepository(self.db)
+        for dimension in ("category", "supplier"):
+            self.assertEqual(repository.get_grouped(dimension), repository.get_grouped(dimension, live=True))
+        self.assertEqual(repository.get_totals(), repository.get_totals(live=True))
+
+    def test_summary_follows_create_update_delete(self):
+        first = self.add_product(3, 10.5, 15)
+        second = self.add_product(2, 0.1, 0.2)
+        self.assert_summary_matches_products()
+
+        response = self.client.get("/reports/inventory/categorias")
+        self.assertEqual(response.status_code, 200)
+        group = next(g for g in response.json() if g["id"] == self.category.id)
+        self.assertEqual(group["name"], "relatorio")
+        self.assertEqual(group["product_count"], 2)
+        self.assertEqual(group["total_quantity"], 5)
+        self.assertEqual(group["stock_cost"], 31.7)
+        self.assertEqual(group["potential_revenue"], 45.4)
+        self.assertEqual(group["margin"], 13.7)
+
+        data = {"name": "produto", "purchase_price": 1, "quantity": 1, "sale_price": 2,
+                "category_id": 999, "supplier_id": self.supplier.id}
+        self.client.put(f"/products/editar/{first}", json=data)
+        self.client.delete(f"/products/delete/{second}")
+        self.assert_summary_matches_products()
+
+        categories = {g["id"]: g for g in self.client.get("/reports/inventory/categorias").json()}
+        self.assertNotIn(self.category.id, categories)
+        self.assertEqual(categories[999]["stock_cost"], 1.0)
+        suppliers = self.client.get("/reports/inventory/fornecedores").json()
+        self.assertEqual([g["name"] for g in suppliers if g["id"] == self.supplier.id], ["fornecedor relatorio"])
+        totals = self.client.get("/reports/inventory").json()
+        self.assertEqual(totals["margin"], 1.0)
+        self.assertEqual(totals["margin_percent"], 50.0)
+
+    def test_summary_follows_bulk_import(self):
+        rows = [
+            {"name": f"p{i}", "purchase_price": 1.25, "quantity": i, "sale_price": 2, "category_id": self.category.id,
+             "supplier_id": self.supplier.id}
+            for i in range(10)
+        ]
+        self.client.post("/products/bulk", json=rows)
+        self.assert_summary_matches_products()
+        self.assertEqual(self.client.get("/reports/inventory").json()["stock_cost"], 56.25)
+
+        self.client.patch("/products/bulk", json={"category_id": self.category.id, "expression": "purchase_price -20%"})
+        self.assert_summary_matches_products()
+        self.assertEqual(self.client.get("/reports/inventory").json()["stock_cost"], 45.0)
+
+
+if __name__ == "__main__":
+    unittest.main()